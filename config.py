@@ -16,6 +16,150 @@ GNEWS_COUNTRY = 'US'
 GNEWS_PERIOD = '1m'
 GNEWS_MAX_RESULTS = 50
 
+# --- Acquisition Concurrency ---
+# Fan out (term x source) fetches on a thread pool instead of one at a time.
+ACQUISITION_CONCURRENT = True
+ACQUISITION_MAX_WORKERS = 8
+# Overrides of the adapters' declared max_concurrency, by source_id (e.g. {"gnews": 8})
+SOURCE_MAX_CONCURRENCY = {}
+
+# --- Incremental Acquisition ---
+# Only emit articles not already recorded in data/<theme>/article_index.sqlite
+ACQUISITION_INCREMENTAL = True
+# Articles published this long before their keyword's newest recorded published_date are dropped
+ACQUISITION_HWM_GRACE_HOURS = 72
+
+# --- Response Cache ---
+# Raw adapter responses cached on disk (keyed by adapter + query params)
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_TTL_SECONDS = 6 * 3600
+RESPONSE_CACHE_MAX_MB = 200
+RESPONSE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache", "responses.sqlite")
+
+# --- Full-Text Enrichment (src/acquisition_data_manager/enrichment.py) ---
+# Resolve Google News redirects and download article bodies into 'full_text'
+ENRICHMENT_ENABLED = True
+ENRICHMENT_SOURCES = ["gnews"]
+ENRICHMENT_MAX_CONNECTIONS = 100
+ENRICHMENT_PER_HOST = 4
+ENRICHMENT_GOOGLE_CONCURRENCY = 4
+ENRICHMENT_TIMEOUT = 10
+
+# --- Rate Limits & Quotas (shared scheduler, src/acquisition_data_manager/rate_limiter.py) ---
+# rps: sustained requests/sec, burst: bucket size, daily_quota: calls per UTC day (None = unlimited)
+# ledger_key: bill the source to another entry's bucket and quota (same API account)
+SOURCE_RATE_LIMITS = {
+    "gnews": {"rps": 2.0, "burst": 4, "daily_quota": None},
+    "serpapi": {"rps": 1.0, "burst": 2, "daily_quota": 100},
+    "serpapi_trends": {"ledger_key": "serpapi"},
+    # Upper bound only: the analysis engine adapts its concurrency to Groq's 429s / rate-limit headers
+    "groq": {"rps": 10.0, "burst": 16, "daily_quota": None},
+    # One token per batchexecute decode (2 requests to news.google.com); legacy ids decode offline for free.
+    # Ceiling: ~150 current-format ids/min per process (2.5 * 60), i.e. ~5 requests/s to Google.
+    "google_news_decode": {"rps": 2.5, "burst": 5, "daily_quota": None},
+    "openai_compatible": {"rps": 10.0, "burst": 16, "daily_quota": None},
+    "mock_llm": {"rps": 100.0, "burst": 100, "daily_quota": None},
+    "default": {"rps": 1.0, "burst": 1, "daily_quota": None},
+}
+RATE_LIMIT_MAX_RETRIES = 4
+RATE_LIMIT_BACKOFF_BASE = 1.0  # seconds, doubled on every retry
+RATE_LIMIT_LEDGER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache", "quota_ledger.sqlite")
+
+# --- Article Store ---
+# Append-only JSONL store partitioned by date under data/<theme>/store/<kind>/
+ARTICLE_STORE_ENABLED = True
+# Also write the legacy unified_data_*.json / analyzed_reflexivity_*.json snapshots (streamed)
+LEGACY_JSON_SNAPSHOTS = True
+# Days of analyzed history shown in the dashboard
+DASHBOARD_HISTORY_DAYS = 30
+
+# --- Trends Time-Series Store ---
+# Google Trends points upserted into data/<theme>/trends.sqlite (keyword, ts, value)
+# Also write the legacy per-query serpapi_sub_<query>_<ts>.csv exports
+TRENDS_CSV_EXPORT = False
+# Analytics windows (in data points) and breakout threshold (z-score)
+TRENDS_RECENT_WINDOW = 5
+TRENDS_BASELINE_WINDOW = 20
+TRENDS_BREAKOUT_Z = 2.0
+
+# --- LLM Analysis (src/attribution_analysis/) ---
+# Backend: "groq" | "openai" (any OpenAI-compatible /chat/completions) | "mock" (local simulated server)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "groq")
+LLM_MODEL_ID = os.getenv("LLM_MODEL_ID", "llama-3.3-70b-versatile")
+LLM_OPENAI_BASE_URL = os.getenv("LLM_OPENAI_BASE_URL", "http://localhost:11434/v1")  # key: LLM_OPENAI_API_KEY
+# Routing: cheap model first, escalate to LLM_MODEL_ID on invalid JSON, dashboard-boundary results or low confidence
+LLM_ROUTING_ENABLED = True
+# Small model per backend; routing is skipped when the active backend has none (or it equals LLM_MODEL_ID)
+LLM_SMALL_MODEL_IDS = {
+    "groq": os.getenv("LLM_SMALL_MODEL_ID", "llama-3.1-8b-instant"),
+    "openai": os.getenv("LLM_OPENAI_SMALL_MODEL_ID"),  # e.g. a small Ollama / vLLM model; unset = no routing
+    "mock": "mock-small",
+}
+LLM_ROUTING_BOUNDARY_MARGIN = 0.05   # distance to the bubble (0.6/0.5) / opportunity (0.4/0.3) lines
+LLM_ROUTING_MIN_CONFIDENCE = 0.6     # self-reported confidence of the small model
+LLM_MODEL_PRICES = {                 # USD per 1M tokens (input, output), for the cost report
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+}
+# Mock server simulation (src/attribution_analysis/mock_llm_server.py); port 0 = any free port
+LLM_MOCK_PORT = 0
+LLM_MOCK_LATENCY = 0.3          # seconds per request
+LLM_MOCK_JITTER = 0.1
+LLM_MOCK_RATE_429 = 0.05        # probability of a 429
+LLM_MOCK_RATE_MALFORMED = 0.02  # probability of truncated JSON
+LLM_MOCK_MAX_CONCURRENT = 12    # requests above this get 429
+# Near-duplicate clustering (MinHash + LSH): one LLM call per cluster, result copied to its members
+ANALYSIS_DEDUP_ENABLED = True
+ANALYSIS_DEDUP_THRESHOLD = 0.8   # estimated Jaccard similarity of title + abstract shingles
+ANALYSIS_DEDUP_NUM_PERM = 128
+ANALYSIS_DEDUP_BANDS = 32        # more bands = more candidate pairs checked
+# Relevance triage: all-MiniLM-L6-v2 cosine vs theme description/keywords; off-topic articles skip the LLM
+# and are written with fase_hype "Descartado". Off until the threshold is checked against LLM labels.
+ANALYSIS_TRIAGE_ENABLED = False
+ANALYSIS_TRIAGE_THRESHOLD = 0.3  # min max-cosine to any theme prototype (None = no threshold)
+ANALYSIS_TRIAGE_TOP_K = None     # keep only the K best-scoring clusters (None = no limit)
+ANALYSIS_TRIAGE_BATCH_SIZE = 64
+# Local distilled scorer (train: python src/attribution_analysis/local_scorer.py --theme <id>)
+LOCAL_SCORER_ENABLED = True        # used only once data/<theme>/local_scorer.npz (or _gbm.joblib) exists
+LOCAL_SCORER_MIN_CONFIDENCE = 0.8  # calibrated confidence below this escalates to the LLM
+LOCAL_SCORER_MIN_LABELS = 200      # LLM-labelled articles required to train
+LOCAL_SCORER_HEADS = "linear"      # "linear" (numpy ridge/softmax) or "gbm" (scikit-learn HistGradientBoosting)
+# Concurrent LLM requests in flight, adapted between min and max (AIMD on 429 / rate-limit headers)
+ANALYSIS_INITIAL_IN_FLIGHT = 4
+ANALYSIS_MIN_IN_FLIGHT = 1
+ANALYSIS_MAX_IN_FLIGHT = 16
+# Batched prompts: several articles per request (system prompt paid once per batch)
+ANALYSIS_BATCH_ENABLED = True
+ANALYSIS_BATCH_MAX_ARTICLES = 8
+ANALYSIS_BATCH_TOKEN_BUDGET = 6000       # estimated prompt + reserved output tokens per request
+ANALYSIS_BATCH_OUTPUT_TOKENS = 150       # reserved output tokens per article
+# Per-article input: title deduped from the body + extractive TF-IDF sentence selection
+ANALYSIS_INPUT_TOKEN_BUDGET = 700        # estimated tokens of "TITULO/CONTENIDO" per article
+# Parsed LLM results keyed by hash(model, system prompt, input text); a theme's entries are
+# dropped when its system_prompt_context / categories change
+LLM_CACHE_ENABLED = True
+LLM_CACHE_MAX_AGE_DAYS = 30
+LLM_CACHE_MAX_MB = 100
+LLM_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache", "llm_results.sqlite")
+
+# --- Vector Database (src/vector_database/) ---
+EMBED_BATCH_SIZE = None     # texts per encode batch (None = auto from CPU cores)
+EMBED_WORKERS = 0           # >1 = sentence-transformers multi-process encode pool
+EMBED_CHUNK_SIZE = 4096     # articles read per embedding block during ingestion
+# Persistent embedding cache (hash(model, text) -> memory-mapped vector), shared by ingest / RAG / triage
+EMBED_CACHE_ENABLED = True
+EMBED_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache", "embeddings")
+EMBED_CACHE_DTYPE = "float16"   # "float32" for exact vectors (2x disk)
+EMBED_CACHE_MAX_ROWS = 500_000  # LRU eviction beyond this; compaction when holes outnumber live rows
+NEO4J_INGEST_BATCH_SIZE = 500   # rows per UNWIND transaction
+NEO4J_INGEST_RETRIES = 3        # retries per batch on transient errors (exponential backoff)
+NEO4J_INGEST_PIPELINE = True    # embed the next batch while the current one commits
+# Filtered vector search (query_similar): ANN over-fetch vs exact pre-filtered scan
+NEO4J_SEARCH_OVERFETCH = 4          # initial k = n_results * overfetch / estimated filter selectivity
+NEO4J_SEARCH_MAX_K = 10_000         # cap on k when growing the ANN candidate set
+NEO4J_SEARCH_EXACT_MAX_ROWS = 2000  # filters matching at most this many nodes use the exact scan
+NEO4J_SEARCH_SELECTIVITY_TTL = 300  # seconds a filter set's match count is reused before recounting
+
 # --- Investing Theses Configuration ---
 INVESTING_THEMES = {
     "cybersecurity_ai": {
@@ -27,7 +27,7 @@ from src.attribution_analysis import find_metadata_IA_llama_LLM
 # from src.vector_database import loader_neo4j (Deleted)
 from src.visualization import dashboard_generator
 
-def run_theme_pipeline(theme_id, sample_mode=False):
+def run_theme_pipeline(theme_id, sample_mode=False, cache_only=False, resume=False):
     print("\n" + "#" * 80)
     print(f"🚀 STARTING PIPELINE FOR THEME: {theme_id}")
     print("#" * 80)
@@ -36,7 +36,7 @@ def run_theme_pipeline(theme_id, sample_mode=False):
     print(f"\n[Step 1/4] Acquisition (News & Trends)...")
     try:
         # Call acquisition with specific theme
-        main_news_fetcher.main(target_theme=theme_id) 
+        main_news_fetcher.main(target_theme=theme_id, cache_only=cache_only)
     except Exception as e:
         print(f"❌ Acquisition Failed: {e}")
         return
@@ -45,7 +45,7 @@ def run_theme_pipeline(theme_id, sample_mode=False):
     print(f"\n[Step 2/4] Attribution Analysis (LLM)...")
     try:
         # This one accepts theme_id
-        find_metadata_IA_llama_LLM.main(theme_id=theme_id, sample_mode=sample_mode)
+        find_metadata_IA_llama_LLM.main(theme_id=theme_id, sample_mode=sample_mode, resume=resume)
     except Exception as e:
         print(f"❌ Analysis Failed: {e}")
         return
@@ -86,6 +86,8 @@ def main():
     parser.add_argument("--theme", type=str, help="Specific theme ID to process")
     parser.add_argument("--all", action="store_true", help="Process all enabled themes")
     parser.add_argument("--sample", action="store_true", help="Run in sample mode (faster, fewer articles)")
+    parser.add_argument("--cache-only", action="store_true", help="Acquisition replays recorded responses only (offline)")
+    parser.add_argument("--resume", action="store_true", help="Analysis skips articles already in its checkpoint")
     
     args = parser.parse_args()
 
@@ -93,12 +95,12 @@ def main():
         if args.theme not in config.INVESTING_THEMES:
             print(f"Error: Theme '{args.theme}' not found in config.")
             return
-        run_theme_pipeline(args.theme, sample_mode=args.sample)
+        run_theme_pipeline(args.theme, sample_mode=args.sample, cache_only=args.cache_only, resume=args.resume)
         
     elif args.all:
         for theme_id, settings in config.INVESTING_THEMES.items():
             if settings["enabled"]:
-                run_theme_pipeline(theme_id, sample_mode=args.sample)
+                run_theme_pipeline(theme_id, sample_mode=args.sample, cache_only=args.cache_only, resume=args.resume)
     else:
         print("Please specify --theme <id> or --all")
 
@@ -1,8 +1,10 @@
 import sys
 import os
-import json
-from typing import List
-from datetime import datetime
+import asyncio
+import threading
+from typing import List, Dict, Iterable, Tuple
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 # Add root directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -11,6 +13,11 @@ import config
 from src.acquisition_data_manager.source_adapters.gnews_adapter import GNewsAdapter
 from src.acquisition_data_manager.source_adapters.serpapi_adapter import SerpApiTrendsAdapter
 from src.acquisition_data_manager.base_source import BaseSource, StandardArticle
+from src.acquisition_data_manager.article_index import ArticleIndex
+from src.acquisition_data_manager.response_cache import ResponseCache
+from src.acquisition_data_manager.rate_limiter import get_scheduler
+from src.acquisition_data_manager.enrichment import ArticleEnricher
+from src.article_store import ArticleStore, write_json_array
 
 class UnifiedAcquisitionManager:
     """
@@ -18,8 +25,31 @@ class UnifiedAcquisitionManager:
     Uses config.py to determine which adapters to enable.
     """
     
-    def __init__(self):
+    def __init__(self, cache_only: bool = False):
+        """
+        Args:
+            cache_only: Replay recorded responses only (offline mode, no remote calls).
+        """
         self.sources: List[BaseSource] = []
+        self.cache = None
+        if config.RESPONSE_CACHE_ENABLED or cache_only:
+            self.cache = ResponseCache(
+                config.RESPONSE_CACHE_PATH,
+                ttl_seconds=config.RESPONSE_CACHE_TTL_SECONDS,
+                max_bytes=config.RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+                cache_only=cache_only
+            )
+        # Per-source asyncio semaphores cap in-flight requests. They are bound to
+        # the running event loop and shared by everything fetched in it
+        # (e.g. several themes gathered together by fetch_themes)
+        self._source_slots: Dict[str, asyncio.Semaphore] = {}
+        self._slots_loop = None
+        # Cumulative failure / remote call counts per source_id (cache hits are not remote calls)
+        self.failure_counts: Dict[str, int] = {}
+        self.call_counts: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        # Article indexes with a filtered delta not yet recorded (data_dir -> ArticleIndex)
+        self._pending_indexes: Dict[str, ArticleIndex] = {}
         self._initialize_sources()
         
     def _initialize_sources(self):
@@ -38,31 +68,209 @@ class UnifiedAcquisitionManager:
             print("  [!] Twitter Adapter Enabled (Not Implemented)")
             # self.sources.append(TwitterAdapter())
 
-    def fetch_all(self, search_terms: List[str], output_dirs=None) -> List[StandardArticle]:
+        if self.cache and self.cache.cache_only:
+            print("  [*] Cache-only mode: replaying recorded responses")
+
+        for source in self.sources:
+            source.cache = self.cache
+            key = self._source_key(source)
+            source.on_remote_call = lambda k=key: self._count_remote_call(k)
+            self.failure_counts[key] = 0
+            self.call_counts[key] = 0
+
+    def _count_remote_call(self, key: str):
+        with self._stats_lock:
+            self.call_counts[key] += 1
+
+    @staticmethod
+    def _source_key(source: BaseSource) -> str:
+        return getattr(source, "source_id", type(source).__name__)
+
+    def _concurrency_limit(self, source: BaseSource) -> int:
+        """Adapter-declared max_concurrency, unless overridden in config."""
+        limit = config.SOURCE_MAX_CONCURRENCY.get(self._source_key(source), source.max_concurrency)
+        return max(1, limit)
+
+    def _get_source_slots(self) -> Dict[str, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._source_slots = {
+                self._source_key(s): asyncio.Semaphore(self._concurrency_limit(s)) for s in self.sources
+            }
+            self._slots_loop = loop
+        return self._source_slots
+
+    async def _guarded(self, source: BaseSource, make_call):
+        """Awaits an adapter call while holding one of the source's concurrency slots."""
+        key = self._source_key(source)
+        async with self._get_source_slots()[key]:
+            return await make_call()
+
+    @staticmethod
+    def _tag_term(articles: List[StandardArticle], term: str) -> List[StandardArticle]:
+        """Records the search term that produced each article (used for per-keyword tracking)."""
+        for article in articles:
+            if article.get("metadata") is None:
+                article["metadata"] = {}
+            article["metadata"].setdefault("search_term", term)
+        return articles
+
+    def _record_failure(self, source: BaseSource, failures: Dict[str, int]):
+        key = self._source_key(source)
+        failures[key] = failures.get(key, 0) + 1
+        with self._stats_lock:
+            self.failure_counts[key] = self.failure_counts.get(key, 0) + 1
+
+    async def afetch_all(self, search_terms: List[str], output_dirs=None) -> List[StandardArticle]:
+        """
+        Async fan-out of all enabled adapters over the search terms.
+
+        Scheduling comes from the adapters' declared capabilities:
+        supports_batch sources get a single afetch_many(terms) call, the rest
+        one afetch(term) per term, bounded by each source's max_concurrency.
+        Results are merged in term -> source order, so output is deterministic.
+        """
+        print(f"\n--- Processing {len(search_terms)} terms x {len(self.sources)} sources (concurrent) ---")
+        failures: Dict[str, int] = {self._source_key(s): 0 for s in self.sources}
+
+        batch_tasks: Dict[int, asyncio.Task] = {}
+        term_tasks: Dict[Tuple[int, int], asyncio.Task] = {}
+        for si, source in enumerate(self.sources):
+            if source.supports_batch:
+                batch_tasks[si] = asyncio.ensure_future(self._guarded(
+                    source, lambda s=source: s.afetch_many(search_terms, output_dirs)))
+            else:
+                for ti, term in enumerate(search_terms):
+                    term_tasks[(ti, si)] = asyncio.ensure_future(self._guarded(
+                        source, lambda s=source, t=term: s.afetch(t, output_dirs)))
+
+        await asyncio.gather(*batch_tasks.values(), *term_tasks.values(), return_exceptions=True)
+
+        for si, task in batch_tasks.items():
+            if task.exception():
+                print(f"Error batch-fetching from {self.sources[si]}: {task.exception()}")
+                self._record_failure(self.sources[si], failures)
+
+        all_articles: List[StandardArticle] = []
+        for ti, term in enumerate(search_terms):
+            for si, source in enumerate(self.sources):
+                if si in batch_tasks:
+                    task = batch_tasks[si]
+                    if task.exception():
+                        continue
+                    articles = task.result().get(term, [])
+                else:
+                    task = term_tasks[(ti, si)]
+                    if task.exception():
+                        print(f"Error fetching from {source} for '{term}': {task.exception()}")
+                        self._record_failure(source, failures)
+                        continue
+                    articles = task.result()
+                all_articles.extend(self._tag_term(articles, term))
+
+        failed = {k: v for k, v in failures.items() if v}
+        if failed:
+            print(f"Fetch failures per source: {failed}")
+
+        return all_articles
+
+    def _run(self, coro):
+        """Runs a coroutine on a fresh event loop whose thread pool backs the sync-adapter shims."""
+        async def runner():
+            asyncio.get_running_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=config.ACQUISITION_MAX_WORKERS))
+            return await coro
+        return asyncio.run(runner())
+
+    def fetch_all(self, search_terms: List[str], output_dirs=None, concurrent: bool = None) -> List[StandardArticle]:
         """
         Runs all enabled adapters for the given search terms.
+
+        With concurrent=True (default from config.ACQUISITION_CONCURRENT) this
+        runs afetch_all on an event loop; otherwise terms and sources are
+        fetched one at a time.
         """
+        if concurrent is None:
+            concurrent = config.ACQUISITION_CONCURRENT
+
+        if concurrent:
+            return self._run(self.afetch_all(search_terms, output_dirs))
+
+        failures: Dict[str, int] = {self._source_key(s): 0 for s in self.sources}
         all_articles: List[StandardArticle] = []
-        
+
         for term in search_terms:
             print(f"\n--- Processing Term: '{term}' ---")
             for source in self.sources:
                 try:
-                    # Check if fetch accepts 'output_dirs' (new signature)
-                    import inspect
-                    sig = inspect.signature(source.fetch)
-                    if 'output_dirs' in sig.parameters:
-                        articles = source.fetch(term, output_dirs=output_dirs)
-                    else:
-                        articles = source.fetch(term)
-                        
-                    all_articles.extend(articles)
+                    articles = source.run_fetch(term, output_dirs)
+                    all_articles.extend(self._tag_term(articles, term))
                 except Exception as e:
                     print(f"Error fetching from {source}: {e}")
-                    
+                    self._record_failure(source, failures)
+
+        failed = {k: v for k, v in failures.items() if v}
+        if failed:
+            print(f"Fetch failures per source: {failed}")
+
         return all_articles
+
+    def fetch_themes(self, theme_jobs: Dict[str, Tuple[List[str], dict]]) -> Dict[str, List[StandardArticle]]:
+        """
+        Fetches several themes at once on a single event loop, so per-source
+        concurrency limits apply globally. theme_jobs maps theme_id -> (terms, output_dirs).
+        """
+        async def gather_themes():
+            results = await asyncio.gather(*[
+                self.afetch_all(terms, output_dirs) for terms, output_dirs in theme_jobs.values()
+            ])
+            return dict(zip(theme_jobs.keys(), results))
+        return self._run(gather_themes())
+
+    def quota_usage(self) -> Dict[str, str]:
+        """Calls made today per source against their daily budget (persisted across runs)."""
+        return get_scheduler().usage_today()
+
+    def estimated_cost(self) -> Dict[str, float]:
+        """Upper bound of paid units spent per source (remote calls only, retries included)."""
+        return {
+            self._source_key(s): self.call_counts[self._source_key(s)] * s.cost_per_call
+            for s in self.sources if s.cost_per_call
+        }
         
-    def save_to_json(self, articles: List[StandardArticle], filename: str = None, output_dir: str = None):
+    def enrich_articles(self, articles: List[StandardArticle]) -> List[StandardArticle]:
+        """
+        Downloads article bodies into 'full_text' (in place) for listing-only
+        sources, resolving Google News redirects. See enrichment.py.
+        """
+        self._run(ArticleEnricher.from_config().enrich(articles))
+        return articles
+
+    def filter_new_articles(self, articles: List[StandardArticle], data_dir: str) -> List[StandardArticle]:
+        """
+        Drops articles already acquired in previous runs using the persistent
+        per-theme index in data_dir. Returns only new or changed articles.
+        They are recorded in the index by mark_articles_seen(), once saved.
+        """
+        index = ArticleIndex(data_dir)
+        grace = timedelta(hours=config.ACQUISITION_HWM_GRACE_HOURS)
+        delta = index.filter_new(articles, grace=grace)
+        print(f"\nIncremental filter: {len(delta)} new/changed of {len(articles)} fetched articles "
+              f"({index.stale} older than their keyword's high-water mark - {config.ACQUISITION_HWM_GRACE_HOURS}h)")
+        self._pending_indexes[data_dir] = index
+        return delta
+
+    def mark_articles_seen(self, data_dir: str):
+        """Records the delta of the last filter_new_articles(data_dir) in the index. Call after saving it."""
+        index = self._pending_indexes.pop(data_dir, None)
+        if index is None:
+            return
+        try:
+            index.mark_seen()
+        finally:
+            index.close()
+
+    def save_to_json(self, articles: Iterable[StandardArticle], filename: str = None, output_dir: str = None):
         """Saves the aggregated results to a JSON file"""
         if not filename:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -77,8 +285,13 @@ class UnifiedAcquisitionManager:
         # Ensure data dir exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, indent=2, ensure_ascii=False)
+        count = write_json_array(output_path, articles)
             
-        print(f"\nSuccessfully saved {len(articles)} articles to: {output_path}")
+        print(f"\nSuccessfully saved {count} articles to: {output_path}")
         return output_path
+
+    def save_to_store(self, articles: Iterable[StandardArticle], data_dir: str):
+        """Appends the articles as a new run of the theme's 'unified' article store"""
+        run = ArticleStore(data_dir, "unified").append(articles)
+        print(f"\nAppended {run['count']} articles to store partition {run['partition']} (run {run['run_id']})")
+        return run
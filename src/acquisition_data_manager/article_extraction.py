@@ -0,0 +1,113 @@
+"""
+Article Extraction
+Extracción del contenido principal de un artículo a partir de su HTML (sin red).
+Compartido por el enriquecimiento de full_text del pipeline (enrichment.py) y
+el scraper de utils/cybersecurity_research_theme.py.
+"""
+
+import re
+from bs4 import BeautifulSoup
+
+# Headers para simular un navegador real
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+}
+
+
+def parse_article_html(html):
+    """
+    Extrae el contenido principal de un artículo web ya descargado.
+
+    Args:
+        html: Contenido HTML (str o bytes)
+
+    Returns:
+        dict con 'abstract' (primeros párrafos), 'full_text' (texto completo) y 'meta_description'
+    """
+    result = {
+        'abstract': '',
+        'full_text': '',
+        'meta_description': '',
+    }
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 1. Intentar obtener meta description (suele ser un buen resumen)
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc and meta_desc.get('content'):
+        result['meta_description'] = meta_desc['content'].strip()
+
+    # También buscar og:description
+    og_desc = soup.find('meta', attrs={'property': 'og:description'})
+    if og_desc and og_desc.get('content') and not result['meta_description']:
+        result['meta_description'] = og_desc['content'].strip()
+
+    # 2. Eliminar elementos no deseados
+    for element in soup.find_all(['script', 'style', 'nav', 'header', 'footer',
+                                   'aside', 'form', 'iframe', 'noscript',
+                                   'advertisement', 'ads', 'sidebar']):
+        element.decompose()
+
+    # 3. Buscar el contenido principal del artículo
+    # Intentar diferentes selectores comunes para artículos
+    article_selectors = [
+        'article',
+        '[role="main"]',
+        '.article-content',
+        '.article-body',
+        '.post-content',
+        '.entry-content',
+        '.content-body',
+        '.story-body',
+        '#article-body',
+        '.article__body',
+        '.ArticleBody',
+        'main',
+        '.main-content',
+    ]
+
+    article_text = ""
+
+    for selector in article_selectors:
+        article = soup.select_one(selector)
+        if article:
+            # Obtener todos los párrafos
+            paragraphs = article.find_all(['p', 'h1', 'h2', 'h3'])
+            if paragraphs:
+                article_text = '\n\n'.join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+                if len(article_text) > 200:  # Si encontramos contenido sustancial
+                    break
+
+    # Si no encontramos con selectores, buscar todos los párrafos
+    if not article_text or len(article_text) < 200:
+        all_paragraphs = soup.find_all('p')
+        # Filtrar párrafos muy cortos o que parecen navegación
+        good_paragraphs = [p.get_text().strip() for p in all_paragraphs
+                          if len(p.get_text().strip()) > 50]
+        article_text = '\n\n'.join(good_paragraphs)
+
+    # 4. Limpiar el texto
+    article_text = re.sub(r'\s+', ' ', article_text)  # Normalizar espacios
+    article_text = re.sub(r'\n\s*\n', '\n\n', article_text)  # Normalizar saltos de línea
+
+    result['full_text'] = article_text[:10000]  # Limitar a 10000 caracteres
+
+    # 5. Crear abstract (primeros 500-1000 caracteres o 2-3 párrafos)
+    if result['meta_description']:
+        result['abstract'] = result['meta_description']
+    elif article_text:
+        # Tomar los primeros párrafos hasta ~500 caracteres
+        paragraphs = article_text.split('\n\n')
+        abstract = ""
+        for p in paragraphs[:3]:
+            if len(abstract) + len(p) < 800:
+                abstract += p + " "
+            else:
+                break
+        result['abstract'] = abstract.strip()[:800]
+
+    return result
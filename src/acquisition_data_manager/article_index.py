@@ -0,0 +1,200 @@
+"""
+Persistent Article Index
+Per-theme SQLite index of every article already acquired, so repeated runs
+only emit new or changed articles (deltas) instead of full snapshots.
+
+Identity of an article:
+    1. Canonical URL (lower-cased host, no fragment, no tracking params).
+    2. Fallback: normalized title hash (same story re-published under a new URL).
+A known article is re-emitted only if its content hash (title + abstract + full_text) changed.
+Articles published more than a grace period before their keyword's high-water
+mark (newest published_date recorded for it) are dropped as already processed.
+
+filter_new() only reads the index; the delta is recorded by mark_seen(), to be
+called once it has been saved, so a failed run re-emits the same articles.
+"""
+
+import os
+import re
+import sqlite3
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Iterable
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+INDEX_FILENAME = "article_index.sqlite"
+
+# Query params that never change the identity of an article
+TRACKING_PARAMS = {"oc", "hl", "gl", "ceid", "fbclid", "gclid", "mc_cid", "mc_eid", "ref", "cmpid"}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalizes a URL so that trivially different links map to the same key."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ""))
+
+
+def _normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+
+def title_hash(title: str) -> str:
+    return hashlib.sha1(_normalize_text(title).encode("utf-8")).hexdigest()
+
+
+def content_hash(article: dict) -> str:
+    payload = "\x1f".join(
+        _normalize_text(article.get(field) or "") for field in ("title", "abstract", "full_text")
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def parse_published_date(value: str) -> Optional[datetime]:
+    """Parses ISO 8601 or RFC 2822 ('Mon, 18 Aug 2025 07:00:00 GMT') dates as UTC."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+class ArticleIndex:
+    """
+    SQLite-backed identity index stored at data/<theme>/article_index.sqlite.
+    Not thread-safe: use one instance per thread (one per theme).
+    """
+
+    def __init__(self, data_dir: str):
+        os.makedirs(data_dir, exist_ok=True)
+        self.path = os.path.join(data_dir, INDEX_FILENAME)
+        self.conn = sqlite3.connect(self.path)
+        self.pending = []   # delta of the last filter_new(), recorded by mark_seen()
+        self.touched = []   # unchanged known articles (last_seen refresh)
+        self.stale = 0      # articles dropped by the high-water mark in the last filter_new()
+        self._create_schema()
+
+    def _create_schema(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                url_key TEXT PRIMARY KEY,
+                title_hash TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                keyword TEXT,
+                published_date TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_title ON articles(title_hash);
+            CREATE TABLE IF NOT EXISTS keyword_hwm (
+                keyword TEXT PRIMARY KEY,
+                published_utc TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def get_high_water_mark(self, keyword: str) -> Optional[datetime]:
+        """Newest published_date seen so far for a keyword (UTC) or None."""
+        row = self.conn.execute(
+            "SELECT published_utc FROM keyword_hwm WHERE keyword = ?", (keyword,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def _update_high_water_mark(self, keyword: str, published: datetime):
+        self.conn.execute("""
+            INSERT INTO keyword_hwm (keyword, published_utc) VALUES (?, ?)
+            ON CONFLICT(keyword) DO UPDATE SET published_utc = excluded.published_utc
+            WHERE excluded.published_utc > keyword_hwm.published_utc
+        """, (keyword, published.isoformat()))
+
+    def _lookup(self, url_key: str, t_hash: str):
+        row = self.conn.execute(
+            "SELECT url_key, content_hash FROM articles WHERE url_key = ?", (url_key,)
+        ).fetchone()
+        if row is None:
+            row = self.conn.execute(
+                "SELECT url_key, content_hash FROM articles WHERE title_hash = ? LIMIT 1", (t_hash,)
+            ).fetchone()
+        return row
+
+    def filter_new(self, articles: Iterable[dict], grace: timedelta = timedelta(hours=72)) -> List[dict]:
+        """
+        Returns only articles that are new or whose content changed since the
+        last recorded run. Duplicates inside the same batch (same story under
+        several keywords) are emitted once. Articles published more than `grace`
+        before their keyword's high-water mark are dropped. Nothing is written
+        until mark_seen().
+        """
+        self.pending = []
+        self.touched = []
+        self.stale = 0
+        delta = []
+        batch_keys = set()
+        high_water_marks = {}
+
+        for article in articles:
+            url_key = canonicalize_url(article.get("url", "")) or f"title:{title_hash(article.get('title', ''))}"
+            t_hash = title_hash(article.get("title", ""))
+            keyword = (article.get("metadata") or {}).get("search_term")
+            published = parse_published_date(article.get("published_date"))
+
+            if keyword and published:
+                if keyword not in high_water_marks:
+                    high_water_marks[keyword] = self.get_high_water_mark(keyword)
+                hwm = high_water_marks[keyword]
+                if hwm and published < hwm - grace:
+                    self.stale += 1
+                    continue
+
+            if url_key in batch_keys or t_hash in batch_keys:
+                continue
+            batch_keys.update((url_key, t_hash))
+
+            c_hash = content_hash(article)
+            existing = self._lookup(url_key, t_hash)
+            if existing is not None and existing[1] == c_hash:
+                self.touched.append(existing[0])
+                continue
+            self.pending.append((existing[0] if existing else None, url_key, t_hash, c_hash, keyword,
+                                 article.get("published_date"), published))
+            delta.append(article)
+        return delta
+
+    def mark_seen(self):
+        """Records the delta of the last filter_new() (call after it was saved) and commits."""
+        now = datetime.now(timezone.utc).isoformat()
+        for existing_key, url_key, t_hash, c_hash, keyword, published_date, published in self.pending:
+            if existing_key is None:
+                self.conn.execute("""
+                    INSERT INTO articles (url_key, title_hash, content_hash, keyword, published_date, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (url_key, t_hash, c_hash, keyword, published_date, now, now))
+            else:
+                self.conn.execute(
+                    "UPDATE articles SET content_hash = ?, last_seen = ? WHERE url_key = ?",
+                    (c_hash, now, existing_key)
+                )
+            if keyword and published:
+                self._update_high_water_mark(keyword, published)
+        self.conn.executemany("UPDATE articles SET last_seen = ? WHERE url_key = ?",
+                              [(now, key) for key in self.touched])
+        self.conn.commit()
+        self.pending = []
+        self.touched = []
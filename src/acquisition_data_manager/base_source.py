@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, TypedDict, Optional, Dict, Any
+from typing import List, TypedDict, Optional, Dict, Any, Callable
 # Adjust import based on file structure: src/acquisition_data_manager/base_source.py -> src/models.py
 # Using relative import assuming package structure
 try:
@@ -10,6 +11,7 @@ except ImportError:
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
     from src.models import ArticleModel
+from src.acquisition_data_manager.rate_limiter import get_scheduler
 
 class StandardArticle(TypedDict):
     """
@@ -28,7 +30,47 @@ class StandardArticle(TypedDict):
 class BaseSource(ABC):
     """
     Abstract Base Class that all data acquisition adapters must implement.
+
+    Adapter protocol (v2):
+        - fetch(query): required, synchronous.
+        - afetch(query): async entry point used by the manager. The default shim
+          runs fetch() in a worker thread; native async adapters override it.
+        - fetch_many(queries) / afetch_many(queries): optional batch fetch,
+          used when the adapter declares supports_batch = True.
+
+    Capabilities are declared as class attributes, so the manager can schedule
+    adapters from this metadata without inspecting signatures.
     """
+
+    # --- Capabilities ---
+    supports_batch: bool = False      # fetch_many() does real batching (one call for many queries)
+    needs_output_dirs: bool = False   # fetch() accepts output_dirs= (auxiliary files, e.g. CSVs)
+    max_concurrency: int = 2          # max in-flight requests (config.SOURCE_MAX_CONCURRENCY overrides)
+    cost_per_call: float = 0.0        # paid units per remote call (0 = free service)
+
+    # Optional ResponseCache attached by the manager (see response_cache.py)
+    cache = None
+    # Optional callback attached by the manager, invoked once per real remote request
+    on_remote_call: Optional[Callable[[], None]] = None
+
+    def cached_call(self, params: Dict[str, Any], fetch_fn: Callable[[], Any],
+                    cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Runs fetch_fn (the remote call) through the response cache if one is attached,
+        and through the shared rate limiter / quota scheduler on misses.
+        params must identify the request (never include API keys).
+        """
+        adapter = getattr(self, "source_id", type(self).__name__)
+        def counted_fetch():
+            if self.on_remote_call:
+                self.on_remote_call()
+            return fetch_fn()
+
+        # Only real remote calls (cache misses) are throttled, counted and charged to the quota
+        remote_fn = lambda: get_scheduler().call(adapter, counted_fetch)
+        if self.cache is None:
+            return remote_fn()
+        return self.cache.get_or_fetch(adapter, params, remote_fn, cacheable)
     
     @abstractmethod
     def fetch(self, query: str) -> List[StandardArticle]:
@@ -36,3 +78,21 @@ class BaseSource(ABC):
         Fetch data for a given query and return a list of StandardArticle objects.
         """
         pass
+
+    def run_fetch(self, query: str, output_dirs=None) -> List[StandardArticle]:
+        """Calls fetch() with the arguments this adapter declares it accepts."""
+        if self.needs_output_dirs:
+            return self.fetch(query, output_dirs=output_dirs)
+        return self.fetch(query)
+
+    def fetch_many(self, queries: List[str], output_dirs=None) -> Dict[str, List[StandardArticle]]:
+        """Batch fetch keyed by query. Default: one fetch() per query."""
+        return {query: self.run_fetch(query, output_dirs) for query in queries}
+
+    async def afetch(self, query: str, output_dirs=None) -> List[StandardArticle]:
+        """Async fetch. Shim for sync adapters: runs fetch() in a worker thread."""
+        return await asyncio.to_thread(self.run_fetch, query, output_dirs)
+
+    async def afetch_many(self, queries: List[str], output_dirs=None) -> Dict[str, List[StandardArticle]]:
+        """Async batch fetch. Shim for sync adapters: runs fetch_many() in a worker thread."""
+        return await asyncio.to_thread(self.fetch_many, queries, output_dirs)
@@ -0,0 +1,184 @@
+"""
+Full-Text Enrichment
+Fills `full_text` for listing-only articles (GNews) after acquisition.
+
+1. Resolves Google News RSS redirect URLs (news.google.com/rss/articles/<id>)
+   to the publisher URL: legacy ids are base64-decoded offline, current ids
+   go through Google's batchexecute endpoint.
+2. Downloads the article body with a pooled aiohttp session, capped per host.
+3. Extracts the text with the shared parse_article_html (article_extraction.py),
+   off the event loop in a worker thread.
+"""
+
+import re
+import json
+import time
+import base64
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, quote
+
+import aiohttp
+
+import config
+from src.acquisition_data_manager.article_extraction import HEADERS, parse_article_html
+from src.acquisition_data_manager.rate_limiter import get_scheduler
+
+GOOGLE_NEWS_HOST = "news.google.com"
+BATCHEXECUTE_URL = "https://news.google.com/_/DotsSplashUi/data/batchexecute"
+
+
+def google_news_article_id(url: str) -> Optional[str]:
+    """Returns the <id> of a news.google.com/(rss/)articles/<id> URL, else None."""
+    parts = urlsplit(url)
+    if parts.netloc != GOOGLE_NEWS_HOST:
+        return None
+    match = re.search(r"/articles/([^/?#]+)", parts.path)
+    return match.group(1) if match else None
+
+
+def decode_legacy_article_id(article_id: str) -> Optional[str]:
+    """Old-style ids embed the publisher URL in a base64 protobuf."""
+    try:
+        raw = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except (ValueError, TypeError):
+        return None
+    match = re.search(rb"https?://[\x21-\x7e]+", raw)
+    if not match:
+        return None
+    # Newer ids ("AU_yqL...") only carry an opaque token and never match
+    return match.group(0).decode("ascii", errors="ignore")
+
+
+class ArticleEnricher:
+    """
+    Pooled async downloader + extractor.
+
+    Args:
+        max_connections: Total open connections in the pool.
+        per_host: Max concurrent requests to the same publisher host.
+        google_concurrency: Max concurrent URL-resolution requests to news.google.com.
+        timeout: Per-request timeout in seconds.
+    """
+
+    def __init__(self, max_connections: int = 100, per_host: int = 4, google_concurrency: int = 4,
+                 timeout: float = 10):
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.google_concurrency = google_concurrency
+        self.timeout = timeout
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def from_config(cls) -> "ArticleEnricher":
+        return cls(
+            max_connections=config.ENRICHMENT_MAX_CONNECTIONS,
+            per_host=config.ENRICHMENT_PER_HOST,
+            google_concurrency=config.ENRICHMENT_GOOGLE_CONCURRENCY,
+            timeout=config.ENRICHMENT_TIMEOUT,
+        )
+
+    def _slot(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_slots:
+            limit = self.google_concurrency if host == GOOGLE_NEWS_HOST else self.per_host
+            self._host_slots[host] = asyncio.Semaphore(limit)
+        return self._host_slots[host]
+
+    async def _request(self, session: aiohttp.ClientSession, method: str, url: str, **kwargs) -> Tuple[str, str]:
+        """Returns (final_url, body) holding the host's slot. Raises on HTTP errors."""
+        host = urlsplit(url).netloc
+        async with self._slot(host):
+            async with session.request(method, url, **kwargs) as resp:
+                resp.raise_for_status()
+                return str(resp.url), await resp.text(errors="ignore")
+
+    async def _decode_via_batchexecute(self, session: aiohttp.ClientSession, article_id: str) -> Optional[str]:
+        """
+        Current Google News ids: read signature/timestamp from the article page, then ask batchexecute.
+        Each decode (page GET + batchexecute POST) takes one 'google_news_decode' token.
+        """
+        await get_scheduler().aacquire("google_news_decode")
+        _, page = await self._request(session, "GET", f"https://{GOOGLE_NEWS_HOST}/articles/{article_id}")
+        signature = re.search(r'data-n-a-sg="([^"]+)"', page)
+        timestamp = re.search(r'data-n-a-ts="([^"]+)"', page)
+        if not signature or not timestamp:
+            return None
+
+        request = [
+            "Fbv4je",
+            '["garturlreq",[["X","X",["X","X"],null,null,1,1,"US:en",null,1,null,null,null,null,null,0,1],'
+            f'"X","X",1,[1,1,1],1,1,null,0,0,null,0],"{article_id}",{timestamp.group(1)},"{signature.group(1)}"]',
+        ]
+        _, body = await self._request(
+            session, "POST", BATCHEXECUTE_URL,
+            data=f"f.req={quote(json.dumps([[request]]))}",
+            headers={"Content-Type": "application/x-www-form-urlencoded;charset=UTF-8"},
+        )
+        parsed = json.loads(body.split("\n\n")[1])[:-2]
+        return json.loads(parsed[0][2])[1]
+
+    async def resolve_url(self, session: aiohttp.ClientSession, url: str) -> str:
+        """Publisher URL behind a Google News redirect (or the URL itself)."""
+        article_id = google_news_article_id(url)
+        if not article_id:
+            return url
+        decoded = decode_legacy_article_id(article_id)
+        if decoded:
+            return decoded
+        try:
+            decoded = await self._decode_via_batchexecute(session, article_id)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, IndexError, TypeError):
+            decoded = None
+        return decoded or url
+
+    async def enrich_one(self, session: aiohttp.ClientSession, article: dict) -> str:
+        """Fills article['full_text'] in place and returns the extraction status."""
+        if article.get("metadata") is None:
+            article["metadata"] = {}
+        metadata = article["metadata"]
+        try:
+            resolved = await self.resolve_url(session, article["url"])
+            if google_news_article_id(resolved):
+                status = "unresolved"
+            else:
+                metadata["resolved_url"] = resolved
+                final_url, html = await self._request(session, "GET", resolved)
+                extracted = await asyncio.to_thread(parse_article_html, html)
+                article["full_text"] = extracted["full_text"] or None
+                if extracted["abstract"]:
+                    metadata["extracted_abstract"] = extracted["abstract"]
+                status = "success" if extracted["full_text"] else "empty"
+        except asyncio.TimeoutError:
+            status = "timeout"
+        except Exception as e:
+            status = f"error: {str(e)[:50]}"
+        metadata["extraction_status"] = status
+        return status
+
+    async def enrich(self, articles: List[dict]) -> Dict[str, int]:
+        """Enriches every article without full_text from config.ENRICHMENT_SOURCES. Returns status counts."""
+        targets = [
+            a for a in articles
+            if not a.get("full_text")
+            and a.get("source_id") in config.ENRICHMENT_SOURCES
+            and str(a.get("url", "")).startswith("http")
+        ]
+        if not targets:
+            return {}
+
+        print(f"\n--- Enriching full text for {len(targets)} articles ---")
+        start = time.time()
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        # brotli is not a dependency, so don't advertise 'br'
+        headers = {**HEADERS, "Accept-Encoding": "gzip, deflate"}
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            statuses = await asyncio.gather(*[self.enrich_one(session, a) for a in targets])
+
+        counts: Dict[str, int] = {}
+        for status in statuses:
+            key = status if not status.startswith("error") else "error"
+            counts[key] = counts.get(key, 0) + 1
+        elapsed = max(time.time() - start, 1e-9)
+        print(f"Enrichment: {counts} in {elapsed:.1f}s ({len(targets) / elapsed * 60:.0f} articles/min)")
+        return counts
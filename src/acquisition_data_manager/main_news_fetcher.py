@@ -6,6 +6,7 @@ defined in config.py.
 
 import sys
 import os
+import time
 
 # Add root directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -19,13 +20,56 @@ except ImportError:
     except ImportError:
         from acquisition_manager import UnifiedAcquisitionManager
 
-def main(target_theme=None):
+def process_theme(manager, theme_id, theme_data, articles=None):
+    """Fetches (unless articles are given) and saves all keywords of a single theme."""
+    print(f"\n" + "="*40)
+    print(f"🚀 PROCESSING THEME: {theme_data['name']}")
+    print(f"ID: {theme_id}")
+    print("="*40)
+    
+    # Get theme-specific output directories
+    theme_dirs = config.get_theme_dirs(theme_id)
+    
+    # Get keywords for this theme
+    terms = theme_data.get("keywords", [])
+    print(f"Search Terms: {len(terms)}")
+    
+    # 3. Fetch Data (passing output context)
+    # Note: We pass theme_dirs so adapters know where to save auxiliary files (CSVs)
+    if articles is None:
+        articles = manager.fetch_all(terms, output_dirs=theme_dirs)
+    
+    # Keep only articles not seen in previous runs (persistent per-theme index)
+    if config.ACQUISITION_INCREMENTAL and articles:
+        articles = manager.filter_new_articles(articles, theme_dirs["DATA"])
+
+    # Fill full_text for new articles only (Google News listings have just a title)
+    if config.ENRICHMENT_ENABLED and articles:
+        manager.enrich_articles(articles)
+    
+    # 4. Save Results to Theme Data Folder
+    if articles:
+        # Save to the specific data folder for this theme
+        if config.ARTICLE_STORE_ENABLED:
+            manager.save_to_store(articles, theme_dirs["DATA"])
+        if config.LEGACY_JSON_SNAPSHOTS or not config.ARTICLE_STORE_ENABLED:
+            manager.save_to_json(articles, output_dir=theme_dirs["DATA"])
+    else:
+        print(f"\nNo new data found for theme: {theme_data['name']}")
+
+    # Only now (saved) the delta counts as seen: a failed run re-emits it next time
+    if config.ACQUISITION_INCREMENTAL:
+        manager.mark_articles_seen(theme_dirs["DATA"])
+
+def main(target_theme=None, cache_only=False):
     print("="*60)
     print("REFLEXIVITY TRENDS - UNIFIED DATA ACQUISITION")
     print("="*60)
     
+    start_time = time.time()
+    
     # 1. Initialize Manager
-    manager = UnifiedAcquisitionManager()
+    manager = UnifiedAcquisitionManager(cache_only=cache_only)
     
     # 2. Iterate over Investing Themes
     all_themes = config.INVESTING_THEMES
@@ -41,41 +85,47 @@ def main(target_theme=None):
         themes_to_process = all_themes
         print(f"🔄 Bulk Mode: Processing ALL enabled themes")
     
+    enabled_themes = []
     for theme_id, theme_data in themes_to_process.items():
         if not theme_data.get("enabled", False):
             print(f"\n[SKIP] Theme '{theme_data['name']}' is DISABLED or FROZEN.")
             continue
-            
-        print(f"\n" + "="*40)
-        print(f"🚀 PROCESSING THEME: {theme_data['name']}")
-        print(f"ID: {theme_id}")
-        print("="*40)
-        
-        # Get theme-specific output directories
-        theme_dirs = config.get_theme_dirs(theme_id)
-        
-        # Get keywords for this theme
-        terms = theme_data.get("keywords", [])
-        print(f"Search Terms: {len(terms)}")
-        
-        # 3. Fetch Data (passing output context)
-        # Note: We pass theme_dirs so adapters know where to save auxiliary files (CSVs)
-        articles = manager.fetch_all(terms, output_dirs=theme_dirs)
-        
-        # 4. Save Results to Theme Data Folder
-        if articles:
-            # Save to the specific data folder for this theme
-            manager.save_to_json(articles, output_dir=theme_dirs["DATA"])
-        else:
-            print(f"\nNo data found for theme: {theme_data['name']}")
+        enabled_themes.append((theme_id, theme_data))
+
+    if config.ACQUISITION_CONCURRENT and len(enabled_themes) > 1:
+        # All themes are fetched on one event loop, so per-source limits stay global
+        jobs = {
+            theme_id: (theme_data.get("keywords", []), config.get_theme_dirs(theme_id))
+            for theme_id, theme_data in enabled_themes
+        }
+        fetched = manager.fetch_themes(jobs)
+        for theme_id, theme_data in enabled_themes:
+            process_theme(manager, theme_id, theme_data, articles=fetched[theme_id])
+    else:
+        for theme_id, theme_data in enabled_themes:
+            process_theme(manager, theme_id, theme_data)
+
+    failed = {k: v for k, v in manager.failure_counts.items() if v}
+    if failed:
+        print(f"\nTotal fetch failures per source: {failed}")
+
+    print(f"Remote calls per source: {manager.call_counts}")
+    cost = manager.estimated_cost()
+    if cost:
+        print(f"Estimated paid units per source: {cost}")
+
+    if manager.cache:
+        print(f"Response cache: {manager.cache.stats()}")
+    print(f"Quota used today: {manager.quota_usage()}")
 
     print("\n" + "="*60)
-    print("Acquisition process completed.")
+    print(f"Acquisition process completed in {time.time() - start_time:.2f}s.")
 
 if __name__ == "__main__":
     # helper for manual run
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--theme", help="Specific theme to run")
+    parser.add_argument("--cache-only", action="store_true", help="Replay recorded responses only (offline)")
     args = parser.parse_args()
-    main(target_theme=args.theme)
+    main(target_theme=args.theme, cache_only=args.cache_only)
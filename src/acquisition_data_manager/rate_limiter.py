@@ -0,0 +1,305 @@
+"""
+Rate Limiter / Quota Scheduler
+Central, thread-safe throttling for every remote service used by the pipeline
+(Google News, SerpApi, Groq...).
+
+Per source (config.SOURCE_RATE_LIMITS):
+    - Token bucket: sustained requests/sec ('rps') with a 'burst' allowance.
+    - Daily quota ('daily_quota'): calls per UTC day, persisted across runs in SQLite.
+    - Exponential backoff with jitter on 429 / 5xx responses (honours Retry-After).
+
+Usage:
+    scheduler = get_scheduler()
+    result = scheduler.call("serpapi_trends", lambda: GoogleSearch(params).get_dict())
+"""
+
+import os
+import sys
+import time
+import random
+import atexit
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Add root directory to path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+
+class QuotaExceededError(Exception):
+    """The daily quota of a source is spent; the call was not made."""
+
+
+class RateLimitError(Exception):
+    """Raised by callers when a service answers 429 / 5xx in its payload instead of an HTTP error."""
+
+    def __init__(self, message: str, status_code: int = 429, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """Best-effort HTTP status of an exception raised by requests / groq / httpx style clients."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    value = getattr(exc, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    status = _status_code(exc)
+    return status is not None and (status == 429 or status >= 500)
+
+
+class TokenBucket:
+    """Reservation-based token bucket: each acquire() reserves a slot and sleeps until it is due."""
+
+    def __init__(self, rps: float, burst: int = 1):
+        self.rps = rps
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes one token and returns how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rps)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rps
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class QuotaLedger:
+    """
+    Calls per source per UTC day, persisted in SQLite so budgets survive restarts.
+
+    Sources with a daily quota are checked and written through on every call
+    (their volume is low and the budget is shared by concurrent runs). Unlimited
+    sources are only counted: increments are kept in memory and flushed every
+    `flush_every` calls / `flush_interval` seconds, and on close().
+    """
+
+    def __init__(self, path: str, flush_every: int = 50, flush_interval: float = 5.0):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._pending_calls = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS usage (
+                source TEXT NOT NULL,
+                day TEXT NOT NULL,
+                calls INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (source, day)
+            )
+        """)
+        self.conn.commit()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def used(self, source: str) -> int:
+        day = self._today()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT calls FROM usage WHERE source = ? AND day = ?", (source, day)
+            ).fetchone()
+            return (row[0] if row else 0) + self._pending.get((source, day), 0)
+
+    def needs_io(self, daily_quota: Optional[int]) -> bool:
+        """Whether consume() will touch SQLite (quota check or a due flush)."""
+        return daily_quota is not None or self._pending_calls + 1 >= self.flush_every or \
+            time.monotonic() - self._last_flush >= self.flush_interval
+
+    def consume(self, source: str, daily_quota: Optional[int]):
+        """Records one call, or raises QuotaExceededError if the budget is already spent."""
+        day = self._today()
+        with self._lock:
+            if daily_quota is None:
+                self._pending[(source, day)] = self._pending.get((source, day), 0) + 1
+                self._pending_calls += 1
+                if self._pending_calls >= self.flush_every or \
+                        time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_locked()
+                return
+            row = self.conn.execute(
+                "SELECT calls FROM usage WHERE source = ? AND day = ?", (source, day)
+            ).fetchone()
+            used = row[0] if row else 0
+            if used >= daily_quota:
+                raise QuotaExceededError(f"Daily quota for '{source}' spent ({used}/{daily_quota})")
+            self.conn.execute("""
+                INSERT INTO usage (source, day, calls) VALUES (?, ?, 1)
+                ON CONFLICT(source, day) DO UPDATE SET calls = calls + 1
+            """, (source, day))
+            self.conn.commit()
+
+    def _flush_locked(self):
+        if self._pending:
+            self.conn.executemany("""
+                INSERT INTO usage (source, day, calls) VALUES (?, ?, ?)
+                ON CONFLICT(source, day) DO UPDATE SET calls = calls + excluded.calls
+            """, [(source, day, calls) for (source, day), calls in self._pending.items()])
+            self.conn.commit()
+            self._pending.clear()
+        self._pending_calls = 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Writes the buffered counts of unlimited sources."""
+        with self._lock:
+            try:
+                self._flush_locked()
+            except sqlite3.ProgrammingError:
+                pass  # connection already closed
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self.conn.close()
+
+    def usage_today(self) -> Dict[str, int]:
+        day = self._today()
+        with self._lock:
+            rows = dict(self.conn.execute(
+                "SELECT source, calls FROM usage WHERE day = ?", (day,)
+            ).fetchall())
+            for (source, pending_day), calls in self._pending.items():
+                if pending_day == day:
+                    rows[source] = rows.get(source, 0) + calls
+        return rows
+
+
+class RateScheduler:
+    """Shared token buckets + quota ledger + backoff policy for all sources."""
+
+    def __init__(self, limits: Dict[str, Dict[str, Any]], ledger_path: str,
+                 max_retries: int = 4, backoff_base: float = 1.0, backoff_max: float = 60.0):
+        self.limits = limits
+        self.ledger = QuotaLedger(ledger_path)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, source: str) -> str:
+        """Sources billed to the same account share one bucket and ledger entry ('ledger_key')."""
+        return self.limits.get(source, {}).get("ledger_key", source)
+
+    def _limits_for(self, source: str) -> Dict[str, Any]:
+        key = self._key(source)
+        return self.limits.get(key, self.limits.get("default", {}))
+
+    def _bucket(self, source: str) -> Optional[TokenBucket]:
+        key = self._key(source)
+        with self._lock:
+            if key not in self._buckets:
+                limits = self._limits_for(source)
+                rps = limits.get("rps")
+                self._buckets[key] = TokenBucket(rps, limits.get("burst", 1)) if rps else None
+            return self._buckets[key]
+
+    def acquire(self, source: str):
+        """Blocks until the source's token bucket allows a request, then charges its daily quota."""
+        self.ledger.consume(self._key(source), self._limits_for(source).get("daily_quota"))
+        bucket = self._bucket(source)
+        if bucket:
+            bucket.acquire()
+
+    async def aacquire(self, source: str):
+        """Async variant of acquire(): waits on the event loop instead of blocking the thread."""
+        daily_quota = self._limits_for(source).get("daily_quota")
+        if self.ledger.needs_io(daily_quota):
+            # Quota check / batch flush hit SQLite: keep them off the event loop
+            await asyncio.to_thread(self.ledger.consume, self._key(source), daily_quota)
+        else:
+            self.ledger.consume(self._key(source), daily_quota)
+        bucket = self._bucket(source)
+        if bucket:
+            wait = bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after)
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def call(self, source: str, fn: Callable[[], Any],
+             on_retry: Optional[Callable[[Exception], None]] = None) -> Any:
+        """
+        Runs fn under the source's rate limit and quota. Retries with exponential
+        backoff on 429 / 5xx errors; other errors propagate immediately.
+        on_retry is notified of every retryable error (e.g. to shrink concurrency).
+        """
+        attempt = 0
+        while True:
+            self.acquire(source)
+            try:
+                return fn()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                if on_retry:
+                    on_retry(e)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt, _retry_after(e))
+                print(f"  [RateLimit] {source}: HTTP {_status_code(e)}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+
+    def usage_today(self) -> Dict[str, str]:
+        """Calls made today per source, with their daily budget."""
+        usage = self.ledger.usage_today()
+        return {
+            source: f"{calls}/{self._limits_for(source).get('daily_quota') or '∞'}"
+            for source, calls in usage.items()
+        }
+
+
+_scheduler: Optional[RateScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RateScheduler:
+    """Process-wide scheduler built from config.SOURCE_RATE_LIMITS."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RateScheduler(
+                config.SOURCE_RATE_LIMITS,
+                config.RATE_LIMIT_LEDGER_PATH,
+                max_retries=config.RATE_LIMIT_MAX_RETRIES,
+                backoff_base=config.RATE_LIMIT_BACKOFF_BASE
+            )
+        return _scheduler
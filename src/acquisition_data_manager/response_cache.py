@@ -0,0 +1,187 @@
+"""
+Response Cache
+On-disk TTL cache for raw adapter responses (GNews results, SerpApi payloads).
+
+Keyed by adapter + query params, stored in a single SQLite file and bounded
+by total size with LRU eviction (the running total lives in the meta table, so
+a put never scans the whole cache). In cache-only mode the remote service is
+never called: a miss raises CacheMissError, which lets the whole acquisition
+stage be replayed offline against recorded responses.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class CacheMissError(Exception):
+    """Raised in cache-only mode when a response was never recorded."""
+
+
+_MISS = object()
+
+
+class ResponseCache:
+    """
+    Thread-safe (single connection + lock) response cache.
+
+    Args:
+        path: SQLite file path.
+        ttl_seconds: Max age of a cached response (ignored in cache-only mode).
+        max_bytes: Total payload budget; least recently used entries are evicted first.
+        cache_only: Never call the remote service; raise CacheMissError on misses.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 6 * 3600, max_bytes: int = 200 * 1024 * 1024,
+                 cache_only: bool = False):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.cache_only = cache_only
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                adapter TEXT NOT NULL,
+                params TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        # Caches created before the running total existed are summed once
+        self.conn.execute("""
+            INSERT OR IGNORE INTO meta (key, value)
+            SELECT 'total_bytes', COALESCE(SUM(size), 0) FROM responses
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(adapter: str, params: Dict[str, Any]) -> str:
+        raw = json.dumps({"adapter": adapter, "params": params}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def get(self, adapter: str, params: Dict[str, Any]):
+        """Returns the cached payload or the module-level _MISS sentinel."""
+        key = self.make_key(adapter, params)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return _MISS
+            if not self.cache_only and now - row[1] > self.ttl_seconds:
+                self._delete(key)
+                self.conn.commit()
+                return _MISS
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+        return json.loads(row[0])
+
+    def put(self, adapter: str, params: Dict[str, Any], payload: Any):
+        key = self.make_key(adapter, params)
+        data = json.dumps(payload, ensure_ascii=False)
+        now = time.time()
+        size = len(data.encode("utf-8"))
+        with self._lock:
+            self._delete(key)
+            self.conn.execute("""
+                INSERT INTO responses (key, adapter, params, payload, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (key, adapter, json.dumps(params, sort_keys=True, ensure_ascii=False), data, size, now, now))
+            self._add_bytes(size)
+            self._evict()
+            self.conn.commit()
+
+    def invalidate(self, adapter_prefix: str, keep: Optional[str] = None) -> int:
+        """Deletes every entry whose adapter starts with adapter_prefix (except `keep`). Returns the count."""
+        where = "substr(adapter, 1, ?) = ? AND adapter != ?"
+        args = (len(adapter_prefix), adapter_prefix, keep or "")
+        with self._lock:
+            freed = self.conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM responses WHERE {where}", args).fetchone()[0]
+            cursor = self.conn.execute(f"DELETE FROM responses WHERE {where}", args)
+            self._add_bytes(-freed)
+            self.conn.commit()
+        return cursor.rowcount
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes()
+
+    def _total_bytes(self) -> int:
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'total_bytes'").fetchone()[0]
+
+    def _add_bytes(self, delta: int):
+        if delta:
+            self.conn.execute("UPDATE meta SET value = value + ? WHERE key = 'total_bytes'", (delta,))
+
+    def _delete(self, key: str):
+        """Removes one entry and its bytes from the running total. Caller holds the lock."""
+        row = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._add_bytes(-row[0])
+
+    def _evict(self, batch: int = 64):
+        """Drops least recently used entries until the size budget is met. Caller holds the lock."""
+        total = self._total_bytes()
+        while total > self.max_bytes:
+            rows = self.conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC LIMIT ?", (batch,)
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._add_bytes(-size)
+                total -= size
+
+    def get_or_fetch(self, adapter: str, params: Dict[str, Any], fetch_fn: Callable[[], Any],
+                     cacheable: Optional[Callable[[Any], bool]] = None):
+        """
+        Returns the cached response for (adapter, params) or calls fetch_fn and
+        records its result. `cacheable` can reject payloads (e.g. API errors).
+        """
+        payload = self.get(adapter, params)
+        with self._lock:
+            if payload is not _MISS:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if payload is not _MISS:
+            return payload
+
+        if self.cache_only:
+            raise CacheMissError(f"No recorded response for {adapter} {params}")
+
+        payload = fetch_fn()
+        if cacheable is None or cacheable(payload):
+            self.put(adapter, params, payload)
+        return payload
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            size = self._total_bytes()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import List
 from gnews import GNews
 from ..base_source import BaseSource, StandardArticle
-from src.models import ArticleModel
+from src.models import validate_articles
 
 # Add root directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -14,6 +14,10 @@ class GNewsAdapter(BaseSource):
     """
     Adapter for GNews library to fetch news articles.
     """
+
+    # Free service, tolerant to a few parallel requests
+    max_concurrency = 4
+    cost_per_call = 0.0
     
     def __init__(self):
         self.client = GNews(
@@ -28,8 +32,15 @@ class GNewsAdapter(BaseSource):
     def fetch(self, query: str) -> List[StandardArticle]:
         print(f"  [GNews] Searching for: {query}...")
         try:
-            results = self.client.get_news(query)
-            articles: List[StandardArticle] = []
+            cache_params = {
+                "query": query,
+                "language": config.GNEWS_LANGUAGE,
+                "country": config.GNEWS_COUNTRY,
+                "period": config.GNEWS_PERIOD,
+                "max_results": config.GNEWS_MAX_RESULTS,
+            }
+            results = self.cached_call(cache_params, lambda: self.client.get_news(query))
+            raw_articles = []
             
             for item in results:
                 # GNews returns: title, description, published date, url, publisher
@@ -39,7 +50,7 @@ class GNewsAdapter(BaseSource):
                 if not snippet or snippet == " ":
                     snippet = item.get("title", "") # Fallback to title
 
-                article_data = {
+                raw_articles.append({
                     "source_id": self.source_id,
                     "source_name": item.get("publisher", {}).get("title", "Google News"),
                     "title": item.get("title", "No Title"),
@@ -50,19 +61,18 @@ class GNewsAdapter(BaseSource):
                     "metadata": {
                         "original_publisher": item.get("publisher", {})
                     }
-                }
-                
-                # Validate
-                try:
-                    article_model = ArticleModel(**article_data)
-                    articles.append(article_model.model_dump())
-                except Exception as e:
-                    print(f"  [GNews] Validation Error: {e}")
-                    continue
+                })
+
+            # Validate the whole result list at once (no per-item model round trip)
+            articles: List[StandardArticle]
+            articles, errors = validate_articles(raw_articles)
+            for index, error in errors:
+                print(f"  [GNews] Validation Error (item {index}): {error}")
                 
             print(f"  [GNews] Found {len(articles)} articles.")
             return articles
             
         except Exception as e:
             print(f"  [GNews] Error: {e}")
-            return []
+            # Let the manager count this as a failure for the source
+            raise
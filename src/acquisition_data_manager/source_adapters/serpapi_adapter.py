@@ -4,13 +4,24 @@ from datetime import datetime
 from typing import List
 from serpapi import GoogleSearch
 from ..base_source import BaseSource, StandardArticle
-from src.models import ArticleModel
+from ..rate_limiter import RateLimitError
+from src.models import validate_articles
 import json
+import math
 import pandas as pd
 
 # Add root directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from src.trend_store import TrendStore, TRENDS_FILENAME, timeline_points
+from src.trend_analytics import theme_trend_stats, describe_trend
+
+
+def _finite(value):
+    """JSON-safe float (NaN -> None)."""
+    value = float(value)
+    return value if math.isfinite(value) else None
+
 
 class SerpApiTrendsAdapter(BaseSource):
     """
@@ -18,6 +29,11 @@ class SerpApiTrendsAdapter(BaseSource):
     Converts Time-Series trend data into a 'News Article' format 
     so it can be ingested by the same pipeline.
     """
+
+    # Writes to the theme's trend store (output_dirs['DATA']); each search costs one SerpApi credit
+    needs_output_dirs = True
+    max_concurrency = 2
+    cost_per_call = 1.0
     
     def __init__(self):
         self.api_key = config.SERPAPI_API_KEY
@@ -26,8 +42,50 @@ class SerpApiTrendsAdapter(BaseSource):
         if not self.api_key:
             print("  [SerpApi] WARNING: No API Key found in config or environment.")
 
+    @staticmethod
+    def _search(params):
+        """Remote call. SerpApi reports throttling inside the payload, so surface it as a 429."""
+        results = GoogleSearch(params).get_dict()
+        error = str(results.get("error", "")).lower()
+        if "too many requests" in error or "rate limit" in error:
+            raise RateLimitError(results["error"], status_code=429)
+        return results
+
+    @staticmethod
+    def _export_csv(query, timeline, output_dirs=None):
+        try:
+            # Create dataframe
+            timeline_df = pd.DataFrame([
+                {
+                    "date": point.get("date", ""),
+                    "timestamp": point.get("timestamp", ""),
+                    "value": point.get("values", [{}])[0].get("extracted_value", 0)
+                }
+                for point in timeline
+            ])
+            
+            # Define path: Prefer passed context, fallback to global
+            if output_dirs and "TRENDS_CSV" in output_dirs:
+                data_dir = output_dirs["TRENDS_CSV"]
+            else:
+                data_dir = config.DIRS["TRENDS_CSV"]
+                
+            os.makedirs(data_dir, exist_ok=True)
+            
+            date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
+            safe_query = query.replace(" ", "_").replace("/", "-")
+            csv_filename = f"serpapi_sub_{safe_query}_{date_str}.csv"
+            csv_path = os.path.join(data_dir, csv_filename)
+            
+            timeline_df.to_csv(csv_path, index=False)
+            print(f"  [SerpApi] Saved numerical data to: {csv_path}")
+            
+        except Exception as csv_e:
+            print(f"  [SerpApi] Error saving CSV: {csv_e}")
+
     def fetch(self, query: str, output_dirs=None) -> List[StandardArticle]:
-        if not self.api_key:
+        # In cache-only replay the key is not needed
+        if not self.api_key and not (self.cache and self.cache.cache_only):
             return []
             
         print(f"  [SerpApi] Fetching Trends data for: {query}...")
@@ -40,8 +98,13 @@ class SerpApiTrendsAdapter(BaseSource):
         }
 
         try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
+            # Cache key excludes the API key
+            cache_params = {k: v for k, v in params.items() if k != "api_key"}
+            results = self.cached_call(
+                cache_params,
+                lambda: self._search(params),
+                cacheable=lambda r: isinstance(r, dict) and "error" not in r
+            )
             
             articles: List[StandardArticle] = []
             
@@ -50,9 +113,20 @@ class SerpApiTrendsAdapter(BaseSource):
                 if not timeline:
                     return []
                 
+                # Consolidate the timeline into the theme's time-series store (upsert)
+                stats = None
+                try:
+                    data_dir = output_dirs["DATA"] if output_dirs and "DATA" in output_dirs else config.DIRS["DATA"]
+                    with TrendStore(data_dir) as store:
+                        written = store.upsert(query, timeline_points(timeline))
+                    print(f"  [SerpApi] Upserted {written} points into {os.path.join(data_dir, TRENDS_FILENAME)}")
+                    stats = theme_trend_stats(data_dir, [query]).loc[query]
+                except Exception as store_e:
+                    print(f"  [SerpApi] Error updating trend store: {store_e}")
+
                 # Create a "summary" article representing the trend
                 # We analyze the last few data points to see direction
-                last_points = timeline[-5:]
+                last_points = timeline[-config.TRENDS_RECENT_WINDOW:]
                 trend_values = [p.get("values", [{}])[0].get("extracted_value", 0) for p in last_points]
                 
                 start_date = timeline[0]["date"]
@@ -65,6 +139,18 @@ class SerpApiTrendsAdapter(BaseSource):
                    f"Recent interest levels: {trend_values}. "
                    f"Average interest: {avg_value:.1f}/100. "
                 )
+                metadata = {
+                    "average_interest": avg_value,
+                    "data_points": len(timeline)
+                }
+                if stats is not None:
+                    abstract += describe_trend(stats)
+                    metadata.update({
+                        "momentum": _finite(stats["momentum"]),
+                        "slope": _finite(stats["slope"]),
+                        "zscore": _finite(stats["zscore"]),
+                        "breakout": bool(stats["breakout"]),
+                    })
                 
                 # Construct article dict
                 article_data = {
@@ -75,58 +161,26 @@ class SerpApiTrendsAdapter(BaseSource):
                     "published_date": datetime.now().isoformat(),
                     "abstract": abstract,
                     "full_text": json.dumps(timeline[:20]), # Store first 20 points as 'full text' raw data
-                    "metadata": {
-                        "average_interest": avg_value,
-                        "data_points": len(timeline)
-                    }
+                    "metadata": metadata
                 }
                 
-                # Validate with Pydantic
-                try:
-                    article_model = ArticleModel(**article_data)
-                    article = article_model.model_dump()
-                    articles.append(article)
-                except Exception as e:
-                    print(f"  [SerpApi] Validation Error for {query}: {e}")
+                # Validate
+                valid, errors = validate_articles([article_data])
+                if errors:
+                    print(f"  [SerpApi] Validation Error for {query}: {errors[0][1]}")
                     # If validation fails, we skip this article and continue
                     return []
+                articles.extend(valid)
                 
                 print(f"  [SerpApi] Generated trend report.")
 
-                # --- EXPORT CSV ---
-                try:
-                    # Create dataframe
-                    timeline_df = pd.DataFrame([
-                        {
-                            "date": point.get("date", ""),
-                            "timestamp": point.get("timestamp", ""),
-                            "value": point.get("values", [{}])[0].get("extracted_value", 0)
-                        }
-                        for point in timeline
-                    ])
-                    
-                    # Define path: Prefer passed context, fallback to global
-                    if output_dirs and "TRENDS_CSV" in output_dirs:
-                        data_dir = output_dirs["TRENDS_CSV"]
-                    else:
-                        data_dir = config.DIRS["TRENDS_CSV"]
-                        
-                    os.makedirs(data_dir, exist_ok=True)
-                    
-                    
-                    date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    safe_query = query.replace(" ", "_").replace("/", "-")
-                    csv_filename = f"serpapi_sub_{safe_query}_{date_str}.csv"
-                    csv_path = os.path.join(data_dir, csv_filename)
-                    
-                    timeline_df.to_csv(csv_path, index=False)
-                    print(f"  [SerpApi] Saved numerical data to: {csv_path}")
-                    
-                except Exception as csv_e:
-                    print(f"  [SerpApi] Error saving CSV: {csv_e}")
+                # --- EXPORT CSV (legacy, per query and run) ---
+                if config.TRENDS_CSV_EXPORT:
+                    self._export_csv(query, timeline, output_dirs)
 
             return articles
 
         except Exception as e:
             print(f"  [SerpApi] Error: {e}")
-            return []
+            # Let the manager count this as a failure for the source
+            raise
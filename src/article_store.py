@@ -0,0 +1,223 @@
+"""
+Article Store
+Append-only JSONL store partitioned by theme and date, with streaming
+writers and iterator-based readers (memory stays flat as history grows).
+
+Layout (one store per theme and kind, e.g. 'unified' or 'analyzed'):
+    data/<theme>/store/<kind>/<YYYY-MM-DD>.jsonl   one article per line
+    data/<theme>/store/<kind>/_runs.jsonl          manifest, one line per appended run
+
+Each run records the byte range it wrote inside its partition, so a run can
+be re-read with a single seek and appends never rewrite previous data.
+Lines written by a run that crashed before committing are ignored by readers.
+"""
+
+import os
+import json
+import glob
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+MANIFEST_FILENAME = "_runs.jsonl"
+
+
+class StoreWriter:
+    """Streams articles into today's partition; the run is committed on close()."""
+
+    def __init__(self, store: "ArticleStore", run_id: Optional[str] = None):
+        now = datetime.now()
+        self.store = store
+        self.run_id = run_id or now.strftime("%Y%m%d_%H%M%S_%f")
+        self.partition = now.strftime("%Y-%m-%d")
+        self.count = 0
+        self.run: Optional[Dict[str, Any]] = None
+        os.makedirs(store.root, exist_ok=True)
+        self._file = open(store.partition_path(self.partition), "ab")
+        self._start = self._file.seek(0, os.SEEK_END)
+
+    def write(self, article: Dict[str, Any]):
+        self._file.write((json.dumps(article, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.count += 1
+
+    def write_many(self, articles: Iterable[Dict[str, Any]]):
+        for article in articles:
+            self.write(article)
+
+    def flush(self):
+        """Pushes written lines to disk (they stay uncommitted until close)."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> Dict[str, Any]:
+        """Commits the run to the manifest and returns its entry."""
+        if self.run is not None:
+            return self.run
+        self.flush()
+        end = self._file.tell()
+        self._file.close()
+        run = {
+            "run_id": self.run_id,
+            "partition": self.partition,
+            "start": self._start,
+            "end": end,
+            "count": self.count,
+            "created_at": datetime.now().isoformat(),
+        }
+        with open(self.store.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+        self.run = run
+        return run
+
+    def abort(self):
+        """Abandons the run without committing it; readers ignore its lines."""
+        if self.run is None and not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Only a run that finished cleanly is committed; errors / Ctrl-C abandon it
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class ArticleStore:
+    """Append-only partitioned store for one theme data dir and one kind."""
+
+    def __init__(self, data_dir: str, kind: str):
+        self.root = os.path.join(data_dir, "store", kind)
+        self.manifest_path = os.path.join(self.root, MANIFEST_FILENAME)
+
+    def partition_path(self, partition: str) -> str:
+        return os.path.join(self.root, f"{partition}.jsonl")
+
+    def writer(self, run_id: Optional[str] = None) -> StoreWriter:
+        return StoreWriter(self, run_id)
+
+    def append(self, articles: Iterable[Dict[str, Any]], run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Appends all articles as a single run."""
+        with self.writer(run_id) as writer:
+            writer.write_many(articles)
+        return writer.run
+
+    def runs(self) -> Iterator[Dict[str, Any]]:
+        """Committed runs, oldest first."""
+        if not os.path.exists(self.manifest_path):
+            return
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def latest_run(self) -> Optional[Dict[str, Any]]:
+        latest = None
+        for run in self.runs():
+            latest = run
+        return latest
+
+    def iter_run(self, run: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Streams the articles of a single run."""
+        with open(self.partition_path(run["partition"]), "rb") as f:
+            f.seek(run["start"])
+            while f.tell() < run["end"]:
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    yield json.loads(line)
+
+    def iter_articles(self, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Streams every committed article, oldest run first.
+        since/until are inclusive 'YYYY-MM-DD' partition bounds.
+        """
+        for run in self.runs():
+            if since and run["partition"] < since:
+                continue
+            if until and run["partition"] > until:
+                continue
+            yield from self.iter_run(run)
+
+
+def write_json_array(path: str, articles: Iterable[Dict[str, Any]]) -> int:
+    """
+    Streams articles into a JSON array file with the same layout as
+    json.dump(..., indent=2), without materializing the full list.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for article in articles:
+            f.write(",\n  " if count else "\n  ")
+            f.write(json.dumps(article, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+            count += 1
+        f.write("\n]" if count else "]")
+    return count
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """Incrementally parses a top-level JSON array of objects, one item at a time."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        started = False
+        eof = False
+        while True:
+            # Skip whitespace and separators
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if not started and pos < len(buffer):
+                if buffer[pos] != "[":
+                    raise ValueError(f"{path} is not a JSON array")
+                started = True
+                pos += 1
+                continue
+            if started and pos < len(buffer) and buffer[pos] == "]":
+                return
+            if pos < len(buffer):
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    yield item
+                    pos = end
+                    continue
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+            elif eof:
+                return
+            # Need more data
+            chunk = f.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+
+
+def latest_reader(data_dir: str, kind: str, legacy_prefix: str) -> Callable[[], Iterator[Dict[str, Any]]]:
+    """
+    Resolves the most recent batch of a theme once (the latest store run if the
+    store has any, otherwise the newest legacy '<legacy_prefix>*.json' snapshot)
+    and returns a function that opens a fresh stream over it, for multi-pass readers.
+    """
+    store = ArticleStore(data_dir, kind)
+    run = store.latest_run()
+    if run:
+        print(f"Reading store '{kind}' run {run['run_id']} ({run['count']} articles)")
+        return lambda: store.iter_run(run)
+
+    files = glob.glob(os.path.join(data_dir, f"{legacy_prefix}*.json"))
+    if not files:
+        return lambda: iter(())
+    latest_file = max(files, key=os.path.getmtime)
+    print(f"Reading snapshot: {latest_file}")
+    return lambda: iter_json_array(latest_file)
+
+
+def iter_latest(data_dir: str, kind: str, legacy_prefix: str) -> Iterator[Dict[str, Any]]:
+    """Streams the most recent batch of a theme (see latest_reader)."""
+    return latest_reader(data_dir, kind, legacy_prefix)()
@@ -0,0 +1,95 @@
+"""
+Checkpoint del Análisis (write-ahead log)
+Cada resultado del LLM se añade a data/<theme>/analysis_checkpoint.jsonl en
+cuanto se produce, así un fallo o Ctrl-C no tira el trabajo ya pagado.
+
+- Una línea por artículo: {"id": <id estable>, "result": {...}}
+- Con --resume se cargan los ids completados y se saltan esos artículos.
+- Una última línea truncada (crash a mitad de escritura) se ignora al leer y
+  se recorta del fichero antes de seguir añadiendo.
+- Tras la compactación (store 'analyzed' + analyzed_reflexivity_*.json) el
+  checkpoint se elimina.
+"""
+
+import os
+import json
+from typing import Any, Dict
+
+from src.acquisition_data_manager.article_index import canonicalize_url, title_hash
+
+CHECKPOINT_FILENAME = "analysis_checkpoint.jsonl"
+
+
+def article_id(article: Dict[str, Any]) -> str:
+    """Id estable de un artículo: URL canónica o, si no hay, hash del título."""
+    url = article.get("url")
+    if isinstance(url, str) and url:
+        return canonicalize_url(url)
+    return f"title:{title_hash(str(article.get('title') or ''))}"
+
+
+class AnalysisCheckpoint:
+    """Log JSONL append-only de resultados de análisis de un tema."""
+
+    def __init__(self, data_dir: str, resume: bool = False):
+        os.makedirs(data_dir, exist_ok=True)
+        self.path = os.path.join(data_dir, CHECKPOINT_FILENAME)
+        self.done: Dict[str, Dict[str, Any]] = {}
+        if resume:
+            self.done = self._load()
+            self._truncate_partial_line()
+        elif os.path.exists(self.path) and os.path.getsize(self.path):
+            print(f"Aviso: se descarta un checkpoint previo sin --resume ({self.path})")
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        done = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Línea a medio escribir al caerse el proceso
+                    continue
+                done[entry["id"]] = entry["result"]
+        return done
+
+    def _truncate_partial_line(self):
+        """Recorta el fichero hasta el último salto de línea, para no pegar la siguiente entrada al fragmento."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                step = min(4096, end)
+                f.seek(end - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline >= 0:
+                    end = end - step + newline + 1
+                    break
+                end -= step
+            if end < size:
+                f.truncate(end)
+
+    def append(self, article: Dict[str, Any], result: Dict[str, Any]):
+        """Registra el resultado de un artículo (flush inmediato al SO)."""
+        entry_id = article_id(article)
+        self._file.write(json.dumps({"id": entry_id, "result": result}, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.done[entry_id] = result
+
+    def close(self):
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def discard(self):
+        """Elimina el checkpoint una vez compactado en las salidas finales."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
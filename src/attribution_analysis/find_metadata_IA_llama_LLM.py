@@ -13,34 +13,59 @@ import os
 import sys
 import json
 import time
-import glob
-import pandas as pd
+import threading
 from datetime import datetime
-from groq import Groq
+from itertools import islice
 from dotenv import load_dotenv
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 import config
+from src.article_store import ArticleStore, latest_reader, write_json_array
+from src.acquisition_data_manager.rate_limiter import get_scheduler
+from src.attribution_analysis.near_duplicates import article_summary, cluster_ids, cluster_near_duplicates, fan_out
+from src.attribution_analysis.llm_engine import AnalysisEngine
+from src.attribution_analysis.llm_backends import create_backend, get_backend, set_backend
+from src.attribution_analysis.input_compression import InputCompressor
+from src.attribution_analysis.relevance_triage import RelevanceTriage
+from src.attribution_analysis.local_scorer import LocalScorer
+from src.attribution_analysis.model_router import CONFIDENCE_PROMPT, ModelRouter
+from src.attribution_analysis.llm_cache import LLMResultCache
+from src.attribution_analysis.checkpoint import AnalysisCheckpoint, article_id
+from src.attribution_analysis.llm_batching import (
+    estimate_tokens, format_batch, group_by_token_budget, parse_batch_response
+)
 
 # Cargar variables de entorno
 load_dotenv()
 
 # --- CONFIGURACIÓN ---
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+# Backend (Groq / OpenAI-compatible / mock) y modelo: config.LLM_BACKEND / config.LLM_MODEL_ID.
+# El cliente se crea en el primer uso (llm_backends.get_backend), no al importar.
+MODEL_ID = config.LLM_MODEL_ID
 
-# Configuración del Modelo
-MODEL_ID = "llama-3.3-70b-versatile" 
+# Campos que produce el análisis (se replican a los near-duplicates del representante)
+ANALYSIS_FIELDS = [
+    'sentimiento', 'subjetividad', 'fase_hype', 'categoria_theme', 'categoria_cyber',
+    'entidades', 'razonamiento', 'relevancia', 'is_analyzed', 'analysis_date', 'analysis_source'
+]
+# Campos guardados por cluster (checkpoint) y copiados a cada artículo en la salida
+RESULT_FIELDS = ANALYSIS_FIELDS + ['confianza_local', 'relevancia_embedding']
 
-# Inicializar Cliente
-client = Groq(api_key=GROQ_API_KEY)
+# Uso de tokens acumulado en el proceso (todas las peticiones a Groq)
+USO_TOKENS = {"peticiones": 0, "prompt_tokens": 0, "completion_tokens": 0}
+_uso_lock = threading.Lock()
 
 
-def analizar_noticia_reflexividad(texto, context_prompt, categories):
-    """
-    Envía el texto a Llama 3 para análisis bajo la Teoría de la Reflexividad,
-    adaptado al contexto del tema.
-    """
+def _registrar_uso(response):
+    with _uso_lock:
+        USO_TOKENS["peticiones"] += 1
+        USO_TOKENS["prompt_tokens"] += response.prompt_tokens
+        USO_TOKENS["completion_tokens"] += response.completion_tokens
+
+
+def construir_system_prompt(context_prompt, categories):
+    """System prompt de reflexividad adaptado al contexto y categorías del tema."""
     categories_str = "\n".join([f"       - \"{c}\"" for c in categories])
     
     system_prompt = f"""
@@ -73,26 +98,199 @@ def analizar_noticia_reflexividad(texto, context_prompt, categories):
 
     IMPORTANTE: Responde SOLO con el JSON, sin texto adicional.
     """
+    return system_prompt
+
+
+def construir_system_prompt_lote(context_prompt, categories):
+    """System prompt para varias noticias por petición (respuesta indexada)."""
+    return construir_system_prompt(context_prompt, categories) + """
+    MODO LOTE: Recibirás varias noticias marcadas como "### NOTICIA [i]".
+    Analiza cada una por separado con los campos anteriores y responde con un único JSON:
+    {"resultados": [{"indice": 0, "sentimiento": ..., ...}, {"indice": 1, ...}]}
+    Incluye exactamente un objeto por noticia, con su mismo índice.
+    """
+
+
+def analizar_noticia_reflexividad(texto, context_prompt, categories, limiter=None, cache=None, router=None):
+    """
+    Envía el texto a Llama 3 para análisis bajo la Teoría de la Reflexividad,
+    adaptado al contexto del tema.
 
+    limiter (AdaptiveLimiter, opcional) recibe las cabeceras de rate limit y los 429.
+    cache (LLMResultCache, opcional) evita la llamada si el mismo texto ya se analizó.
+    router (ModelRouter, opcional) prueba primero el modelo pequeño y escala al grande si hace falta.
+    """
+    system_prompt = construir_system_prompt(context_prompt, categories)
+    if router:
+        fetch = lambda: _analizar_con_router(system_prompt, texto, limiter, router)
+    else:
+        fetch = lambda: _llamar_llm(system_prompt, texto, limiter)
+    if cache:
+        return cache.get_or_fetch(system_prompt, texto, fetch)
+    return fetch()
+
+
+def _analizar_con_router(system_prompt, texto, limiter, router):
+    analisis = _llamar_llm(system_prompt + CONFIDENCE_PROMPT, texto, limiter, router, "small")
+    motivo = router.escalation_reason(analisis)
+    if motivo is None:
+        return analisis
+    router.record_escalation(motivo)
+    return _llamar_llm(system_prompt, texto, limiter, router, "large")
+
+
+def _completar(system_prompt, user_prompt, limiter=None, router=None, route=None, articulos=1):
+    """Llamada al backend LLM; devuelve el contenido (JSON en texto) de la respuesta."""
+    backend = get_backend()
+    model_id = router.models[route] if router else None
+    inicio = time.time()
+    # Rate limit + backoff en 429/5xx via el scheduler compartido
+    response = get_scheduler().call(
+        backend.rate_source,
+        lambda: backend.complete(system_prompt, user_prompt, temperature=0.1, model_id=model_id),
+        on_retry=limiter.on_throttle if limiter else None
+    )
+    if limiter:
+        limiter.on_success(response.headers)
+    _registrar_uso(response)
+    if router:
+        router.record(route, time.time() - inicio, response.prompt_tokens, response.completion_tokens, articulos)
+    return response.content
+
+
+def _llamar_llm(system_prompt, texto, limiter=None, router=None, route=None):
+    """Análisis de una noticia; devuelve el JSON parseado o None si falla."""
     user_prompt = f"Analiza el siguiente texto de noticia:\n\n{texto}"
 
     try:
-        completion = client.chat.completions.create(
-            model=MODEL_ID,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.1,
-            response_format={"type": "json_object"}
-        )
-        return json.loads(completion.choices[0].message.content)
+        return json.loads(_completar(system_prompt, user_prompt, limiter, router, route))
     except Exception as e:
         print(f"  Error en API/JSON: {e}")
         return None
 
 
-def main(theme_id, max_articles=None, sample_mode=False):
+def analizar_lote_reflexividad(textos, context_prompt, categories, limiter=None, cache=None, router=None):
+    """
+    Analiza varias noticias en una sola petición. Devuelve un análisis (o None)
+    por texto, en el mismo orden. Los aciertos de caché no se envían; si la
+    respuesta viene mal formada o incompleta, sólo los fallidos se reintentan
+    en mitades (hasta llegar a peticiones individuales).
+
+    Con router, el lote va entero al modelo pequeño (sin reintentos) y sólo los
+    resultados que necesitan escalada se repiten, en lote, con el grande.
+    """
+    # La clave de caché usa el prompt individual: los resultados se comparten entre modos
+    system_prompt = construir_system_prompt(context_prompt, categories)
+    resultados = [None] * len(textos)
+    pendientes = list(range(len(textos)))
+    if cache:
+        pendientes = []
+        for i, texto in enumerate(textos):
+            resultados[i] = cache.lookup(system_prompt, texto)
+            if resultados[i] is None:
+                pendientes.append(i)
+
+    if pendientes:
+        if router:
+            _analizar_pendientes(textos, pendientes, resultados, context_prompt, categories, limiter,
+                                 router, "small", dividir=False)
+            escalados = []
+            for i in pendientes:
+                motivo = router.escalation_reason(resultados[i])
+                if motivo:
+                    router.record_escalation(motivo)
+                    resultados[i] = None
+                    escalados.append(i)
+            if escalados:
+                _analizar_pendientes(textos, escalados, resultados, context_prompt, categories, limiter,
+                                     router, "large")
+        else:
+            _analizar_pendientes(textos, pendientes, resultados, context_prompt, categories, limiter)
+        if cache:
+            for i in pendientes:
+                if resultados[i] is not None:
+                    cache.store(system_prompt, textos[i], resultados[i])
+    return resultados
+
+
+def _analizar_pendientes(textos, indices, resultados, context_prompt, categories, limiter,
+                         router=None, route=None, dividir=True):
+    extra = CONFIDENCE_PROMPT if route == "small" else ""
+    if len(indices) == 1:
+        i = indices[0]
+        resultados[i] = _llamar_llm(construir_system_prompt(context_prompt, categories) + extra, textos[i],
+                                    limiter, router, route)
+        return
+
+    user_prompt = f"Analiza las siguientes {len(indices)} noticias:\n\n" + format_batch([textos[i] for i in indices])
+    try:
+        contenido = _completar(construir_system_prompt_lote(context_prompt, categories) + extra, user_prompt,
+                               limiter, router, route, articulos=len(indices))
+        parsed = parse_batch_response(contenido, len(indices))
+    except Exception as e:
+        print(f"  Error en lote de {len(indices)}: {e}")
+        parsed = [None] * len(indices)
+
+    fallidos = []
+    for i, analisis in zip(indices, parsed):
+        if analisis is None:
+            fallidos.append(i)
+        else:
+            resultados[i] = analisis
+    if fallidos and dividir:
+        print(f"  Lote de {len(indices)}: {len(fallidos)} sin resultado válido, reintentando por partes")
+        mitad = max(1, len(fallidos) // 2)
+        _analizar_pendientes(textos, fallidos[:mitad], resultados, context_prompt, categories, limiter,
+                             router, route)
+        if fallidos[mitad:]:
+            _analizar_pendientes(textos, fallidos[mitad:], resultados, context_prompt, categories, limiter,
+                                 router, route)
+
+
+def construir_item(item, analisis, source):
+    """
+    Copia del artículo con los campos del análisis. Si analisis es None: valores
+    de "descartado" para source="triage", de error en otro caso.
+    """
+    if analisis:
+        # Inject Analysis
+        item['sentimiento'] = analisis.get('sentimiento', 0)
+        item['subjetividad'] = analisis.get('subjetividad', 0)
+        item['fase_hype'] = analisis.get('fase_hype', 'Unknown')
+        # Fallback for category key name compatibility
+        item['categoria_theme'] = analisis.get('categoria_cyber', 'Other') 
+        # Mantener compatibilidad con dashboard antiguo que busca 'categoria_cyber'
+        item['categoria_cyber'] = item['categoria_theme']
+
+        item['entidades'] = analisis.get('entidades', [])
+        item['razonamiento'] = analisis.get('razonamiento', '')
+        item['relevancia'] = analisis.get('relevancia_tendencia', 0)
+        item['analysis_source'] = source
+        if source == "local":
+            item['confianza_local'] = analisis['confianza']
+    elif source == "triage":
+        # Fuera de tema según el triaje de relevancia: sin llamada al LLM
+        item['sentimiento'] = 0
+        item['subjetividad'] = 0
+        item['fase_hype'] = 'Descartado'
+        item['categoria_theme'] = 'Fuera de tema'
+        item['categoria_cyber'] = 'Fuera de tema'
+        item['analysis_source'] = source
+    else:
+        # Default values for failed analysis
+        item['sentimiento'] = 0
+        item['subjetividad'] = 0
+        item['fase_hype'] = 'Error'
+        item['categoria_theme'] = 'Error'
+        item['categoria_cyber'] = 'Error'
+
+    # Add metadata flag
+    item['is_analyzed'] = True
+    item['analysis_date'] = datetime.now().isoformat()
+    return item
+
+
+def main(theme_id, max_articles=None, sample_mode=False, clear_llm_cache=False, resume=False, backend=None):
     print("=" * 70)
     print(f"ANALISIS DE REFLEXIVIDAD: {theme_id}")
     print("=" * 70)
@@ -107,43 +305,103 @@ def main(theme_id, max_articles=None, sample_mode=False):
     data_dir = theme_dirs["DATA"]
     
     print(f"Directorio de datos: {data_dir}")
+    if backend:
+        set_backend(create_backend(backend))
+    print(f"Backend LLM: {get_backend().name} ({get_backend().model_id})")
     
-    # 2. Encontrar input file (JSON)
-    pattern = os.path.join(data_dir, "unified_data_*.json")
-    files = glob.glob(pattern)
-    
-    # Filtrar solo archivos RAW (evitar procesar archivos ya analizados si comparten patron, aunque estos se llamaran analyzed_)
-    # Mejor buscamos los que NO empiezan por analyzed_ (que ahora se guardaran aqui)
-    raw_files = [f for f in files if "analyzed_" not in os.path.basename(f)]
-    
-    if not raw_files:
-        print(f"ERROR: No hay archivos de datos raw en {data_dir}")
-        return
-        
-    input_file = max(raw_files, key=os.path.getmtime)
-    print(f"Cargando archivo más reciente: {input_file}")
+    # 2. Abrir input: último run del store 'unified' o snapshot unified_data_*.json más reciente.
+    # Se recorre en streaming en tres pasadas (planificación, análisis, salida): los cuerpos
+    # de los artículos nunca están todos en memoria.
+    abrir_input = latest_reader(data_dir, "unified", "unified_data_")
 
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            articles_data = json.load(f)
-        
-        # Convertir a DataFrame para facilitar manejo
-        df = pd.DataFrame(articles_data)
-        print(f"Artículos cargados: {len(df)}")
-    except Exception as e:
-        print(f"Error leyendo JSON: {e}")
-        return
-
-    # 3. Filtrar / Muestrear
+    # 3. Filtrar / Muestrear (antes de cargar, para no leer de más)
+    limite = None
     if sample_mode:
-        df = df.head(5)
+        limite = 5
         print("MODO SAMPLE: Procesando solo 5 artículos")
     elif max_articles:
-        df = df.head(max_articles)
+        limite = max_articles
         print(f"Limitado a {max_articles} artículos")
 
-    # 4. Procesar
-    resultados_lista = []
+    def leer_articulos():
+        return islice(abrir_input(), limite)
+
+    # Planificación sobre una proyección compacta (url, título, abstract) de cada artículo
+    try:
+        resumenes = [article_summary(a) for a in leer_articulos()]
+        print(f"Artículos leídos: {len(resumenes)}")
+    except Exception as e:
+        print(f"Error leyendo datos: {e}")
+        return
+
+    if not resumenes:
+        print(f"ERROR: No hay datos raw en {data_dir}")
+        return
+
+    # 3b. Agrupar near-duplicates: sólo se analiza un representante por cluster
+    clusters = [[i] for i in range(len(resumenes))]
+    if config.ANALYSIS_DEDUP_ENABLED and len(resumenes) > 1:
+        clusters = cluster_near_duplicates(
+            resumenes,
+            threshold=config.ANALYSIS_DEDUP_THRESHOLD,
+            num_perm=config.ANALYSIS_DEDUP_NUM_PERM,
+            bands=config.ANALYSIS_DEDUP_BANDS
+        )
+        print(f"Near-duplicates: {len(resumenes)} artículos -> {len(clusters)} clusters "
+              f"({len(resumenes) - len(clusters)} llamadas LLM ahorradas)")
+
+    # 3c. Triaje por embeddings: los clusters fuera de tema no llegan al LLM, pero sí a la
+    # salida (análisis "descartado" + su relevancia_embedding)
+    relevancias = None
+    descartados = set()
+    if config.ANALYSIS_TRIAGE_ENABLED:
+        triage = RelevanceTriage(theme_config, batch_size=config.ANALYSIS_TRIAGE_BATCH_SIZE)
+        keep, scores = triage.select([resumenes[cluster[0]] for cluster in clusters],
+                                     threshold=config.ANALYSIS_TRIAGE_THRESHOLD,
+                                     top_k=config.ANALYSIS_TRIAGE_TOP_K)
+        relevancias = [round(float(score), 4) for score in scores]
+        descartados = set(range(len(clusters))) - set(keep)
+        print(f"Triaje de relevancia: {len(keep)}/{len(clusters)} clusters pasan al LLM "
+              f"({len(descartados)} llamadas LLM ahorradas)")
+
+    ids_cluster = cluster_ids(resumenes, clusters)
+    ids_representante = [article_id(resumenes[cluster[0]]) for cluster in clusters]
+
+    # 3d. Checkpoint write-ahead: con --resume se saltan los representantes ya analizados
+    checkpoint = AnalysisCheckpoint(data_dir, resume=resume)
+    completados = {k for k, entry_id in enumerate(ids_representante) if entry_id in checkpoint.done}
+    if resume:
+        print(f"Reanudando: {len(completados)}/{len(clusters)} artículos ya analizados en {checkpoint.path}")
+    # Descartados por el triaje: ni scorer local ni LLM
+    completados |= descartados
+
+    # 3e. Primera pasada con el scorer local: sólo los de baja confianza se escalan al LLM
+    scorer = LocalScorer.load(data_dir) if config.LOCAL_SCORER_ENABLED else None
+    if scorer:
+        pendientes = [k for k in range(len(clusters)) if k not in completados]
+        inicio_local = time.time()
+        predicciones = scorer.predict([resumenes[clusters[k][0]] for k in pendientes])
+        locales = 0
+        for k, prediccion in zip(pendientes, predicciones):
+            if prediccion['confianza'] >= config.LOCAL_SCORER_MIN_CONFIDENCE:
+                checkpoint.append(resumenes[clusters[k][0]], construir_item({}, prediccion, "local"))
+                completados.add(k)
+                locales += 1
+        duracion = max(time.time() - inicio_local, 1e-9)
+        print(f"Scorer local: {locales}/{len(pendientes)} resueltos en local, "
+              f"{len(pendientes) - locales} escalados al LLM ({len(pendientes) / duracion:.0f} artículos/s)")
+
+    # Posición en el input de cada representante pendiente -> su cluster
+    representantes = {cluster[0]: k for k, cluster in enumerate(clusters) if k not in completados}
+    del resumenes
+
+    # 4. Procesar (representantes pendientes leídos en streaming; prompts construidos bajo demanda)
+    def filas_pendientes():
+        for i, article in enumerate(leer_articulos()):
+            if i in representantes:
+                yield i, article
+
+    fallidos = {}
     
     context_prompt = theme_config.get("system_prompt_context", "Eres un analista financiero experto.")
     categories = theme_config.get("categories", ["General", "Other"])
@@ -155,66 +413,146 @@ def main(theme_id, max_articles=None, sample_mode=False):
     start_time = time.time()
     errores = 0
 
-    for index, row in df.iterrows():
-        # Construir texto
-        titular = row.get('title', '')
-        contenido = row.get('full_text') or row.get('abstract') or row.get('snippet') or ""
-        
-        texto_completo = f"TITULO: {titular}\n\nCONTENIDO: {contenido}"[:3000]
-
-        # LLM Call
-        analisis = analizar_noticia_reflexividad(texto_completo, context_prompt, categories)
-
-        item = row.to_dict() # Copiar datos originales
-
-        if analisis:
-            # Inject Analysis
-            item['sentimiento'] = analisis.get('sentimiento', 0)
-            item['subjetividad'] = analisis.get('subjetividad', 0)
-            item['fase_hype'] = analisis.get('fase_hype', 'Unknown')
-            # Fallback for category key name compatibility
-            item['categoria_theme'] = analisis.get('categoria_cyber', 'Other') 
-            # Mantener compatibilidad con dashboard antiguo que busca 'categoria_cyber'
-            item['categoria_cyber'] = item['categoria_theme']
-            
-            item['entidades'] = analisis.get('entidades', [])
-            item['razonamiento'] = analisis.get('razonamiento', '')
-            item['relevancia'] = analisis.get('relevancia_tendencia', 0)
-            
-            # Print status
-            print(f"{index+1:<5} | {item['sentimiento']:>5.2f} | {item['subjetividad']:>5.2f} | {item['categoria_theme'][:25]:<25} | {titular[:40]}...")
-            
-        else:
-            print(f"{index+1:<5} | ERROR  |       |                           | {titular[:40]}...")
-            errores += 1
-            # Default values for failed analysis
-            item['sentimiento'] = 0
-            item['subjetividad'] = 0
-            item['fase_hype'] = 'Error'
-            item['categoria_theme'] = 'Error'
-            item['categoria_cyber'] = 'Error'
-        
-        # Add metadata flag
-        item['is_analyzed'] = True
-        item['analysis_date'] = datetime.now().isoformat()
-        
-        resultados_lista.append(item)
-        
-        # Rate limit
-        time.sleep(0.5)
-
-    # 5. Guardar Resultados Enriquecidos
+    # Entrada por artículo ajustada a un presupuesto de tokens (sin titular repetido, frases clave)
+    compresor = InputCompressor(config.ANALYSIS_INPUT_TOKEN_BUDGET)
+    textos_construidos = {}
+
+    def construir_texto(index, row):
+        if index not in textos_construidos:
+            titular = row.get('title', '')
+            contenido = row.get('full_text') or row.get('abstract') or row.get('snippet') or ""
+            textos_construidos[index] = compresor.build(titular, contenido)
+        return textos_construidos[index]
+
+    def analizar_grupo(filas, limiter):
+        textos = [construir_texto(index, row) for index, row in filas]
+        # LLM Call (una noticia o un lote)
+        if len(filas) == 1:
+            return filas, [analizar_noticia_reflexividad(textos[0], context_prompt, categories,
+                                                         limiter=limiter, cache=llm_cache, router=router)]
+        return filas, analizar_lote_reflexividad(textos, context_prompt, categories,
+                                                 limiter=limiter, cache=llm_cache, router=router)
+
+    # Resultados ya analizados con el mismo modelo / prompt / texto no vuelven a Groq
+    # Enrutado pequeño -> grande: sólo se escala lo dudoso (JSON inválido, frontera del dashboard, baja confianza)
+    # Sin modelo pequeño propio del backend (p. ej. Ollama sin LLM_OPENAI_SMALL_MODEL_ID) no se enruta
+    router = None
+    small_model = get_backend().small_model_id
+    if config.LLM_ROUTING_ENABLED and small_model in (None, get_backend().model_id):
+        print(f"Enrutado LLM desactivado: el backend '{get_backend().name}' no tiene modelo pequeño configurado")
+    elif config.LLM_ROUTING_ENABLED:
+        router = ModelRouter(
+            small_model=small_model,
+            large_model=get_backend().model_id,
+            margin=config.LLM_ROUTING_BOUNDARY_MARGIN,
+            min_confidence=config.LLM_ROUTING_MIN_CONFIDENCE,
+            prices=config.LLM_MODEL_PRICES
+        )
+    modelos = f"{router.models['small']}->{router.models['large']}" if router else get_backend().model_id
+
+    llm_cache = LLMResultCache(theme_id, theme_config, modelos) if config.LLM_CACHE_ENABLED else None
+    if llm_cache and clear_llm_cache:
+        print(f"Caché LLM: {llm_cache.invalidate_theme()} resultados borrados para {theme_id}")
+
+    # Lotes dimensionados por presupuesto de tokens (el system prompt se paga una vez por lote)
+    if config.ANALYSIS_BATCH_ENABLED:
+        grupos = group_by_token_budget(
+            filas_pendientes(),
+            text_fn=lambda fila: construir_texto(*fila),
+            token_budget=config.ANALYSIS_BATCH_TOKEN_BUDGET,
+            max_items=config.ANALYSIS_BATCH_MAX_ARTICLES,
+            overhead_tokens=estimate_tokens(construir_system_prompt_lote(context_prompt, categories)),
+            output_tokens_per_item=config.ANALYSIS_BATCH_OUTPUT_TOKENS
+        )
+    else:
+        grupos = ([fila] for fila in filas_pendientes())
+
+    # Peticiones concurrentes (AIMD); los resultados llegan en el orden de entrada
+    engine = AnalysisEngine(
+        initial=config.ANALYSIS_INITIAL_IN_FLIGHT,
+        minimum=config.ANALYSIS_MIN_IN_FLIGHT,
+        maximum=config.ANALYSIS_MAX_IN_FLIGHT
+    )
+
+    try:
+        for filas, analisis_grupo in engine.imap(analizar_grupo, grupos, weight=lambda r: len(r[0])):
+            for (index, row), analisis in zip(filas, analisis_grupo):
+                textos_construidos.pop(index, None)
+                titular = row.get('title', '')
+                campos = construir_item({}, analisis, "llm")
+
+                if analisis:
+                    # Print status
+                    print(f"{index+1:<5} | {campos['sentimiento']:>5.2f} | {campos['subjetividad']:>5.2f} | {campos['categoria_theme'][:25]:<25} | {titular[:40]}...")
+                    # Sólo los campos del análisis: el artículo se vuelve a leer de disco al escribir la salida
+                    checkpoint.append(row, campos)
+                else:
+                    print(f"{index+1:<5} | ERROR  |       |                           | {titular[:40]}...")
+                    errores += 1
+                    # Los fallos no se registran: --resume los reintenta
+                    fallidos[representantes[index]] = campos
+    finally:
+        # Lo ya escrito queda en disco aunque haya error o Ctrl-C
+        checkpoint.close()
+
+    # Resultado de cada cluster: checkpoint (anteriores + nuevos) o valores de error
+    resultados = []
+    for k, entry_id in enumerate(ids_representante):
+        resultado = checkpoint.done.get(entry_id) or fallidos.get(k)
+        if not resultado:
+            resultado = construir_item({}, None, "triage" if k in descartados else "llm")
+        resultado = dict(resultado)
+        if relevancias:
+            resultado['relevancia_embedding'] = relevancias[k]
+        resultados.append(resultado)
+
+    # 5. Guardar Resultados Enriquecidos (streaming: input de disco + resultado de su cluster)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_filename = f"analyzed_reflexivity_{timestamp}.json"
     output_path = os.path.join(data_dir, output_filename)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(resultados_lista, f, indent=2, ensure_ascii=False)
-        
     print("\n" + "=" * 70)
     print(f"PROCESO COMPLETADO")
-    print(f"Archivo guardado: {output_path}")
-    print(f"Total procesados: {len(resultados_lista)}")
+    print(f"Throughput LLM: {engine.report()}")
+    if llm_cache:
+        print(f"Caché LLM: {llm_cache.stats()}")
+    if router:
+        print(f"Rutas LLM:\n{router.report()}")
+    print(f"Entrada LLM: {compresor.report()}")
+    if USO_TOKENS["peticiones"]:
+        analizados = max(1, engine.completed)
+        print(f"Tokens: {USO_TOKENS['prompt_tokens']} prompt + {USO_TOKENS['completion_tokens']} salida en "
+              f"{USO_TOKENS['peticiones']} peticiones "
+              f"({(USO_TOKENS['prompt_tokens'] + USO_TOKENS['completion_tokens']) / analizados:.0f} tokens/artículo)")
+
+    # Replicar el análisis de cada representante a sus duplicados (orden original)
+    salida = fan_out(leer_articulos(), clusters, resultados, RESULT_FIELDS, ids_cluster)
+    writer = ArticleStore(data_dir, "analyzed").writer() if config.ARTICLE_STORE_ENABLED else None
+
+    def escribir_store(items):
+        for item in items:
+            writer.write(item)
+            yield item
+
+    if writer:
+        salida = escribir_store(salida)
+    try:
+        if config.LEGACY_JSON_SNAPSHOTS or not writer:
+            total = write_json_array(output_path, salida)
+            print(f"Archivo guardado: {output_path}")
+        else:
+            total = sum(1 for _ in salida)
+    except BaseException:
+        # Un run a medias no se confirma: los lectores lo ignoran
+        if writer:
+            writer.abort()
+        raise
+    if writer:
+        run = writer.close()
+        print(f"Store 'analyzed': run {run['run_id']} en particion {run['partition']}")
+    # Compactación terminada: el checkpoint ya no hace falta
+    checkpoint.discard()
+    print(f"Total procesados: {total}")
     print("=" * 70)
 
 
@@ -224,7 +562,12 @@ if __name__ == "__main__":
     parser.add_argument("--theme", type=str, required=True, help="Theme ID from config.py")
     parser.add_argument("--sample", action="store_true", help="Run only on a few articles for testing")
     parser.add_argument("--max", type=int, default=None, help="Max articles to process")
+    parser.add_argument("--clear-llm-cache", action="store_true", help="Drop cached LLM results of this theme first")
+    parser.add_argument("--resume", action="store_true", help="Skip articles already in the analysis checkpoint")
+    parser.add_argument("--backend", choices=["groq", "openai", "mock"], default=None,
+                        help="LLM backend (default: config.LLM_BACKEND)")
     
     args = parser.parse_args()
     
-    main(theme_id=args.theme, sample_mode=args.sample, max_articles=args.max)
+    main(theme_id=args.theme, sample_mode=args.sample, max_articles=args.max,
+         clear_llm_cache=args.clear_llm_cache, resume=args.resume, backend=args.backend)
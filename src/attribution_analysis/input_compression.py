@@ -0,0 +1,142 @@
+"""
+Compresión de la Entrada del LLM
+Construye "TITULO: ...\\n\\nCONTENIDO: ..." ajustado a un presupuesto de tokens
+por artículo, en lugar de cortar a ciegas a 3000 caracteres:
+
+1. Se quita del contenido el titular repetido (los abstracts de GNews suelen
+   empezar por el título) y las frases casi idénticas a él.
+2. Si el contenido no cabe, selección extractiva: cada frase se puntúa por
+   centralidad TF-IDF (coseno con el centroide del documento), con un pequeño
+   extra por compartir términos con el titular y por ir al principio. Se eligen
+   las mejores hasta llenar el presupuesto y se devuelven en su orden original.
+
+Los tokens se estiman offline con llm_batching.estimate_tokens (~4 caracteres
+por token), sin tokenizer externo. InputCompressor acumula tokens originales /
+enviados para informar del ahorro al final de la ejecución; el "original" es la
+entrada que se enviaba antes (el texto cortado a LEGACY_INPUT_CHARS caracteres).
+"""
+
+import re
+import math
+import threading
+from collections import Counter
+from typing import Dict, List
+
+from src.attribution_analysis.llm_batching import CHARS_PER_TOKEN, estimate_tokens
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+(?=[\"'«“¿¡(\[]?[A-ZÁÉÍÓÚÑ0-9])|\n{2,}")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_TITLE_SUFFIX_RE = re.compile(r"\s+[-–|]\s+[^-–|]{1,60}$")
+
+LEGACY_INPUT_CHARS = 3000  # corte ciego anterior, referencia del ahorro
+TITLE_SIMILARITY = 0.8   # Jaccard de términos a partir del cual una frase "es" el titular
+TITLE_BONUS = 0.15
+LEAD_BONUS = 0.1
+
+
+def split_sentences(text: str) -> List[str]:
+    """Frases del texto (heurística por puntuación / párrafos)."""
+    return [s.strip() for s in _SENTENCE_RE.split(text or "") if s and s.strip()]
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if len(w) > 2]
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def strip_title(title: str, content: str) -> str:
+    """Quita el titular (con o sin " - Medio") del principio del contenido y las frases que lo repiten."""
+    content = (content or "").strip()
+    if not title or not content:
+        return content
+    for variant in (title.strip(), _TITLE_SUFFIX_RE.sub("", title.strip())):
+        if variant and content.lower().startswith(variant.lower()):
+            content = content[len(variant):].lstrip(" .:-–|\n")
+            break
+    title_terms = set(_terms(_TITLE_SUFFIX_RE.sub("", title)))
+    kept = [s for s in split_sentences(content) if _jaccard(set(_terms(s)), title_terms) < TITLE_SIMILARITY]
+    return " ".join(kept)
+
+
+def select_sentences(sentences: List[str], token_budget: int, title: str = "") -> List[str]:
+    """Subconjunto de frases (en orden original) que cabe en token_budget, por centralidad TF-IDF."""
+    if not sentences or token_budget <= 0:
+        return []
+    docs = [Counter(_terms(s)) for s in sentences]
+    df = Counter(term for doc in docs for term in doc)
+    n = len(docs)
+    idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+
+    vectors = []
+    for doc in docs:
+        vec = {term: tf * idf[term] for term, tf in doc.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        vectors.append({term: v / norm for term, v in vec.items()})
+    centroid = Counter()
+    for vec in vectors:
+        centroid.update(vec)
+    centroid_norm = math.sqrt(sum(v * v for v in centroid.values())) or 1.0
+
+    title_terms = set(_terms(title))
+    scores = []
+    for i, vec in enumerate(vectors):
+        score = sum(v * centroid[term] for term, v in vec.items()) / centroid_norm
+        score += TITLE_BONUS * _jaccard(set(vec), title_terms) + LEAD_BONUS * (1 - i / n)
+        scores.append(score)
+
+    chosen, used = [], 0
+    for i in sorted(range(n), key=lambda k: scores[k], reverse=True):
+        cost = estimate_tokens(sentences[i]) + 1
+        if used + cost <= token_budget:
+            chosen.append(i)
+            used += cost
+    if not chosen:
+        # Ni la mejor frase cabe: se recorta ésta
+        best = max(range(n), key=lambda k: scores[k])
+        return [sentences[best][: token_budget * CHARS_PER_TOKEN]]
+    return [sentences[i] for i in sorted(chosen)]
+
+
+def build_input(title: str, content: str, token_budget: int) -> str:
+    """Texto de entrada del LLM para un artículo, dentro de token_budget tokens (estimados)."""
+    title = (title or "").strip()
+    header = f"TITULO: {title}\n\nCONTENIDO: "
+    body = strip_title(title, content)
+    remaining = token_budget - estimate_tokens(header)
+    if estimate_tokens(body) > remaining:
+        body = " ".join(select_sentences(split_sentences(body), remaining, title))
+    return header + body
+
+
+class InputCompressor:
+    """build_input con contadores de tokens (thread-safe) para el informe de ahorro."""
+
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+        self.articles = 0
+        self.original_tokens = 0
+        self.sent_tokens = 0
+        self._lock = threading.Lock()
+
+    def build(self, title: str, content: str) -> str:
+        text = build_input(title, content, self.token_budget)
+        original = estimate_tokens(f"TITULO: {title or ''}\n\nCONTENIDO: {content or ''}"[:LEGACY_INPUT_CHARS])
+        with self._lock:
+            self.articles += 1
+            self.original_tokens += original
+            self.sent_tokens += estimate_tokens(text)
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"articles": self.articles, "original_tokens": self.original_tokens,
+                    "sent_tokens": self.sent_tokens, "saved_tokens": self.original_tokens - self.sent_tokens}
+
+    def report(self) -> str:
+        s = self.stats()
+        pct = 100 * s["saved_tokens"] / s["original_tokens"] if s["original_tokens"] else 0.0
+        return (f"{s['original_tokens']} -> {s['sent_tokens']} tokens de entrada en {s['articles']} artículos "
+                f"({s['saved_tokens']} ahorrados, {pct:.0f}%)")
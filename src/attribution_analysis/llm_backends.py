@@ -0,0 +1,175 @@
+"""
+Backends LLM
+Interfaz común para el proveedor del análisis, elegido en config.LLM_BACKEND:
+
+- "groq":   SDK oficial de Groq (por defecto).
+- "openai": cualquier endpoint HTTP compatible con /chat/completions de OpenAI
+            (vLLM, Ollama, LM Studio, OpenRouter...).
+- "mock":   servidor local (mock_llm_server.py) que simula latencia, 429 y
+            JSON mal formado; se arranca automáticamente en un hilo para
+            medir concurrencia / reintentos / throughput sin conexión.
+
+Cada backend declara `rate_source`, la clave de config.SOURCE_RATE_LIMITS
+con la que el RateScheduler lo limita, y `small_model_id`, el modelo barato
+para el enrutado (config.LLM_SMALL_MODEL_IDS; None si el backend no tiene).
+"""
+
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Mapping, Optional
+
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import config
+
+
+@dataclass
+class LLMResponse:
+    """Respuesta normalizada de cualquier backend."""
+    content: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class LLMBackend(ABC):
+    """Contrato de un proveedor de chat completions en modo JSON."""
+
+    name = "base"
+    rate_source = "default"
+
+    def __init__(self, model_id: str):
+        self.model_id = model_id
+        self.small_model_id: Optional[str] = None
+
+    @abstractmethod
+    def complete(self, system_prompt: str, user_prompt: str, temperature: float = 0.1,
+                 model_id: Optional[str] = None) -> LLMResponse:
+        """Una petición (sin reintentos: los hace el RateScheduler). Lanza en errores HTTP."""
+
+
+class GroqBackend(LLMBackend):
+    name = "groq"
+    rate_source = "groq"
+
+    def __init__(self, model_id: str, api_key: Optional[str] = None):
+        super().__init__(model_id)
+        from groq import Groq
+        self.client = Groq(api_key=api_key or os.getenv("GROQ_API_KEY"))
+
+    def complete(self, system_prompt, user_prompt, temperature=0.1, model_id=None):
+        raw = self.client.chat.completions.with_raw_response.create(
+            model=model_id or self.model_id,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            response_format={"type": "json_object"}
+        )
+        completion = raw.parse()
+        usage = getattr(completion, "usage", None)
+        return LLMResponse(
+            content=completion.choices[0].message.content,
+            headers=raw.headers,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+        )
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """POST {base_url}/chat/completions con una sesión HTTP reutilizada (pool de conexiones)."""
+
+    name = "openai"
+    rate_source = "openai_compatible"
+
+    def __init__(self, model_id: str, base_url: str, api_key: Optional[str] = None, timeout: float = 60):
+        super().__init__(model_id)
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=config.ANALYSIS_MAX_IN_FLIGHT)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def complete(self, system_prompt, user_prompt, temperature=0.1, model_id=None):
+        resp = self.session.post(self.url, timeout=self.timeout, json={
+            "model": model_id or self.model_id,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": temperature,
+            "response_format": {"type": "json_object"},
+        })
+        # HTTPError lleva response.status_code: el RateScheduler reintenta 429 / 5xx
+        resp.raise_for_status()
+        data = resp.json()
+        usage = data.get("usage") or {}
+        return LLMResponse(
+            content=data["choices"][0]["message"]["content"],
+            headers=resp.headers,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+        )
+
+
+class MockBackend(OpenAICompatibleBackend):
+    """Backend OpenAI-compatible contra el servidor mock local (arrancado bajo demanda)."""
+
+    name = "mock"
+    rate_source = "mock_llm"
+
+    def __init__(self, model_id: str):
+        from src.attribution_analysis.mock_llm_server import start_mock_server
+        self.server = start_mock_server(
+            port=config.LLM_MOCK_PORT,
+            latency=config.LLM_MOCK_LATENCY,
+            jitter=config.LLM_MOCK_JITTER,
+            rate_429=config.LLM_MOCK_RATE_429,
+            rate_malformed=config.LLM_MOCK_RATE_MALFORMED,
+            max_concurrent=config.LLM_MOCK_MAX_CONCURRENT,
+        )
+        super().__init__(model_id, base_url=f"http://127.0.0.1:{self.server.server_port}/v1")
+
+
+def create_backend(name: Optional[str] = None, model_id: Optional[str] = None) -> LLMBackend:
+    """Backend según config (o los argumentos)."""
+    name = name or config.LLM_BACKEND
+    model_id = model_id or config.LLM_MODEL_ID
+    if name == "groq":
+        backend = GroqBackend(model_id)
+    elif name == "openai":
+        backend = OpenAICompatibleBackend(model_id, config.LLM_OPENAI_BASE_URL, os.getenv("LLM_OPENAI_API_KEY"))
+    elif name == "mock":
+        backend = MockBackend(model_id)
+    else:
+        raise ValueError(f"LLM backend desconocido: {name}")
+    backend.small_model_id = config.LLM_SMALL_MODEL_IDS.get(name) or None
+    return backend
+
+
+_backend: Optional[LLMBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> LLMBackend:
+    """Backend del proceso (creado en el primer uso, no al importar)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend()
+        return _backend
+
+
+def set_backend(backend: LLMBackend):
+    """Sustituye el backend del proceso (CLI --backend, benchmarks)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
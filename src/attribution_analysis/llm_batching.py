@@ -0,0 +1,85 @@
+"""
+Lotes de Artículos para el LLM
+Empaqueta varias noticias en una sola petición, de forma que el system prompt
+(instrucciones de reflexividad + categorías) se paga una vez por lote y no
+una vez por artículo.
+
+- group_by_token_budget: agrupa en streaming respetando un presupuesto de tokens
+  (prompt + reserva de salida por artículo) y un máximo de artículos.
+- parse_batch_response: extrae los resultados por índice; los que faltan o
+  vienen mal formados se devuelven como None para reintentarlos aparte.
+"""
+
+import json
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+# Aproximación conservadora para texto mixto inglés/español
+CHARS_PER_TOKEN = 4
+
+REQUIRED_FIELDS = ("sentimiento", "subjetividad")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+
+def group_by_token_budget(items: Iterable[Any], text_fn: Callable[[Any], str], token_budget: int,
+                          max_items: int, overhead_tokens: int = 0,
+                          output_tokens_per_item: int = 0) -> Iterator[List[Any]]:
+    """
+    Agrupa items consecutivos en lotes cuyo coste estimado
+    (overhead + sum(texto + salida)) no supera token_budget. Un item que no
+    cabe solo forma su propio lote.
+    """
+    batch: List[Any] = []
+    used = overhead_tokens
+    for item in items:
+        cost = estimate_tokens(text_fn(item)) + output_tokens_per_item
+        if batch and (used + cost > token_budget or len(batch) >= max_items):
+            yield batch
+            batch, used = [], overhead_tokens
+        batch.append(item)
+        used += cost
+    if batch:
+        yield batch
+
+
+def format_batch(texts: List[str]) -> str:
+    """Texto del usuario con las noticias numeradas por índice."""
+    return "\n\n".join(f"### NOTICIA [{i}]\n{text}" for i, text in enumerate(texts))
+
+
+def _is_valid(result: Any) -> bool:
+    if not isinstance(result, dict):
+        return False
+    for field in REQUIRED_FIELDS:
+        try:
+            float(result.get(field))
+        except (TypeError, ValueError):
+            return False
+    return True
+
+
+def parse_batch_response(content: str, size: int) -> List[Optional[dict]]:
+    """
+    Resultados por índice (0..size-1) de una respuesta
+    {"resultados": [{"indice": i, ...}, ...]} (también acepta una lista suelta).
+    """
+    results: List[Optional[dict]] = [None] * size
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return results
+    items = data.get("resultados") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return results
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("indice"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < size and results[index] is None and _is_valid(item):
+            results[index] = {k: v for k, v in item.items() if k != "indice"}
+    return results
@@ -0,0 +1,75 @@
+"""
+Caché de Resultados LLM
+Guarda el JSON ya parseado del análisis de reflexividad, con clave
+hash(modelo, system prompt, texto truncado). Un acierto evita la llamada a Groq.
+
+Usa el ResponseCache de adquisición (SQLite, expiración por edad + LRU por
+tamaño, contadores hits/misses). Cada tema escribe bajo su propio namespace
+"llm:<theme_id>:<huella>", donde la huella resume system_prompt_context y
+categories: si cambian en config.INVESTING_THEMES, las entradas antiguas del
+tema se invalidan al arrancar. El modelo va en la clave de cada entrada, así
+que resultados de modelos distintos (backend, enrutado) conviven sin borrarse.
+"""
+
+import os
+import sys
+import json
+import hashlib
+from typing import Any, Callable, Dict, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import config
+from src.acquisition_data_manager.response_cache import ResponseCache
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def theme_fingerprint(theme_config: Dict[str, Any]) -> str:
+    """Huella de la parte de la configuración del tema que cambia el prompt."""
+    raw = json.dumps({
+        "context": theme_config.get("system_prompt_context"),
+        "categories": theme_config.get("categories"),
+    }, sort_keys=True, ensure_ascii=False)
+    return _sha256(raw)[:16]
+
+
+class LLMResultCache:
+    """Caché de análisis por tema sobre un ResponseCache compartido."""
+
+    def __init__(self, theme_id: str, theme_config: Dict[str, Any], model_id: str,
+                 cache: Optional[ResponseCache] = None):
+        self.model_id = model_id
+        self.cache = cache or ResponseCache(
+            config.LLM_CACHE_PATH,
+            ttl_seconds=config.LLM_CACHE_MAX_AGE_DAYS * 86400,
+            max_bytes=config.LLM_CACHE_MAX_MB * 1024 * 1024
+        )
+        self.prefix = f"llm:{theme_id}:"
+        self.namespace = self.prefix + theme_fingerprint(theme_config)
+        invalidated = self.cache.invalidate(self.prefix, keep=self.namespace)
+        if invalidated:
+            print(f"Caché LLM: {invalidated} resultados invalidados (cambió la configuración del tema)")
+
+    def _params(self, system_prompt: str, text: str) -> Dict[str, str]:
+        return {"model": self.model_id, "system_prompt": _sha256(system_prompt), "text": _sha256(text)}
+
+    def get_or_fetch(self, system_prompt: str, text: str, fetch_fn: Callable[[], Any]) -> Any:
+        """Resultado cacheado o fetch_fn(); los fallos (None) no se guardan."""
+        return self.cache.get_or_fetch(self.namespace, self._params(system_prompt, text), fetch_fn,
+                                       cacheable=lambda r: r is not None)
+
+    def lookup(self, system_prompt: str, text: str) -> Optional[Any]:
+        """Resultado cacheado o None (cuenta como hit / miss)."""
+        return self.get_or_fetch(system_prompt, text, lambda: None)
+
+    def store(self, system_prompt: str, text: str, result: Any):
+        self.cache.put(self.namespace, self._params(system_prompt, text), result)
+
+    def invalidate_theme(self) -> int:
+        """Borra todos los resultados de este tema."""
+        return self.cache.invalidate(self.prefix)
+
+    def stats(self) -> Dict[str, int]:
+        return self.cache.stats()
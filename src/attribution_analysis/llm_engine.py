@@ -0,0 +1,127 @@
+"""
+Motor de Análisis Concurrente (LLM)
+Ejecuta las llamadas al LLM en un pool de hilos con un número de peticiones
+en vuelo que se adapta al servicio (AIMD, como el control de congestión TCP):
+
+- Additive increase: +1 petición en vuelo por cada "ventana" de respuestas
+  correctas, mientras las cabeceras x-ratelimit-remaining-* tengan margen.
+- Multiplicative decrease: la concurrencia se divide a la mitad ante un 429
+  (o 5xx); el reintento con backoff lo hace el RateScheduler compartido.
+
+Los resultados se devuelven en el mismo orden que la entrada.
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        value = headers.get(name)
+        return int(float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimiter:
+    """Semáforo cuyo límite se ajusta en caliente (AIMD)."""
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.in_flight = 0
+        self.peak = self.limit
+        self.throttled = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, headers: Optional[Mapping[str, str]] = None):
+        """Additive increase, salvo que las cabeceras indiquen que queda poco margen."""
+        with self._cond:
+            if headers is not None:
+                remaining = _header_int(headers, "x-ratelimit-remaining-requests")
+                if remaining is not None and remaining <= self.limit:
+                    return
+                remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+                if remaining_tokens is not None and remaining_tokens <= 0:
+                    return
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self.peak = max(self.peak, self.limit)
+                self._successes = 0
+                self._cond.notify_all()
+
+    def on_throttle(self, exc: Optional[Exception] = None):
+        """Multiplicative decrease ante 429 / 5xx."""
+        with self._cond:
+            self.throttled += 1
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
+
+
+class AnalysisEngine:
+    """
+    Pool de hilos acotado por un AdaptiveLimiter.
+
+    Args:
+        initial / minimum / maximum: peticiones en vuelo (inicial y límites del AIMD).
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16):
+        self.limiter = AdaptiveLimiter(initial, minimum, maximum)
+        self.completed = 0
+        self.elapsed = 0.0
+
+    def _run_one(self, fn: Callable[[Any, AdaptiveLimiter], Any], item: Any) -> Any:
+        self.limiter.acquire()
+        try:
+            return fn(item, self.limiter)
+        finally:
+            self.limiter.release()
+
+    def imap(self, fn: Callable[[Any, AdaptiveLimiter], Any], items: Iterable[Any],
+             weight: Optional[Callable[[Any], int]] = None) -> Iterator[Any]:
+        """
+        Aplica fn(item, limiter) a cada item y genera los resultados en orden de
+        entrada. fn debe informar al limiter (on_success / on_throttle).
+        Sólo se adelantan 2 x maximum items, así la entrada puede ser un iterador.
+        weight(resultado) indica cuántos artículos cuenta cada item (lotes).
+        """
+        start = time.time()
+        window = 2 * self.limiter.maximum
+        pending = deque()
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=self.limiter.maximum) as pool:
+            for item in items:
+                pending.append(pool.submit(self._run_one, fn, item))
+                if len(pending) >= window:
+                    result = pending.popleft().result()
+                    self.completed += weight(result) if weight else 1
+                    yield result
+            while pending:
+                result = pending.popleft().result()
+                self.completed += weight(result) if weight else 1
+                yield result
+        self.elapsed = time.time() - start
+
+    def report(self) -> str:
+        rate = self.completed / self.elapsed if self.elapsed > 0 else 0.0
+        return (f"{self.completed} artículos en {self.elapsed:.1f}s ({rate:.2f} artículos/s) | "
+                f"concurrencia final {self.limiter.limit}, pico {self.limiter.peak}, "
+                f"throttles {self.limiter.throttled}")
@@ -0,0 +1,351 @@
+"""
+Scorer Local de Reflexividad (destilado del LLM)
+Modelo pequeño en CPU entrenado con las etiquetas que Llama 3.3 70B ya ha
+producido (store 'analyzed' + analyzed_reflexivity_*.json del tema):
+
+- Entrada: embedding all-MiniLM-L6-v2 de título + abstract (normalizado).
+- Cabezas (config.LOCAL_SCORER_HEADS / --heads):
+    "linear": ridge (sentimiento, subjetividad, relevancia) + softmax multinomial
+              (fase_hype, categoria_theme), en numpy.
+    "gbm":    HistGradientBoosting de scikit-learn (ya instalado con
+              sentence-transformers) para las mismas salidas.
+- Las clasificaciones se calibran con temperature scaling sobre un split de calibración.
+- Confianza = mínimo de las probabilidades calibradas de las dos clases.
+
+En el análisis, los artículos con confianza >= LOCAL_SCORER_MIN_CONFIDENCE se
+resuelven en local; el resto se escalan al LLM.
+
+Uso:
+    python src/attribution_analysis/local_scorer.py --theme cybersecurity_ai
+
+Entrena con un split train / calibración / test (60/20/20), imprime el informe
+de evaluación contra las etiquetas del LLM del test y guarda el modelo en
+data/<theme>/local_scorer.npz o local_scorer_gbm.joblib (+ local_scorer_report.json).
+El throughput (artículos/s) se mide con el encoder sin caché de embeddings.
+"""
+
+import os
+import sys
+import json
+import time
+from glob import glob
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import config
+from src.article_store import ArticleStore, iter_json_array
+from src.attribution_analysis.checkpoint import article_id
+from src.attribution_analysis.near_duplicates import article_text
+from src.attribution_analysis.relevance_triage import EMBEDDING_MODEL
+from src.vector_database.embedding_cache import CachedEncoder, cached_model
+
+MODEL_FILENAME = "local_scorer.npz"
+GBM_MODEL_FILENAME = "local_scorer_gbm.joblib"
+REPORT_FILENAME = "local_scorer_report.json"
+REGRESSION_TARGETS = ["sentimiento", "subjetividad", "relevancia"]
+CLASS_TARGETS = ["fase_hype", "categoria_theme"]
+
+
+def load_labels(data_dir: str) -> List[Dict[str, Any]]:
+    """Artículos etiquetados por el LLM (uno por id, el más reciente gana; sin errores, locales ni descartados)."""
+    labeled: Dict[str, Dict[str, Any]] = {}
+    sources = [iter_json_array(path) for path in
+               sorted(glob(os.path.join(data_dir, "analyzed_reflexivity_*.json")), key=os.path.getmtime)]
+    sources.append(ArticleStore(data_dir, "analyzed").iter_articles())
+    for source in sources:
+        for item in source:
+            if item.get("fase_hype") in (None, "Error") or item.get("analysis_source") in ("local", "triage"):
+                continue
+            if item.get("duplicate_of"):
+                continue
+            labeled[article_id(item)] = item
+    return list(labeled.values())
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Etiqueta numérica del LLM como float (ausente = 0); None si no es numérica ("alta", "N/A"...)."""
+    if value is None or value == "":
+        return 0.0
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if np.isfinite(number) else None
+
+
+def _bias(x: np.ndarray) -> np.ndarray:
+    return np.hstack([x, np.ones((len(x), 1), dtype=x.dtype)])
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    z = logits - logits.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def _fit_ridge(x: np.ndarray, y: np.ndarray, l2: float) -> np.ndarray:
+    xb = _bias(x)
+    reg = l2 * np.eye(xb.shape[1])
+    reg[-1, -1] = 0.0
+    return np.linalg.solve(xb.T @ xb + reg, xb.T @ y)
+
+
+def _fit_softmax(x: np.ndarray, y: np.ndarray, n_classes: int, l2: float,
+                 epochs: int = 300, lr: float = 0.5) -> np.ndarray:
+    """Regresión logística multinomial por descenso de gradiente (batch completo)."""
+    xb = _bias(x)
+    w = np.zeros((xb.shape[1], n_classes))
+    onehot = np.eye(n_classes)[y]
+    for _ in range(epochs):
+        grad = xb.T @ (_softmax(xb @ w) - onehot) / len(xb)
+        grad[:-1] += l2 * w[:-1]
+        w -= lr * grad
+    return w
+
+
+def _fit_gbm_regression(x: np.ndarray, y: np.ndarray, seed: int) -> list:
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    return [HistGradientBoostingRegressor(max_iter=200, random_state=seed).fit(x, y[:, j])
+            for j in range(y.shape[1])]
+
+
+def _fit_gbm_classifier(x: np.ndarray, y: np.ndarray, n_classes: int, l2: float, seed: int):
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    if len(np.unique(y)) < 2:
+        # Una sola clase en train: no hay nada que aprender, la cabeza lineal la predice constante
+        return _fit_softmax(x, y, n_classes, l2)
+    return HistGradientBoostingClassifier(max_iter=200, random_state=seed).fit(x, y)
+
+
+def _logits(x: np.ndarray, w, n_classes: int) -> np.ndarray:
+    """Logits de una cabeza: lineal (matriz de pesos) o GBM (log-probabilidades)."""
+    if isinstance(w, np.ndarray):
+        return _bias(x) @ w
+    # Clases ausentes del split de entrenamiento: probabilidad ~0
+    logits = np.full((len(x), n_classes), np.log(1e-12))
+    logits[:, w.classes_] = np.log(np.clip(w.predict_proba(x), 1e-12, None))
+    return logits
+
+
+def _fit_temperature(logits: np.ndarray, y: np.ndarray) -> float:
+    """Temperatura que minimiza la NLL del split de calibración."""
+    best_t, best_nll = 1.0, np.inf
+    for t in np.exp(np.linspace(np.log(0.05), np.log(5.0), 60)):
+        probs = _softmax(logits / t)
+        nll = -np.log(probs[np.arange(len(y)), y] + 1e-12).mean()
+        if nll < best_nll:
+            best_t, best_nll = float(t), nll
+    return best_t
+
+
+def expected_calibration_error(confidence: np.ndarray, correct: np.ndarray, bins: int = 10) -> float:
+    edges = np.linspace(0, 1, bins + 1)
+    ece = 0.0
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        mask = (confidence > lo) & (confidence <= hi)
+        if mask.any():
+            ece += mask.mean() * abs(confidence[mask].mean() - correct[mask].mean())
+    return float(ece)
+
+
+class LocalScorer:
+    """
+    Cabezas sobre embeddings; predict() devuelve el mismo formato que el LLM.
+    regression: matriz ridge (lineal) o lista de regresores GBM, una por objetivo.
+    heads: {nombre: (pesos softmax o clasificador GBM, clases, temperatura)}.
+    """
+
+    def __init__(self, regression, heads: Dict[str, Tuple[Any, List[str], float]], encoder=None):
+        self.regression = regression
+        self.heads = heads
+        self._encoder = encoder
+
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+            self._encoder = cached_model(SentenceTransformer(EMBEDDING_MODEL), EMBEDDING_MODEL)
+        return self._encoder
+
+    def embed(self, articles: Sequence[dict], batch_size: int = 64) -> np.ndarray:
+        return np.asarray(self.encoder.encode([article_text(a) for a in articles], batch_size=batch_size,
+                                              normalize_embeddings=True, show_progress_bar=False),
+                          dtype=np.float32)
+
+    def predict_embeddings(self, x: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Valores de regresión y probabilidades calibradas por cabeza."""
+        probs = {name: _softmax(_logits(x, w, len(classes)) / temperature)
+                 for name, (w, classes, temperature) in self.heads.items()}
+        if isinstance(self.regression, np.ndarray):
+            values = _bias(x) @ self.regression
+        else:
+            values = np.column_stack([model.predict(x) for model in self.regression])
+        return values, probs
+
+    @property
+    def kind(self) -> str:
+        return "linear" if isinstance(self.regression, np.ndarray) else "gbm"
+
+    def predict(self, articles: Sequence[dict]) -> List[Dict[str, Any]]:
+        """Análisis por artículo con las claves del JSON del LLM + 'confianza'."""
+        if not len(articles):
+            return []
+        values, probs = self.predict_embeddings(self.embed(articles))
+        confidence = np.min([p.max(axis=1) for p in probs.values()], axis=0)
+        fase = self.heads["fase_hype"][1]
+        categoria = self.heads["categoria_theme"][1]
+        return [{
+            "sentimiento": round(float(np.clip(values[i, 0], -1, 1)), 2),
+            "subjetividad": round(float(np.clip(values[i, 1], 0, 1)), 2),
+            "relevancia_tendencia": round(float(np.clip(values[i, 2], 0, 1)), 2),
+            "fase_hype": fase[int(probs["fase_hype"][i].argmax())],
+            "categoria_cyber": categoria[int(probs["categoria_theme"][i].argmax())],
+            "entidades": [],
+            "razonamiento": f"Scorer local (confianza {confidence[i]:.2f})",
+            "confianza": round(float(confidence[i]), 4),
+        } for i in range(len(articles))]
+
+    def save(self, data_dir: str) -> str:
+        """Guarda el modelo (npz si es lineal, joblib si es GBM) y borra el del otro tipo."""
+        if self.kind == "gbm":
+            import joblib
+            path = os.path.join(data_dir, GBM_MODEL_FILENAME)
+            joblib.dump({"regression": self.regression, "heads": self.heads}, path)
+            other = os.path.join(data_dir, MODEL_FILENAME)
+        else:
+            path = os.path.join(data_dir, MODEL_FILENAME)
+            arrays = {"regression": self.regression}
+            for name, (w, classes, temperature) in self.heads.items():
+                arrays[f"{name}_w"] = w
+                arrays[f"{name}_classes"] = np.array(classes)
+                arrays[f"{name}_temperature"] = np.array(temperature)
+            np.savez(path, **arrays)
+            other = os.path.join(data_dir, GBM_MODEL_FILENAME)
+        if os.path.exists(other):
+            os.remove(other)
+        return path
+
+    @classmethod
+    def load(cls, data_dir: str, encoder=None) -> Optional["LocalScorer"]:
+        """Modelo entrenado del tema o None si no existe."""
+        path = os.path.join(data_dir, MODEL_FILENAME)
+        gbm_path = os.path.join(data_dir, GBM_MODEL_FILENAME)
+        if os.path.exists(gbm_path):
+            import joblib
+            model = joblib.load(gbm_path)
+            return cls(model["regression"], model["heads"], encoder=encoder)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            heads = {name: (data[f"{name}_w"], [str(c) for c in data[f"{name}_classes"]],
+                            float(data[f"{name}_temperature"])) for name in CLASS_TARGETS}
+            return cls(data["regression"], heads, encoder=encoder)
+
+
+def train(articles: Sequence[dict], encoder=None, l2: float = 1e-3, min_confidence: float = 0.8,
+          seed: int = 0, heads: str = "linear") -> Tuple[LocalScorer, Dict[str, Any]]:
+    """
+    Entrena sobre train, calibra sobre calibración y evalúa contra las etiquetas LLM del test.
+    heads: "linear" (ridge + softmax, numpy) o "gbm" (HistGradientBoosting, scikit-learn).
+    """
+    if heads not in ("linear", "gbm"):
+        raise ValueError(f"Cabezas desconocidas '{heads}' (linear, gbm)")
+    # Etiquetas no numéricas (el LLM a veces devuelve texto): el artículo no se usa
+    targets = [[_as_float(a.get(t)) for t in REGRESSION_TARGETS] for a in articles]
+    valid = [i for i, row in enumerate(targets) if None not in row]
+    skipped = len(articles) - len(valid)
+    articles = [articles[i] for i in valid]
+    y_reg = np.array([targets[i] for i in valid], dtype=np.float64).reshape(-1, len(REGRESSION_TARGETS))
+
+    scorer = LocalScorer(np.zeros(0), {}, encoder=encoder)
+    x = scorer.embed(articles)
+    order = np.random.default_rng(seed).permutation(len(articles))
+    n_train, n_cal = int(0.6 * len(order)), int(0.2 * len(order))
+    tr, cal, te = order[:n_train], order[n_train:n_train + n_cal], order[n_train + n_cal:]
+
+    if heads == "gbm":
+        scorer.regression = _fit_gbm_regression(x[tr], y_reg[tr], seed)
+    else:
+        scorer.regression = _fit_ridge(x[tr], y_reg[tr], l2)
+    labels = {}
+    for name in CLASS_TARGETS:
+        classes = sorted({str(a.get(name)) for a in articles})
+        index = {c: i for i, c in enumerate(classes)}
+        y = np.array([index[str(a.get(name))] for a in articles])
+        if heads == "gbm":
+            w = _fit_gbm_classifier(x[tr], y[tr], len(classes), l2, seed)
+        else:
+            w = _fit_softmax(x[tr], y[tr], len(classes), l2)
+        temperature = _fit_temperature(_logits(x[cal], w, len(classes)), y[cal])
+        scorer.heads[name] = (w, classes, temperature)
+        labels[name] = y
+
+    # Evaluación (test, etiquetas del LLM)
+    values, probs = scorer.predict_embeddings(x[te])
+    report: Dict[str, Any] = {"heads": heads, "labels": len(articles), "skipped_non_numeric": skipped,
+                              "train": len(tr), "calibration": len(cal), "test": len(te)}
+    for j, target in enumerate(REGRESSION_TARGETS):
+        report[f"{target}_mae"] = float(np.abs(values[:, j] - y_reg[te, j]).mean())
+    correct_all = np.ones(len(te), dtype=bool)
+    for name in CLASS_TARGETS:
+        w, classes, temperature = scorer.heads[name]
+        correct = probs[name].argmax(axis=1) == labels[name][te]
+        correct_all &= correct
+        raw_conf = _softmax(_logits(x[te], w, len(classes))).max(axis=1)
+        report[f"{name}_accuracy"] = float(correct.mean())
+        report[f"{name}_ece_raw"] = expected_calibration_error(raw_conf, correct)
+        report[f"{name}_ece_calibrated"] = expected_calibration_error(probs[name].max(axis=1), correct)
+        report[f"{name}_temperature"] = temperature
+    confidence = np.min([p.max(axis=1) for p in probs.values()], axis=0)
+    local = confidence >= min_confidence
+    report["min_confidence"] = min_confidence
+    report["local_coverage"] = float(local.mean())
+    report["escalated_to_llm"] = float(1 - local.mean())
+    report["local_accuracy_both_classes"] = float(correct_all[local].mean()) if local.any() else None
+
+    # Throughput de inferencia (embedding + cabezas) con el encoder sin caché: los
+    # embeddings del entrenamiento ya están en la caché y sólo se mediría la búsqueda
+    encoder = scorer.encoder
+    uncached = LocalScorer(scorer.regression, scorer.heads,
+                           encoder=encoder.model if isinstance(encoder, CachedEncoder) else encoder)
+    sample = [articles[i] for i in te[:256]]
+    start = time.time()
+    uncached.predict(sample)
+    elapsed = time.time() - start
+    report["articles_per_sec"] = len(sample) / elapsed if elapsed > 0 else None
+    return scorer, report
+
+
+def main(theme_id: str, heads: Optional[str] = None):
+    theme_dirs = config.get_theme_dirs(theme_id)
+    data_dir = theme_dirs["DATA"]
+    articles = load_labels(data_dir)
+    print(f"Etiquetas LLM disponibles para {theme_id}: {len(articles)}")
+    if len(articles) < config.LOCAL_SCORER_MIN_LABELS:
+        print(f"Se necesitan al menos {config.LOCAL_SCORER_MIN_LABELS} (config.LOCAL_SCORER_MIN_LABELS)")
+        return
+
+    scorer, report = train(articles, min_confidence=config.LOCAL_SCORER_MIN_CONFIDENCE,
+                           heads=heads or config.LOCAL_SCORER_HEADS)
+    print("\n" + "=" * 70)
+    print("EVALUACIÓN (test vs etiquetas del LLM)")
+    print("=" * 70)
+    for key, value in report.items():
+        print(f"  {key:<32} {value:.4f}" if isinstance(value, float) else f"  {key:<32} {value}")
+    print(f"\nModelo guardado: {scorer.save(data_dir)}")
+    with open(os.path.join(data_dir, REPORT_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Train the local reflexivity scorer from LLM labels")
+    parser.add_argument("--theme", type=str, required=True, help="Theme ID from config.py")
+    parser.add_argument("--heads", choices=["linear", "gbm"], default=None,
+                        help="Model heads (default: config.LOCAL_SCORER_HEADS)")
+    args = parser.parse_args()
+    main(args.theme, heads=args.heads)
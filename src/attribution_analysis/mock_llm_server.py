@@ -0,0 +1,159 @@
+"""
+Servidor LLM Mock (OpenAI-compatible)
+Servidor HTTP local para probar el análisis sin conexión. Responde a
+POST /v1/chat/completions con análisis de reflexividad sintéticos y simula:
+
+- Latencia: latency ± jitter segundos por petición.
+- 429: con probabilidad rate_429, o si hay más de max_concurrent peticiones
+  en curso (con cabecera Retry-After).
+- JSON mal formado: con probabilidad rate_malformed.
+- Cabeceras x-ratelimit-remaining-requests / -tokens y "usage" de tokens.
+
+Entiende los prompts por lotes ("### NOTICIA [i]") y devuelve {"resultados": [...]}.
+
+Uso:
+    python src/attribution_analysis/mock_llm_server.py --port 8099 --latency 0.4 --rate-429 0.05
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_FASES = ["Lanzamiento", "Expectativas Infladas", "Abismo de Desilusión", "Consolidación", "Madurez"]
+
+
+def _fake_analysis(text: str) -> dict:
+    """Análisis determinista a partir del hash del texto."""
+    digest = hashlib.sha1(text.encode("utf-8")).digest()
+    return {
+        "sentimiento": round(digest[0] / 127.5 - 1, 2),
+        "subjetividad": round(digest[1] / 255, 2),
+        "fase_hype": _FASES[digest[2] % len(_FASES)],
+        "categoria_cyber": "Otro",
+        "entidades": [],
+        "razonamiento": "Respuesta simulada por el servidor mock.",
+        "relevancia_tendencia": round(digest[3] / 255, 2),
+    }
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    server: "MockLLMServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str, headers: dict = None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, json.dumps({"error": {"message": "not found"}}))
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        srv = self.server
+
+        with srv.lock:
+            srv.requests += 1
+            srv.in_flight += 1
+            overloaded = srv.in_flight > srv.max_concurrent
+        try:
+            time.sleep(max(0.0, srv.latency + random.uniform(-srv.jitter, srv.jitter)))
+            if overloaded or random.random() < srv.rate_429:
+                with srv.lock:
+                    srv.throttled += 1
+                self._send(429, json.dumps({"error": {"message": "Rate limit reached (mock)"}}),
+                           {"Retry-After": "1", "x-ratelimit-remaining-requests": "0"})
+                return
+
+            user = next((m["content"] for m in request.get("messages", []) if m.get("role") == "user"), "")
+            parts = re.split(r"### NOTICIA \[(\d+)\]\n", user)
+            if len(parts) > 1:
+                items = [{"indice": int(parts[i]), **_fake_analysis(parts[i + 1])} for i in range(1, len(parts) - 1, 2)]
+                content = json.dumps({"resultados": items}, ensure_ascii=False)
+            else:
+                content = json.dumps(_fake_analysis(user), ensure_ascii=False)
+            if random.random() < srv.rate_malformed:
+                with srv.lock:
+                    srv.malformed += 1
+                content = content[: len(content) // 2]
+
+            prompt_tokens = sum(len(m.get("content", "")) for m in request.get("messages", [])) // 4
+            completion_tokens = len(content) // 4
+            body = json.dumps({
+                "id": f"mock-{srv.requests}",
+                "object": "chat.completion",
+                "model": request.get("model", "mock"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            }, ensure_ascii=False)
+            with srv.lock:
+                remaining = max(0, srv.max_concurrent - srv.in_flight)
+            self._send(200, body, {"x-ratelimit-remaining-requests": remaining * 10,
+                                   "x-ratelimit-remaining-tokens": 100000})
+        finally:
+            with srv.lock:
+                srv.in_flight -= 1
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer con los parámetros de simulación y contadores."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.3, jitter: float = 0.1, rate_429: float = 0.0,
+                 rate_malformed: float = 0.0, max_concurrent: int = 32):
+        super().__init__(("127.0.0.1", port), _MockHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_malformed = rate_malformed
+        self.max_concurrent = max_concurrent
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.throttled = 0
+        self.malformed = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"requests": self.requests, "throttled": self.throttled, "malformed": self.malformed}
+
+
+def start_mock_server(port: int = 0, **kwargs) -> MockLLMServer:
+    """Arranca el servidor en un hilo daemon (port=0: puerto libre) y lo devuelve."""
+    server = MockLLMServer(port=port, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Mock LLM escuchando en http://127.0.0.1:{server.server_port}/v1 "
+          f"(latencia {server.latency}s, 429 {server.rate_429:.0%}, JSON roto {server.rate_malformed:.0%})")
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock LLM server")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.3, help="Mean latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Latency jitter in seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probability of a 429 response")
+    parser.add_argument("--rate-malformed", type=float, default=0.0, help="Probability of truncated JSON")
+    parser.add_argument("--max-concurrent", type=int, default=32, help="Requests above this get 429")
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.port, args.latency, args.jitter, args.rate_429, args.rate_malformed, args.max_concurrent)
+    print(f"Mock LLM escuchando en http://127.0.0.1:{server.server_port}/v1 (Ctrl-C para parar)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nEstadísticas: {server.stats()}")
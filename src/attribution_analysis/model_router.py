@@ -0,0 +1,128 @@
+"""
+Enrutado de Modelos (pequeño -> grande)
+Cada artículo va primero a un modelo barato y rápido (config.LLM_SMALL_MODEL_IDS[backend])
+y sólo se escala al grande (config.LLM_MODEL_ID) si el resultado barato:
+
+- "json":      no es un JSON válido o le faltan campos / valores fuera de rango.
+- "frontera":  cae cerca de las fronteras burbuja / oportunidad del dashboard
+               (subjetividad 0.6 / sentimiento 0.5 y subjetividad 0.4 / sentimiento 0.3),
+               donde un error cambia el color y los rankings.
+- "confianza": el propio modelo declara una confianza baja (campo "confianza").
+
+Por ruta se acumulan peticiones, artículos, latencia y tokens, y se estima el
+coste con config.LLM_MODEL_PRICES para ajustar el equilibrio throughput / calidad.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional
+
+# Fronteras del dashboard (src/visualization/dashboard_generator.py)
+BUBBLE_SUBJ, BUBBLE_SENT = 0.6, 0.5
+OPPORTUNITY_SUBJ, OPPORTUNITY_SENT = 0.4, 0.3
+
+FASES_HYPE = {"Lanzamiento", "Expectativas Infladas", "Abismo de Desilusión", "Consolidación", "Madurez"}
+
+CONFIDENCE_PROMPT = """
+    8. "confianza": Float entre 0.0 y 1.0. Tu confianza en este análisis (baja si el texto es ambiguo o escaso).
+    """
+
+
+def _number(analisis: Dict[str, Any], key: str, low: float, high: float) -> Optional[float]:
+    value = analisis.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not low <= value <= high:
+        return None
+    return float(value)
+
+
+def is_valid(analisis: Any) -> bool:
+    """El análisis tiene los campos que usa el pipeline con tipos y rangos correctos."""
+    if not isinstance(analisis, dict):
+        return False
+    return (_number(analisis, "sentimiento", -1, 1) is not None
+            and _number(analisis, "subjetividad", 0, 1) is not None
+            and analisis.get("fase_hype") in FASES_HYPE
+            and isinstance(analisis.get("categoria_cyber"), str))
+
+
+def near_boundary(sentimiento: float, subjetividad: float, margin: float) -> bool:
+    """True si un error de +-margin puede mover el punto dentro / fuera de burbuja u oportunidad."""
+    bubble = ((abs(subjetividad - BUBBLE_SUBJ) < margin and sentimiento > BUBBLE_SENT - margin)
+              or (abs(sentimiento - BUBBLE_SENT) < margin and subjetividad > BUBBLE_SUBJ - margin))
+    opportunity = ((abs(subjetividad - OPPORTUNITY_SUBJ) < margin and sentimiento > OPPORTUNITY_SENT - margin)
+                   or (abs(sentimiento - OPPORTUNITY_SENT) < margin and subjetividad < OPPORTUNITY_SUBJ + margin))
+    return bubble or opportunity
+
+
+class RouteStats:
+    def __init__(self, model_id: str):
+        self.model_id = model_id
+        self.requests = 0
+        self.articles = 0
+        self.latency = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+
+class ModelRouter:
+    """
+    Decide la escalada y lleva las estadísticas por ruta ("small" / "large").
+
+    Args:
+        small_model / large_model: ids de modelo de cada ruta.
+        margin: distancia a las fronteras del dashboard que fuerza la escalada.
+        min_confidence: confianza declarada por el modelo pequeño por debajo de la cual se escala.
+        prices: {model_id: (USD por 1M tokens de entrada, USD por 1M de salida)}.
+    """
+
+    def __init__(self, small_model: str, large_model: str, margin: float = 0.05,
+                 min_confidence: float = 0.6, prices: Optional[Dict[str, tuple]] = None):
+        self.models = {"small": small_model, "large": large_model}
+        self.margin = margin
+        self.min_confidence = min_confidence
+        self.prices = prices or {}
+        self.routes = {route: RouteStats(model) for route, model in self.models.items()}
+        self.escalations = Counter()
+        self._lock = threading.Lock()
+
+    def escalation_reason(self, analisis: Any) -> Optional[str]:
+        """Motivo para repetir con el modelo grande, o None si el resultado barato vale."""
+        if not is_valid(analisis):
+            return "json"
+        if near_boundary(analisis["sentimiento"], analisis["subjetividad"], self.margin):
+            return "frontera"
+        confianza = _number(analisis, "confianza", 0, 1)
+        if confianza is not None and confianza < self.min_confidence:
+            return "confianza"
+        return None
+
+    def record_escalation(self, reason: str):
+        with self._lock:
+            self.escalations[reason] += 1
+
+    def record(self, route: str, latency: float, prompt_tokens: int, completion_tokens: int, articles: int = 1):
+        with self._lock:
+            stats = self.routes[route]
+            stats.requests += 1
+            stats.articles += articles
+            stats.latency += latency
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+
+    def cost(self, route: str) -> float:
+        stats = self.routes[route]
+        price_in, price_out = self.prices.get(stats.model_id, (0.0, 0.0))
+        return (stats.prompt_tokens * price_in + stats.completion_tokens * price_out) / 1e6
+
+    def report(self) -> str:
+        lines = []
+        with self._lock:
+            for route, stats in self.routes.items():
+                avg = stats.latency / stats.requests if stats.requests else 0.0
+                lines.append(f"  {route:<5} {stats.model_id:<28} {stats.requests:>5} peticiones | "
+                             f"{stats.articles:>5} artículos | {avg:.2f}s/petición | "
+                             f"{stats.prompt_tokens}+{stats.completion_tokens} tokens | ${self.cost(route):.4f}")
+            escaladas = sum(self.escalations.values())
+            motivos = ", ".join(f"{reason} {count}" for reason, count in self.escalations.most_common()) or "-"
+            lines.append(f"  Escaladas al modelo grande: {escaladas} ({motivos})")
+        return "\n".join(lines)
@@ -0,0 +1,153 @@
+"""
+Detección de Near-Duplicates (MinHash + LSH)
+La misma noticia de agencia aparece con varios publishers y bajo varias
+keywords. Antes del análisis LLM se agrupan las copias casi idénticas
+(título + abstract) y sólo se analiza un representante por cluster; su
+resultado se replica después a todos los miembros.
+
+1. Shingles de palabras (n-gramas) sobre el texto normalizado.
+2. Firma MinHash de `num_perm` permutaciones (vectorizada con numpy).
+3. LSH por bandas: sólo los pares que comparten alguna banda son candidatos.
+4. Los candidatos con Jaccard estimado >= threshold se unen (union-find).
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _shingles(text: str, size: int) -> set:
+    words = re.findall(r"\w+", (text or "").lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def article_text(article: dict) -> str:
+    """Texto comparado: título + abstract (el full_text varía entre publishers)."""
+    # Google News añade " - Publisher" al título
+    title = re.sub(r"\s+[-|–]\s+[^-|–]+$", "", article.get("title") or "")
+    return f"{title} {article.get('abstract') or ''}"
+
+
+def article_summary(article: dict) -> dict:
+    """
+    Proyección compacta de un artículo (url, título, abstract, longitud del texto):
+    basta para clusterizar, triar e identificar sin mantener los full_text en memoria.
+    """
+    full_text = article.get("full_text") or ""
+    summary = {"url": article.get("url"), "title": article.get("title"),
+               "abstract": article.get("abstract"), "text_len": len(full_text)}
+    if not summary["title"] and not summary["abstract"]:
+        summary["full_text"] = full_text[:1000]
+    return summary
+
+
+def _text_length(article: dict) -> int:
+    return article["text_len"] if "text_len" in article else len(article.get("full_text") or "")
+
+
+class MinHasher:
+    """Firmas MinHash con permutaciones universales (a*x + b) mod p, deterministas por seed."""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.a = rng.randint(1, _MAX_HASH, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, _MAX_HASH, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = _shingles(text, self.shingle_size)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64)
+        # (num_perm x shingles); a, hashes < 2^32 so a*x + b fits in uint64 before the modulo
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % np.uint64(_MERSENNE_PRIME)
+        return (permuted & np.uint64(_MAX_HASH)).min(axis=1)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_near_duplicates(articles: Sequence[dict], threshold: float = 0.8, num_perm: int = 128,
+                            bands: int = 32, shingle_size: int = 3) -> List[List[int]]:
+    """
+    Agrupa artículos casi duplicados.
+
+    Returns:
+        Lista de clusters (índices en `articles`), en orden de primera aparición.
+        El primer índice de cada cluster es el representante (el de texto más largo).
+    """
+    n = len(articles)
+    if n == 0:
+        return []
+    rows = max(1, num_perm // bands)
+    hasher = MinHasher(num_perm=rows * bands, shingle_size=shingle_size)
+    signatures = np.vstack([hasher.signature(article_text(a)) for a in articles])
+
+    parent = list(range(n))
+    for band in range(bands):
+        buckets: Dict[bytes, int] = {}
+        band_slice = signatures[:, band * rows:(band + 1) * rows]
+        for i in range(n):
+            key = band_slice[i].tobytes()
+            j = buckets.setdefault(key, i)
+            if j == i:
+                continue
+            root_i, root_j = _find(parent, i), _find(parent, j)
+            if root_i == root_j:
+                continue
+            # Verificar candidatos con el Jaccard estimado de la firma completa
+            if np.mean(signatures[i] == signatures[j]) >= threshold:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(_find(parent, i), []).append(i)
+
+    clusters = []
+    for members in groups.values():
+        representative = max(members, key=lambda i: (_text_length(articles[i]),
+                                                     len(article_text(articles[i])), -i))
+        clusters.append([representative] + [i for i in members if i != representative])
+    clusters.sort(key=min)
+    return clusters
+
+
+def cluster_ids(articles: Sequence[dict], clusters: List[List[int]]) -> List[str]:
+    """Id de cada cluster: la URL de su representante (o cluster_<índice>)."""
+    return [articles[cluster[0]].get("url") or f"cluster_{cluster[0]}" for cluster in clusters]
+
+
+def fan_out(articles: Iterable[dict], clusters: List[List[int]], results: List[dict],
+            fields: Iterable[str], ids: List[str]) -> Iterator[dict]:
+    """
+    Genera, en el orden original de `articles` (puede ser un stream leído de
+    disco), cada artículo con los campos `fields` del resultado de su cluster
+    (results[k] para clusters[k]) y cluster_id / cluster_size / duplicate_of
+    (ids: cluster_ids()). Ningún artículo se pierde: los que no están en un
+    cluster con resultado salen con los campos del análisis vacíos (None).
+    """
+    fields = list(fields)
+    cluster_of = {i: k for k, cluster in enumerate(clusters) for i in cluster}
+    for i, article in enumerate(articles):
+        item = dict(article)
+        k = cluster_of.get(i)
+        result = results[k] if k is not None and k < len(results) and results[k] else {}
+        item.update({field: result.get(field) for field in fields})
+        if k is not None:
+            item["cluster_id"] = ids[k]
+            item["cluster_size"] = len(clusters[k])
+            if i != clusters[k][0]:
+                item["duplicate_of"] = ids[k]
+        yield item
@@ -0,0 +1,77 @@
+"""
+Triaje de Relevancia por Embeddings
+Las búsquedas de GNews ("Passkeys authentication", "Human Risk Management
+cybersecurity"...) devuelven muchos resultados que no tratan del tema, y cada
+uno cuesta una llamada al modelo de 70B. Antes del LLM se filtran en local:
+
+1. Prototipos del tema: la descripción y cada keyword de
+   config.INVESTING_THEMES[theme] (con la descripción como contexto).
+2. Los artículos (título + abstract/texto) se codifican por lotes con el mismo
+   modelo que atribution_mapping_neo4j (all-MiniLM-L6-v2, vectores normalizados).
+3. Puntuación = coseno máximo contra los prototipos.
+4. Pasan al LLM los que superan el umbral y/o los top-K mejor puntuados.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.attribution_analysis.near_duplicates import article_text
+from src.vector_database.embedding_cache import cached_model
+
+# Mismo modelo que el grafo vectorial (src/vector_database)
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+
+def theme_prototypes(theme_config: Dict[str, Any]) -> List[str]:
+    """Textos prototipo del tema: la descripción y cada keyword con ella como contexto."""
+    name = theme_config.get("name", "")
+    description = theme_config.get("description", "")
+    prototypes = [f"{name}. {description}".strip(". ")]
+    prototypes += [f"{keyword}. {description}".strip(". ") for keyword in theme_config.get("keywords", [])]
+    return [p for p in prototypes if p]
+
+
+class RelevanceTriage:
+    """
+    Puntúa artículos contra los prototipos de un tema.
+
+    Args:
+        theme_config: entrada de config.INVESTING_THEMES.
+        model: SentenceTransformer ya cargado (si no, se carga EMBEDDING_MODEL).
+        batch_size: artículos por llamada a encode.
+    """
+
+    def __init__(self, theme_config: Dict[str, Any], model=None, batch_size: int = 64):
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = cached_model(SentenceTransformer(EMBEDDING_MODEL), EMBEDDING_MODEL)
+        self.model = model
+        self.batch_size = batch_size
+        self.prototypes = self._encode(theme_prototypes(theme_config))
+
+    def _encode(self, texts: Sequence[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(list(texts), batch_size=self.batch_size,
+                                            normalize_embeddings=True, show_progress_bar=False),
+                          dtype=np.float32)
+
+    def score(self, articles: Sequence[dict]) -> np.ndarray:
+        """Coseno máximo de cada artículo contra los prototipos (1 = idéntico)."""
+        if not len(articles):
+            return np.zeros(0, dtype=np.float32)
+        vectors = self._encode([article_text(a).strip() or (a.get("full_text") or "")[:1000] for a in articles])
+        return (vectors @ self.prototypes.T).max(axis=1)
+
+    def select(self, articles: Sequence[dict], threshold: Optional[float] = None,
+               top_k: Optional[int] = None) -> Tuple[List[int], np.ndarray]:
+        """
+        Índices (en orden original) de los artículos que pasan el triaje y las
+        puntuaciones de todos. Con threshold y top_k a la vez se aplican ambos.
+        """
+        scores = self.score(articles)
+        keep = np.arange(len(scores))
+        if threshold is not None:
+            keep = keep[scores[keep] >= threshold]
+        if top_k is not None and len(keep) > top_k:
+            keep = np.sort(keep[np.argsort(-scores[keep], kind="stable")[:top_k]])
+        return keep.tolist(), scores
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
 class ArticleModel(BaseModel):
@@ -20,3 +20,90 @@ class ArticleModel(BaseModel):
     
     class Config:
         arbitrary_types_allowed = True
+
+
+# --- Batch validation (high-throughput path) ---
+
+_REQUIRED_STR_FIELDS = ("source_id", "source_name", "title", "url", "published_date", "abstract")
+
+
+def _article_error(article: Any) -> Optional[str]:
+    if not isinstance(article, dict):
+        return "not a dict"
+    for field in _REQUIRED_STR_FIELDS:
+        if not isinstance(article.get(field), str):
+            return f"'{field}' must be a string"
+    if not article["title"]:
+        return "'title' must not be empty"
+    if not article["url"]:
+        return "'url' must be a non-empty string"
+    full_text = article.get("full_text")
+    if full_text is not None and not isinstance(full_text, str):
+        return "'full_text' must be a string or None"
+    metadata = article.get("metadata")
+    if metadata is not None and not isinstance(metadata, dict):
+        return "'metadata' must be a dict"
+    return None
+
+
+def validate_articles(articles: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+    """
+    Validates a whole result list in one pass, applying ArticleModel's rules.
+    Valid dicts are returned as-is (defaults filled in place, no copies);
+    invalid ones are reported as (index, reason).
+    """
+    valid: List[Dict[str, Any]] = []
+    errors: List[Tuple[int, str]] = []
+    for i, article in enumerate(articles):
+        error = _article_error(article)
+        if error:
+            errors.append((i, error))
+            continue
+        if article.get("metadata") is None:
+            article["metadata"] = {}
+        article.setdefault("full_text", None)
+        valid.append(article)
+    return valid, errors
+
+
+def _benchmark(n: int = 20000):
+    """
+    Micro-benchmark: per-article time and allocated bytes of the old
+    dict -> ArticleModel -> model_dump() path vs validate_articles.
+    Run: python src/models.py
+    """
+    import time
+    import tracemalloc
+
+    def make_items():
+        return [{
+            "source_id": "gnews", "source_name": "Publisher", "title": f"Title {i}",
+            "url": f"https://news.example.com/{i}", "published_date": "Mon, 18 Aug 2025 07:00:00 GMT",
+            "abstract": "Abstract text " * 5, "full_text": None,
+            "metadata": {"original_publisher": {"href": "https://example.com", "title": "Publisher"}},
+        } for i in range(n)]
+
+    def pydantic_path(items):
+        return [ArticleModel(**item).model_dump() for item in items]
+
+    def batch_path(items):
+        return validate_articles(items)[0]
+
+    print(f"{'path':<22} | {'us/article':>10} | {'bytes/article':>13}")
+    for name, fn in [("pydantic round trip", pydantic_path), ("validate_articles", batch_path)]:
+        items = make_items()
+        start = time.perf_counter()
+        fn(items)
+        elapsed = time.perf_counter() - start
+
+        items = make_items()
+        tracemalloc.start()
+        result = fn(items)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        print(f"{name:<22} | {elapsed / n * 1e6:>10.2f} | {peak / n:>13.0f}")
+
+
+if __name__ == "__main__":
+    _benchmark()
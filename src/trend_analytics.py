@@ -0,0 +1,120 @@
+"""
+Trend Analytics
+Vectorized statistics over the theme's Google Trends store (trend_store.py).
+Every metric is computed for all keywords at once on the timestamp x keyword
+matrix, so the dashboard and the SerpApi abstract get them in milliseconds.
+
+Per keyword (windows in data points, from config.TRENDS_*):
+    last        latest value
+    recent_avg  mean of the recent window
+    momentum    recent_avg / baseline mean - 1
+    slope       least-squares slope over the recent window (points per step)
+    zscore      (last - baseline mean) / baseline std
+    breakout    zscore >= threshold and last above the baseline max
+"""
+
+import os
+import sys
+import warnings
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from src.trend_store import TrendStore
+
+STAT_COLUMNS = ["last", "recent_avg", "momentum", "slope", "zscore", "breakout", "points"]
+
+
+def _right_align(values: np.ndarray) -> np.ndarray:
+    """
+    Shifts every column down so its last non-NaN value sits in the last row:
+    windows are then "the keyword's latest N points" even when keywords were
+    last fetched at different times.
+    """
+    valid = ~np.isnan(values)
+    rows = values.shape[0]
+    # Rows below the last valid entry of each column (all rows if none)
+    offset = np.where(valid.any(axis=0), np.argmax(valid[::-1], axis=0), rows)
+    source = np.arange(rows)[:, None] - offset[None, :]
+    aligned = values[source.clip(0), np.arange(values.shape[1])[None, :]]
+    return np.where(source >= 0, aligned, np.nan)
+
+
+def _slope(block: np.ndarray) -> np.ndarray:
+    """NaN-aware least-squares slope of every column against its row position."""
+    mask = ~np.isnan(block)
+    x = np.arange(block.shape[0], dtype=float)[:, None] * mask
+    y = np.where(mask, block, 0.0)
+    n = mask.sum(axis=0)
+    x_mean = x.sum(axis=0) / n
+    y_mean = y.sum(axis=0) / n
+    cov = (((x - x_mean) * (y - y_mean)) * mask).sum(axis=0)
+    var = (((x - x_mean) ** 2) * mask).sum(axis=0)
+    return np.where(var > 0, cov / np.where(var > 0, var, 1), np.nan)
+
+
+def trend_stats(wide: pd.DataFrame, recent: int = 5, baseline: int = 20,
+                breakout_z: float = 2.0) -> pd.DataFrame:
+    """
+    Statistics for every keyword column of a timestamp x keyword frame
+    (TrendStore.wide()). Returns one row per keyword with STAT_COLUMNS.
+    """
+    if wide.empty:
+        return pd.DataFrame(columns=STAT_COLUMNS)
+
+    values = _right_align(wide.to_numpy(dtype=float))
+    recent_block = values[-recent:]
+    base_block = values[-(recent + baseline):-recent] if values.shape[0] > recent else values[:0]
+
+    with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+        # All-NaN windows (new keywords) yield NaN stats instead of warnings
+        warnings.simplefilter("ignore", RuntimeWarning)
+        last = values[-1]
+        recent_avg = np.nanmean(recent_block, axis=0)
+        base_mean = np.nanmean(base_block, axis=0) if len(base_block) else np.full(values.shape[1], np.nan)
+        base_std = np.nanstd(base_block, axis=0) if len(base_block) else np.full(values.shape[1], np.nan)
+        base_max = np.nanmax(base_block, axis=0) if len(base_block) else np.full(values.shape[1], np.nan)
+        momentum = np.where(base_mean > 0, recent_avg / base_mean - 1, np.nan)
+        zscore = np.where(base_std > 0, (last - base_mean) / base_std, np.nan)
+        slope = _slope(recent_block)
+
+    stats = pd.DataFrame({
+        "last": last,
+        "recent_avg": recent_avg,
+        "momentum": momentum,
+        "slope": slope,
+        "zscore": zscore,
+        "breakout": (zscore >= breakout_z) & (last > base_max),
+        "points": (~np.isnan(values)).sum(axis=0),
+    }, index=wide.columns)
+    stats.index.name = "keyword"
+    return stats
+
+
+def theme_trend_stats(data_dir: str, keywords: Optional[List[str]] = None) -> pd.DataFrame:
+    """trend_stats() over a theme's store with the windows from config."""
+    with TrendStore(data_dir) as store:
+        wide = store.wide(keywords)
+    return trend_stats(
+        wide,
+        recent=config.TRENDS_RECENT_WINDOW,
+        baseline=config.TRENDS_BASELINE_WINDOW,
+        breakout_z=config.TRENDS_BREAKOUT_Z,
+    )
+
+
+def describe_trend(stats: pd.Series) -> str:
+    """One-line English summary of a keyword's stats, for the SerpApi abstract."""
+    parts = []
+    if not np.isnan(stats["momentum"]):
+        parts.append(f"Momentum vs baseline: {stats['momentum']:+.0%}.")
+    if not np.isnan(stats["slope"]):
+        parts.append(f"Recent slope: {stats['slope']:+.1f} points/period.")
+    if not np.isnan(stats["zscore"]):
+        parts.append(f"Latest z-score: {stats['zscore']:+.1f}.")
+    if stats["breakout"]:
+        parts.append("BREAKOUT: latest interest is above the whole baseline window.")
+    return " ".join(parts)
@@ -0,0 +1,107 @@
+"""
+Trend Store
+One time-series store per theme for Google Trends interest values,
+replacing the per-query, per-run serpapi_sub_<query>_<ts>.csv files.
+
+Layout:
+    data/<theme>/trends.sqlite
+        points(keyword, ts, value, partial, updated_at)   PRIMARY KEY (keyword, ts)
+
+Every fetch upserts its whole timeline: overlapping points from later runs
+replace earlier ones (SerpApi revises the last, partial point), new points
+are appended. Readers get columnar frames (long or keyword x timestamp wide).
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+TRENDS_FILENAME = "trends.sqlite"
+
+
+def timeline_points(timeline: List[dict]) -> List[Tuple[int, float, bool]]:
+    """(ts, value, partial) tuples from a SerpApi interest_over_time timeline."""
+    points = []
+    for point in timeline:
+        try:
+            ts = int(point["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        value = (point.get("values") or [{}])[0].get("extracted_value", 0)
+        points.append((ts, float(value or 0), bool(point.get("partial_data", False))))
+    return points
+
+
+class TrendStore:
+    """
+    SQLite-backed (keyword, ts, value) store for one theme data dir.
+    Not thread-safe: open one instance per thread / fetch.
+    """
+
+    def __init__(self, data_dir: str):
+        os.makedirs(data_dir, exist_ok=True)
+        self.path = os.path.join(data_dir, TRENDS_FILENAME)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS points (
+                keyword TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                value REAL NOT NULL,
+                partial INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (keyword, ts)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def upsert(self, keyword: str, points: Iterable[Tuple[int, float, bool]]) -> int:
+        """Inserts or replaces (ts, value, partial) points of a keyword. Returns the number written."""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [(keyword, ts, value, int(partial), now) for ts, value, partial in points]
+        self.conn.executemany("""
+            INSERT INTO points (keyword, ts, value, partial, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(keyword, ts) DO UPDATE SET
+                value = excluded.value, partial = excluded.partial, updated_at = excluded.updated_at
+        """, rows)
+        self.conn.commit()
+        return len(rows)
+
+    def keywords(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT keyword FROM points ORDER BY keyword")]
+
+    def frame(self, keywords: Optional[List[str]] = None, since: Optional[int] = None) -> pd.DataFrame:
+        """Long frame with columns keyword, ts, value, partial (sorted by keyword, ts)."""
+        query = "SELECT keyword, ts, value, partial FROM points"
+        clauses, params = [], []
+        if keywords:
+            clauses.append(f"keyword IN ({','.join('?' * len(keywords))})")
+            params.extend(keywords)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY keyword, ts"
+        return pd.read_sql_query(query, self.conn, params=params)
+
+    def wide(self, keywords: Optional[List[str]] = None, since: Optional[int] = None) -> pd.DataFrame:
+        """Timestamp x keyword matrix of values (NaN where a keyword has no point)."""
+        long = self.frame(keywords, since)
+        if long.empty:
+            return pd.DataFrame()
+        wide = long.pivot(index="ts", columns="keyword", values="value").sort_index()
+        wide.index = pd.to_datetime(wide.index, unit="s", utc=True)
+        return wide
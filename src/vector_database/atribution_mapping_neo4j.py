@@ -10,9 +10,15 @@ Usa los datos procesados por llama_LLM.py para:
 
 import json
 import os
+import time
+import hashlib
 from glob import glob
 from datetime import datetime
+from itertools import chain, islice
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from neo4j import GraphDatabase
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
 from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 
@@ -21,6 +27,9 @@ load_dotenv()
 
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import config
+from src.vector_database.embedding_stage import EmbeddingStage
+from src.vector_database.embedding_cache import cached_model
 
 
 # --- CONFIGURACIÓN ---
@@ -58,11 +67,116 @@ def parse_entidades(entidades_str):
         return []
 
 
+def noticia_params(noticia, vector=None):
+    """
+    Parámetros Cypher de una noticia (mismos para la ruta por artículo y la de lotes).
+    Incluye `fingerprint`: hash de los campos analizados y del modelo de embeddings,
+    así una noticia sin cambios se reconoce sin recalcular su vector.
+    """
+    entidades = parse_entidades(noticia.get('entidades', '[]'))
+    metadata = noticia.get('metadata') or {}
+    titulo = noticia.get('title', '')
+    params = dict(
+        # Claves del artículo unificado (url, published_date, source_name); las antiguas como respaldo
+        url=noticia.get('url') or noticia.get('link') or f"unknown_{hashlib.sha1(titulo.encode('utf-8')).hexdigest()[:16]}",
+        titulo=titulo,
+        abstract=str(noticia.get('abstract') or '')[:1000],
+        fecha=noticia.get('published_date') or noticia.get('date', ''),
+        sentimiento=float(noticia.get('sentimiento', 0)),
+        subjetividad=float(noticia.get('subjetividad', 0)),
+        relevancia=float(noticia.get('relevancia', noticia.get('relevancia_tendencia', 0)) or 0),
+        razonamiento=noticia.get('razonamiento', ''),
+        search_term=noticia.get('search_term') or metadata.get('search_term') or metadata.get('keyword', ''),
+        fuente=noticia.get('source_name') or noticia.get('source', 'Unknown'),
+        categoria=noticia.get('categoria_cyber', 'General Cybersecurity'),
+        fase_hype=noticia.get('fase_hype', 'Desconocido'),
+        entidades=entidades if entidades else [],
+    )
+    contenido = json.dumps([EMBEDDING_MODEL, params], sort_keys=True, ensure_ascii=False, default=str)
+    params['fingerprint'] = hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+    params['vector'] = vector
+    return params
+
+
+# Misma estructura que ingest_noticia, para una lista de filas en una sola transacción
+INGEST_BATCH_QUERY = """
+UNWIND $rows AS row
+MERGE (n:Noticia {url: row.url})
+
+// Noticia actualizada: sus relaciones se rehacen (la categoría / fase / entidades pueden haber cambiado)
+WITH n, row
+OPTIONAL MATCH (n)-[old:PUBLICADO_POR|PERTENECE_A|EN_FASE|MENCIONA]->()
+DELETE old
+WITH DISTINCT n, row
+SET n.titulo = row.titulo,
+    n.abstract = row.abstract,
+    n.fecha = row.fecha,
+    n.sentimiento = row.sentimiento,
+    n.subjetividad = row.subjetividad,
+    n.relevancia = row.relevancia,
+    n.razonamiento = row.razonamiento,
+    n.search_term = row.search_term,
+    n.embedding = row.vector,
+    n.fingerprint = row.fingerprint,
+    n.updated_at = datetime()
+
+WITH n, row
+MERGE (s:Fuente {nombre: row.fuente})
+MERGE (n)-[:PUBLICADO_POR]->(s)
+
+WITH n, row
+MERGE (c:Categoria {nombre: row.categoria})
+MERGE (n)-[:PERTENECE_A]->(c)
+
+WITH n, row
+MERGE (f:FaseHype {nombre: row.fase_hype})
+MERGE (n)-[:EN_FASE]->(f)
+
+// FOREACH en lugar de UNWIND: las noticias sin entidades no se descartan
+WITH n, row
+FOREACH (empresa_nombre IN row.entidades |
+    MERGE (e:Empresa {nombre: empresa_nombre})
+    MERGE (n)-[:MENCIONA]->(e))
+"""
+
+
+# Filtros de query_similar -> predicado Cypher sobre la Noticia n ($value = su parámetro; nunca
+# se interpola el valor). La categoría, la fase y la fuente son relaciones, no propiedades: se
+# comprueban con EXISTS, así una noticia con varias categorías / fuentes no se duplica.
+SEARCH_FILTERS = {
+    "sentimiento_min": "n.sentimiento >= $value",
+    "sentimiento_max": "n.sentimiento <= $value",
+    "subjetividad_min": "n.subjetividad >= $value",
+    "subjetividad_max": "n.subjetividad <= $value",
+    "relevancia_min": "n.relevancia >= $value",
+    "categoria": "EXISTS { (n)-[:PERTENECE_A]->(:Categoria {nombre: $value}) }",
+    "fase_hype": "EXISTS { (n)-[:EN_FASE]->(:FaseHype {nombre: $value}) }",
+    "fuente": "EXISTS { (n)-[:PUBLICADO_POR]->(:Fuente {nombre: $value}) }",
+}
+
+# Cola común de las estrategias de query_similar: top n_results (una fila por noticia)
+SEARCH_RETURN = """
+WITH n, score
+ORDER BY score DESC
+LIMIT $n_results
+RETURN n.titulo AS titulo,
+       n.url AS url,
+       [(n)-[:PUBLICADO_POR]->(s:Fuente) | s.nombre][0] AS fuente,
+       [(n)-[:PERTENECE_A]->(c:Categoria) | c.nombre][0] AS categoria,
+       [(n)-[:EN_FASE]->(f:FaseHype) | f.nombre][0] AS fase_hype,
+       n.sentimiento AS sentimiento,
+       n.subjetividad AS subjetividad,
+       n.razonamiento AS razonamiento,
+       [(n)-[:MENCIONA]->(e:Empresa) | e.nombre] AS entidades,
+       score
+ORDER BY score DESC
+"""
+
 class Neo4jReflexivityGraph:
     """Clase para manejar el grafo de reflexividad en Neo4j."""
 
-    def __init__(self, uri, user, password):
-        """Inicializa la conexión a Neo4j y el modelo de embeddings."""
+    def __init__(self, uri, user, password, model=None):
+        """Inicializa la conexión a Neo4j y el modelo de embeddings (model: encoder ya cargado, opcional)."""
         print("Conectando a Neo4j...")
         self.driver = GraphDatabase.driver(uri, auth=(user, password))
 
@@ -81,9 +195,14 @@ class Neo4jReflexivityGraph:
             print("   NEO4J_PASSWORD=tu_contraseña")
             raise
 
-        print("Cargando modelo de embeddings...")
-        self.model = SentenceTransformer(EMBEDDING_MODEL)
-        print(f"Modelo cargado: {EMBEDDING_MODEL}")
+        if model is None:
+            print("Cargando modelo de embeddings...")
+            # Con caché persistente: los textos ya codificados en otra ejecución no pasan por el modelo
+            model = cached_model(SentenceTransformer(EMBEDDING_MODEL), EMBEDDING_MODEL)
+            print(f"Modelo cargado: {EMBEDDING_MODEL}")
+        self.model = model
+        self.last_search = None  # estrategia / rondas / latencia de la última query_similar
+        self._selectivity_cache = {}  # filtros -> (instante, noticias filtradas, total)
 
     def close(self):
         """Cierra la conexión."""
@@ -160,6 +279,7 @@ class Neo4jReflexivityGraph:
             n.razonamiento = $razonamiento,
             n.search_term = $search_term,
             n.embedding = $vector,
+            n.fingerprint = $fingerprint,
             n.updated_at = datetime()
 
         // Crear relación con Fuente
@@ -186,101 +306,275 @@ class Neo4jReflexivityGraph:
         RETURN count(*) as created
         """
 
-        entidades = parse_entidades(noticia.get('entidades', '[]'))
-
-        tx.run(
-            query,
-            url=noticia.get('link', f"unknown_{hash(noticia.get('title', ''))}"),
-            titulo=noticia.get('title', ''),
-            abstract=str(noticia.get('abstract', ''))[:1000],
-            fecha=noticia.get('date', ''),
-            sentimiento=float(noticia.get('sentimiento', 0)),
-            subjetividad=float(noticia.get('subjetividad', 0)),
-            relevancia=float(noticia.get('relevancia_tendencia', 0)),
-            razonamiento=noticia.get('razonamiento', ''),
-            search_term=noticia.get('search_term', ''),
-            fuente=noticia.get('source', 'Unknown'),
-            categoria=noticia.get('categoria_cyber', 'General Cybersecurity'),
-            fase_hype=noticia.get('fase_hype', 'Desconocido'),
-            entidades=entidades if entidades else [],
-            vector=vector
-        )
+        tx.run(query, **noticia_params(noticia, vector))
 
-    def ingest_all(self, datos):
-        """Ingesta todos los datos en el grafo."""
-        print(f"\nIniciando ingesta de {len(datos)} articulos...")
+    @staticmethod
+    def ingest_batch(tx, rows):
+        """Ingesta un lote de filas (noticia_params) en una sola sentencia UNWIND."""
+        tx.run(INGEST_BATCH_QUERY, rows=rows).consume()
 
+    def _write_batch(self, session, rows, retries=3):
+        """Commit de un lote; reintenta con backoff los errores transitorios."""
+        for intento in range(retries + 1):
+            try:
+                session.execute_write(self.ingest_batch, rows)
+                return
+            except (TransientError, ServiceUnavailable, SessionExpired) as e:
+                if intento == retries:
+                    raise
+                espera = 2 ** intento
+                print(f"  Error transitorio en lote de {len(rows)} ({e.__class__.__name__}), reintento en {espera}s")
+                time.sleep(espera)
+
+    def fetch_fingerprints(self):
+        """url -> fingerprint de todas las Noticias del grafo (una sola consulta)."""
         with self.driver.session() as session:
-            for i, noticia in enumerate(datos):
+            result = session.run("MATCH (n:Noticia) RETURN n.url AS url, n.fingerprint AS fingerprint")
+            return {record["url"]: record["fingerprint"] for record in result}
+
+    def ingest_all(self, datos):
+        """
+        Ingesta todos los datos en el grafo (acepta lista o iterador) por lotes
+        UNWIND de NEO4J_INGEST_BATCH_SIZE filas. Con NEO4J_INGEST_PIPELINE, el
+        siguiente lote se embebe mientras el actual hace commit.
+
+        Las noticias cuyo fingerprint coincide con el del grafo se saltan sin
+        calcular su embedding ni escribir nada; sólo van las nuevas o cambiadas.
+        """
+        total = len(datos) if hasattr(datos, '__len__') else '?'
+        print(f"\nIniciando ingesta de {total} articulos...")
+
+        existentes = self.fetch_fingerprints()
+        print(f"Noticias ya en el grafo: {len(existentes)}")
+        resumen = Counter()
+
+        def nuevas_o_cambiadas():
+            for noticia in datos:
                 # Saltar registros con errores
-                if noticia.get('fase_hype') == 'ERROR':
+                if str(noticia.get('fase_hype', '')).upper() == 'ERROR':
+                    resumen['errores'] += 1
                     continue
+                params = noticia_params(noticia)
+                if params['url'] not in existentes:
+                    resumen['inserted'] += 1
+                elif existentes[params['url']] == params['fingerprint']:
+                    resumen['skipped'] += 1
+                    continue
+                else:
+                    resumen['updated'] += 1
+                # Una misma URL repetida en el snapshot sólo se escribe una vez
+                existentes[params['url']] = params['fingerprint']
+                yield noticia
+
+        batch_size = config.NEO4J_INGEST_BATCH_SIZE
+        escritas = 0
+        inicio = time.time()
+        # Embeddings por lotes (ordenados por longitud); near-duplicates reutilizan el vector de su cluster
+        with EmbeddingStage(self.model, batch_size=config.EMBED_BATCH_SIZE, workers=config.EMBED_WORKERS,
+                            chunk_size=config.EMBED_CHUNK_SIZE) as stage:
+            filas = (noticia_params(noticia, vector) for noticia, vector in stage.iter_embedded(nuevas_o_cambiadas()))
+            with self.driver.session() as session, ThreadPoolExecutor(max_workers=1) as commit_pool:
+                pendiente = None  # (future del commit en curso, filas)
+                while True:
+                    # Con pipelining, este lote se embebe mientras el anterior hace commit
+                    lote = list(islice(filas, batch_size))
+                    if pendiente is not None:
+                        futuro, n = pendiente
+                        futuro.result()
+                        escritas += n
+                        pendiente = None
+                        print(f"  Procesados: {escritas}/{total}")
+                    if not lote:
+                        break
+                    # La sesión nunca se usa desde dos hilos a la vez: se espera al commit anterior
+                    if config.NEO4J_INGEST_PIPELINE:
+                        futuro = commit_pool.submit(self._write_batch, session, lote, config.NEO4J_INGEST_RETRIES)
+                        pendiente = (futuro, len(lote))
+                    else:
+                        self._write_batch(session, lote, config.NEO4J_INGEST_RETRIES)
+                        escritas += len(lote)
+                        print(f"  Procesados: {escritas}/{total}")
+
+        duracion = max(time.time() - inicio, 1e-9)
+        print(f"Ingesta completada en {duracion:.1f}s: {resumen['inserted']} insertadas, "
+              f"{resumen['updated']} actualizadas, {resumen['skipped']} sin cambios (saltadas), "
+              f"{resumen['errores']} con error ({escritas / duracion:.0f} filas/s escritas).")
+        print(f"Embeddings: {stage.report()}")
+        if hasattr(self.model, 'cache'):
+            print(f"Caché de embeddings: {self.model.cache.stats()}")
+
+    def benchmark_ingest(self, datos, n=500):
+        """
+        Compara filas/s de la ruta por artículo (una transacción por noticia)
+        con la de lotes UNWIND sobre las mismas n noticias (embeddings precalculados,
+        sólo se mide la escritura; los MERGE son idempotentes).
+        """
+        muestra = [noticia for noticia in islice(datos, n) if str(noticia.get('fase_hype', '')).upper() != 'ERROR']
+        stage = EmbeddingStage(self.model, batch_size=config.EMBED_BATCH_SIZE)
+        embebidas = list(stage.iter_embedded(muestra))
+        print(f"\nBenchmark de ingesta con {len(embebidas)} noticias ({stage.report()})")
 
-                # Generar embedding del texto
-                texto = f"{noticia.get('title', '')} {noticia.get('razonamiento', '')} {noticia.get('abstract', '')[:200]}"
-                vector = self.model.encode(texto).tolist()
-
-                # Guardar en grafo
+        with self.driver.session() as session:
+            inicio = time.time()
+            for noticia, vector in embebidas:
                 session.execute_write(self.ingest_noticia, noticia, vector)
+            por_articulo = len(embebidas) / max(time.time() - inicio, 1e-9)
+
+            filas = [noticia_params(noticia, vector) for noticia, vector in embebidas]
+            inicio = time.time()
+            for k in range(0, len(filas), config.NEO4J_INGEST_BATCH_SIZE):
+                self._write_batch(session, filas[k:k + config.NEO4J_INGEST_BATCH_SIZE], config.NEO4J_INGEST_RETRIES)
+            por_lotes = len(filas) / max(time.time() - inicio, 1e-9)
+
+        print(f"  Por artículo:  {por_articulo:8.0f} filas/s")
+        print(f"  UNWIND (lote {config.NEO4J_INGEST_BATCH_SIZE}): {por_lotes:8.0f} filas/s "
+              f"(x{por_lotes / max(por_articulo, 1e-9):.1f})")
+        return {"per_article_rows_per_sec": por_articulo, "unwind_rows_per_sec": por_lotes}
+
+    def _filter_clause(self, filters):
+        """WHERE parametrizado (predicados, parámetros) para los filtros de query_similar."""
+        predicados, params = [], {}
+        for clave, valor in sorted((filters or {}).items()):
+            if clave not in SEARCH_FILTERS:
+                raise ValueError(f"Filtro desconocido '{clave}'. Disponibles: {', '.join(SEARCH_FILTERS)}")
+            predicados.append(SEARCH_FILTERS[clave].replace("$value", f"$f_{clave}"))
+            params[f"f_{clave}"] = valor
+        return predicados, params
+
+    def count_filtered(self, filters=None):
+        """(noticias que cumplen los filtros, noticias totales) para estimar la selectividad."""
+        predicados, params = self._filter_clause(filters)
+        with self.driver.session() as session:
+            total = session.run("MATCH (n:Noticia) RETURN count(n) AS total").single()["total"]
+            if not predicados:
+                return total, total
+            filtradas = session.run(f"MATCH (n:Noticia) WHERE {' AND '.join(predicados)} RETURN count(n) AS total",
+                                    **params).single()["total"]
+            return filtradas, total
+
+    def _selectivity(self, filters):
+        """count_filtered() cacheado por conjunto de filtros durante NEO4J_SEARCH_SELECTIVITY_TTL segundos."""
+        clave = tuple(sorted((k, json.dumps(v, sort_keys=True, default=str)) for k, v in filters.items()))
+        ahora = time.time()
+        cached = self._selectivity_cache.get(clave)
+        if cached is None or ahora - cached[0] > config.NEO4J_SEARCH_SELECTIVITY_TTL:
+            cached = (ahora, *self.count_filtered(filters))
+            self._selectivity_cache[clave] = cached
+        return cached[1], cached[2]
+
+    def query_similar(self, query_text, n_results=5, filters=None, strategy="auto"):
+        """
+        Busca noticias similares usando búsqueda vectorial con filtros.
 
-                if (i + 1) % 50 == 0:
-                    print(f"  Procesados: {i + 1}/{len(datos)}")
+        El índice vectorial devuelve k candidatos y los filtros se aplican después,
+        así que con un filtro selectivo k = n_results dejaría pocos o ningún resultado:
 
-        print(f"Ingesta completada: {len(datos)} articulos.")
+        - "index": over-fetch adaptativo; k parte de n_results * NEO4J_SEARCH_OVERFETCH
+          (dividido por la selectividad estimada) y se duplica hasta tener
+          n_results supervivientes, agotar el índice o llegar a NEO4J_SEARCH_MAX_K.
+          Sin filtros no hace falta over-fetch: una sola consulta con k = n_results.
+        - "exact": filtra primero y calcula el coseno sólo sobre las que pasan
+          (exacto; barato si el filtro deja pocas noticias).
+        - "auto": "exact" si el filtro deja <= NEO4J_SEARCH_EXACT_MAX_ROWS noticias, si no "index".
 
-    def query_similar(self, query_text, n_results=5, filters=None):
-        """
-        Busca noticias similares usando búsqueda vectorial.
+        La selectividad (noticias que pasan el filtro) se cuenta una vez por conjunto
+        de filtros y se reutiliza durante NEO4J_SEARCH_SELECTIVITY_TTL segundos.
 
         Args:
             query_text: Texto de búsqueda
             n_results: Número de resultados
-            filters: Dict con filtros (sentimiento, subjetividad, categoria, etc.)
+            filters: Dict con filtros (claves de SEARCH_FILTERS: sentimiento_min/max,
+                subjetividad_min/max, relevancia_min, categoria, fase_hype, fuente)
+            strategy: "auto", "index" o "exact"
+
+        La estrategia usada, las rondas, el k final y la latencia quedan en self.last_search.
         """
+        if strategy not in ("auto", "index", "exact"):
+            raise ValueError(f"Estrategia desconocida '{strategy}' (auto, index, exact)")
+        predicados, params = self._filter_clause(filters)
+        inicio = time.time()
+
         # Generar embedding de la consulta
         query_vector = self.model.encode(query_text).tolist()
+        params.update(query_vector=query_vector, n_results=n_results)
 
-        # Construir query Cypher
-        where_clauses = []
-        if filters:
-            if 'sentimiento_min' in filters:
-                where_clauses.append(f"n.sentimiento >= {filters['sentimiento_min']}")
-            if 'sentimiento_max' in filters:
-                where_clauses.append(f"n.sentimiento <= {filters['sentimiento_max']}")
-            if 'subjetividad_max' in filters:
-                where_clauses.append(f"n.subjetividad <= {filters['subjetividad_max']}")
-            if 'subjetividad_min' in filters:
-                where_clauses.append(f"n.subjetividad >= {filters['subjetividad_min']}")
-            if 'categoria' in filters:
-                where_clauses.append(f"n.categoria = '{filters['categoria']}'")
-
-        where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-
-        query = f"""
-        CALL db.index.vector.queryNodes('news_embeddings', $n_results, $query_vector)
-        YIELD node AS n, score
-        {where_clause}
-        MATCH (n)-[:PUBLICADO_POR]->(s:Fuente)
-        MATCH (n)-[:PERTENECE_A]->(c:Categoria)
-        MATCH (n)-[:EN_FASE]->(f:FaseHype)
-        OPTIONAL MATCH (n)-[:MENCIONA]->(e:Empresa)
-        RETURN n.titulo AS titulo,
-               n.url AS url,
-               s.nombre AS fuente,
-               c.nombre AS categoria,
-               f.nombre AS fase_hype,
-               n.sentimiento AS sentimiento,
-               n.subjetividad AS subjetividad,
-               n.razonamiento AS razonamiento,
-               collect(DISTINCT e.nombre) AS entidades,
-               score
-        ORDER BY score DESC
-        LIMIT $n_results
-        """
+        filtradas, total = self._selectivity(filters) if predicados and strategy != "exact" else (None, None)
+        if strategy == "auto":
+            strategy = "exact" if predicados and filtradas <= config.NEO4J_SEARCH_EXACT_MAX_ROWS else "index"
 
+        rondas, k = 1, None
         with self.driver.session() as session:
-            result = session.run(query, query_vector=query_vector, n_results=n_results)
-            return [dict(record) for record in result]
+            if strategy == "exact":
+                where = " AND ".join(["n.embedding IS NOT NULL"] + predicados)
+                query = f"""
+                MATCH (n:Noticia)
+                WHERE {where}
+                WITH n, vector.similarity.cosine(n.embedding, $query_vector) AS score
+                {SEARCH_RETURN}
+                """
+                resultados = [dict(record) for record in session.run(query, **params)]
+            elif not predicados:
+                k = n_results
+                query = f"""
+                CALL db.index.vector.queryNodes('news_embeddings', $k, $query_vector)
+                YIELD node AS n, score
+                {SEARCH_RETURN}
+                """
+                resultados = [dict(record) for record in session.run(query, k=k, **params)]
+            else:
+                query = f"""
+                CALL db.index.vector.queryNodes('news_embeddings', $k, $query_vector)
+                YIELD node AS n, score
+                WHERE {' AND '.join(predicados)}
+                {SEARCH_RETURN}
+                """
+                # Selectividad estimada del filtro: con un 5% de supervivientes hacen falta ~20x candidatos
+                selectividad = filtradas / total if total else 1.0
+                limite = max(1, min(config.NEO4J_SEARCH_MAX_K, total))
+                k = min(limite, max(n_results, int(n_results * config.NEO4J_SEARCH_OVERFETCH
+                                                   / max(selectividad, 1e-6))))
+                # Ninguna noticia cumple el filtro: no hay nada que buscar en el índice
+                resultados = [] if not filtradas else None
+                while resultados is None:
+                    resultados = [dict(record) for record in session.run(query, k=k, **params)]
+                    if len(resultados) < n_results and k < limite:
+                        resultados = None
+                        k = min(limite, k * 2)
+                        rondas += 1
+
+        self.last_search = {
+            "strategy": strategy, "rounds": rondas, "k": k, "filtered": filtradas, "total": total,
+            "results": len(resultados), "ms": (time.time() - inicio) * 1000,
+        }
+        return resultados
+
+    def benchmark_search(self, query_text, n_results=5, repeats=5):
+        """
+        Latencia media (ms) y resultados de cada estrategia de query_similar con
+        filtros de selectividad creciente (sin filtro, burbuja, categoría menos frecuente).
+        """
+        categorias = self.get_category_analysis()
+        casos = {"sin filtro": None,
+                 "burbuja": {"subjetividad_min": 0.6, "sentimiento_min": 0.5}}
+        if categorias:
+            casos[f"categoria '{categorias[-1]['categoria']}'"] = {"categoria": categorias[-1]["categoria"]}
+
+        print(f"\nBenchmark de búsqueda filtrada: '{query_text}' (top {n_results}, {repeats} repeticiones)")
+        resumen = {}
+        for nombre, filtros in casos.items():
+            filtradas, total = self.count_filtered(filtros)
+            print(f"  {nombre} ({filtradas}/{total} noticias)")
+            for strategy in ("index", "exact", "auto"):
+                tiempos = []
+                for _ in range(repeats):
+                    self.query_similar(query_text, n_results, filtros, strategy)
+                    tiempos.append(self.last_search["ms"])
+                info = self.last_search
+                resumen[(nombre, strategy)] = {"ms": sum(tiempos) / len(tiempos), **info}
+                rondas = f", {info['rounds']} rondas, k={info['k']}" if info["strategy"] == "index" else ""
+                print(f"    {strategy:<5} -> {info['strategy']:<5} {resumen[(nombre, strategy)]['ms']:8.1f} ms | "
+                      f"{info['results']}/{n_results} resultados{rondas}")
+        return resumen
 
     def get_graph_stats(self):
         """Obtiene estadísticas del grafo."""
@@ -402,8 +696,11 @@ def print_results(results, title):
             print(f"   Razonamiento: {r['razonamiento']}")
 
 
-def main(theme_id):
-    """Función principal para ingesta por tema."""
+def main(theme_id, benchmark=None, search_benchmark=None):
+    """
+    Función principal para ingesta por tema (benchmark=N: sólo compara rutas de ingesta con N noticias;
+    search_benchmark=texto: sólo mide las estrategias de búsqueda filtrada sobre el grafo existente).
+    """
     print("=" * 70)
     print(f"ANALISIS DE REFLEXIVIDAD CON NEO4J - Theme: {theme_id}")
     print("Grafo de Conocimiento + Busqueda Semantica Vectorial")
@@ -420,20 +717,17 @@ def main(theme_id):
          
     theme_dirs = config.get_theme_dirs(theme_id)
     data_dir = theme_dirs["DATA"]
-    pattern = os.path.join(data_dir, "analyzed_reflexivity_*.json")
-    files = glob(pattern)
-    
-    if not files:
-        print(f"\nERROR: No se encontraron archivos analizados en {data_dir}.")
-        return
 
-    json_file = max(files, key=os.path.getmtime)
-    print(f"\nArchivo de datos: {json_file}")
+    # 2. Abrir datos en streaming (último run del store 'analyzed' o snapshot más reciente)
+    from src.article_store import iter_latest
+    datos = iter_latest(data_dir, "analyzed", "analyzed_reflexivity_")
 
-    # 2. Cargar datos
-    with open(json_file, 'r', encoding='utf-8') as f:
-        datos = json.load(f)
-    print(f"Cargados {len(datos)} registros.")
+    # Comprobar que hay datos sin consumir el iterador
+    primero = next(datos, None)
+    if primero is None:
+        print(f"\nERROR: No se encontraron archivos analizados en {data_dir}.")
+        return
+    datos = chain([primero], datos)
 
     # 3. Conectar a Neo4j e ingestar datos
     try:
@@ -446,6 +740,13 @@ def main(theme_id):
         # Configurar esquema (Indices, Vectores)
         graph.setup_schema()
 
+        if benchmark:
+            graph.benchmark_ingest(datos, benchmark)
+            return
+        if search_benchmark:
+            graph.benchmark_search(search_benchmark)
+            return
+
         # Ingestar datos (Embeddings + Grafo)
         graph.ingest_all(datos)
 
@@ -467,5 +768,9 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--theme", required=True, help="Theme ID")
+    parser.add_argument("--benchmark", type=int, default=None, metavar="N",
+                        help="Compare per-article vs UNWIND batch ingestion rows/sec on N articles")
+    parser.add_argument("--search-benchmark", default=None, metavar="QUERY",
+                        help="Time index over-fetch vs exact filtered search for QUERY (no ingestion)")
     args = parser.parse_args()
-    main(args.theme)
+    main(args.theme, benchmark=args.benchmark, search_benchmark=args.search_benchmark)
@@ -0,0 +1,304 @@
+"""
+Caché Persistente de Embeddings
+Cada ejecución de la ingesta volvía a codificar todas las noticias del último
+fichero analizado. Esta caché guarda en disco el vector de cada texto, con
+clave hash(modelo, variante, texto), y la comparten la ingesta, el RAG
+explorer, el triaje de relevancia y el scorer local:
+
+- vectors.<dtype>[.<generación>].bin: matriz (filas x dim) float16/float32 leída con np.memmap.
+- index.sqlite: clave -> fila (offset en la matriz) + último uso, y metadatos
+  (dim, filas, generación del fichero de vectores vigente).
+- Eviction LRU al superar max_rows (las filas liberadas quedan como huecos) y
+  compactación que reescribe sólo las filas vivas cuando los huecos dominan.
+  La compactación escribe la siguiente generación en un fichero nuevo y cambia
+  la numeración de filas y la generación en una sola transacción: un crash en
+  cualquier punto deja el índice apuntando a un fichero coherente.
+
+CachedEncoder envuelve un SentenceTransformer con la misma API encode(): los
+textos ya vistos no gastan tiempo de modelo.
+"""
+
+import os
+import re
+import sys
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import config
+
+_SQL_CHUNK = 500  # claves por IN (...) (límite de variables de SQLite)
+
+
+def make_key(model_name: str, text: str, variant: str = "") -> str:
+    return hashlib.sha1(f"{model_name}\0{variant}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Vectores en un fichero memory-mapped + índice SQLite (thread-safe con un lock).
+
+    Args:
+        directory: carpeta de la caché (una por modelo).
+        dtype: "float16" (mitad de disco) o "float32".
+        max_rows: filas vivas máximas; al superarlas se expulsan las menos usadas.
+    """
+
+    def __init__(self, directory: str, dtype: str = "float16", max_rows: int = 500_000):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.dtype = np.dtype(dtype)
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._map: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                row INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_used ON entries(last_used);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+        self.conn.commit()
+        self.dim = int(self._meta("dim", 0))
+        self.rows = int(self._meta("rows", 0))
+        self.generation = int(self._meta("generation", 0))
+        self.vectors_path = self._vectors_path(self.generation)
+        self._remove_orphans()
+        self._check_vectors_file()
+
+    def _vectors_path(self, generation: int) -> str:
+        suffix = f".{generation}" if generation else ""
+        return os.path.join(self.directory, f"vectors.{self.dtype.name}{suffix}.bin")
+
+    def _remove_orphans(self):
+        # Generaciones de una compactación interrumpida (nueva sin commit o antigua sin borrar)
+        pattern = re.compile(rf"^vectors\.{self.dtype.name}(\.\d+)?\.bin(\.tmp)?$")
+        current = os.path.basename(self.vectors_path)
+        for name in os.listdir(self.directory):
+            if pattern.match(name) and name != current:
+                os.remove(os.path.join(self.directory, name))
+
+    def _check_vectors_file(self):
+        """Ajusta el fichero de vectores al índice tras un crash (o el índice si faltan vectores)."""
+        if not self.dim:
+            return
+        row_bytes = self.dim * self.dtype.itemsize
+        size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        available = size // row_bytes
+        if available < self.rows:
+            # Fichero más corto que el índice: esas filas no existen, nunca se rellenan con ceros
+            lost = self.conn.execute("DELETE FROM entries WHERE row >= ?", (available,)).rowcount
+            print(f"Caché de embeddings: faltan {self.rows - available} filas en {self.vectors_path}; "
+                  f"{lost} entradas eliminadas del índice")
+            self.rows = available
+            self._set_meta("rows", self.rows)
+            self.conn.commit()
+        if size > self.rows * row_bytes:
+            # Filas escritas tras el último commit del índice (crash a mitad de put): se descartan
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(self.rows * row_bytes)
+
+    def _meta(self, name: str, default):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, name: str, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, str(value)))
+
+    def _matrix(self) -> Optional[np.memmap]:
+        if self._map is None and self.rows:
+            self._map = np.memmap(self.vectors_path, dtype=self.dtype, mode="r", shape=(self.rows, self.dim))
+        return self._map
+
+    def _release_map(self):
+        # Cerrar el mapeo antes de reescribir / ampliar el fichero (Windows no permite reemplazarlo abierto)
+        self._map = None
+
+    def close(self):
+        with self._lock:
+            self._release_map()
+            self.conn.close()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Vectores (float32) de las claves presentes; actualiza su último uso."""
+        found: Dict[str, int] = {}
+        result: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[start:start + _SQL_CHUNK]
+                query = f"SELECT key, row FROM entries WHERE key IN ({','.join('?' * len(chunk))})"
+                found.update(self.conn.execute(query, chunk).fetchall())
+            if found:
+                now = time.time()
+                self.conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                                      [(now, key) for key in found])
+                self.conn.commit()
+                keys_found = list(found)
+                vectors = np.asarray(self._matrix()[[found[k] for k in keys_found]], dtype=np.float32)
+                result = dict(zip(keys_found, vectors))
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return result
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        """Añade vectores al final de la matriz y al índice (expulsa LRU si se supera max_rows)."""
+        if not keys:
+            return
+        vectors = np.asarray(vectors).astype(self.dtype)
+        with self._lock:
+            if not self.dim:
+                self.dim = vectors.shape[1]
+                self._set_meta("dim", self.dim)
+            self._release_map()
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors).tobytes())
+            now = time.time()
+            self.conn.executemany("INSERT OR REPLACE INTO entries (key, row, last_used) VALUES (?, ?, ?)",
+                                  [(key, self.rows + i, now) for i, key in enumerate(keys)])
+            self.rows += len(keys)
+            self._set_meta("rows", self.rows)
+            self.conn.commit()
+            live = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if live > self.max_rows:
+            self.evict(self.max_rows)
+
+    def evict(self, max_rows: int) -> int:
+        """Expulsa las entradas menos usadas hasta max_rows; compacta si más de la mitad son huecos."""
+        with self._lock:
+            live = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            excess = live - max_rows
+            if excess > 0:
+                self.conn.execute("DELETE FROM entries WHERE key IN "
+                                  "(SELECT key FROM entries ORDER BY last_used LIMIT ?)", (excess,))
+                self.conn.commit()
+                live -= excess
+        if self.rows > 2 * live:
+            self.compact()
+        return max(0, excess)
+
+    def compact(self) -> int:
+        """
+        Reescribe la matriz sólo con las filas vivas (siguiente generación del
+        fichero) y renumera el índice en la misma transacción que cambia la
+        generación. Devuelve filas liberadas.
+        """
+        with self._lock:
+            entries = self.conn.execute("SELECT key, row FROM entries ORDER BY row").fetchall()
+            freed = self.rows - len(entries)
+            if freed <= 0:
+                return 0
+            matrix = self._matrix()
+            new_path = self._vectors_path(self.generation + 1)
+            with open(new_path, "wb") as f:
+                for start in range(0, len(entries), 65536):
+                    rows = [row for _, row in entries[start:start + 65536]]
+                    f.write(np.ascontiguousarray(matrix[rows]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            del matrix
+            self._release_map()
+            # Punto de cambio atómico: filas renumeradas + generación nueva en un solo commit
+            self.conn.executemany("UPDATE entries SET row = ? WHERE key = ?",
+                                  [(i, key) for i, (key, _) in enumerate(entries)])
+            self._set_meta("rows", len(entries))
+            self._set_meta("generation", self.generation + 1)
+            self.conn.commit()
+            old_path = self.vectors_path
+            self.generation += 1
+            self.vectors_path = new_path
+            self.rows = len(entries)
+            os.remove(old_path)
+            return freed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            live = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "live_rows": live, "file_rows": self.rows,
+                "file_mb": round(self.rows * max(self.dim, 1) * self.dtype.itemsize / 1e6, 1)}
+
+
+class CachedEncoder:
+    """
+    SentenceTransformer con caché: encode() / encode_multi_process() sólo
+    codifican los textos que no están en la caché. Los vectores nuevos pasan
+    por el dtype de la caché, así un texto devuelve lo mismo con o sin acierto.
+    """
+
+    def __init__(self, model, cache: EmbeddingCache, model_name: str):
+        self.model = model
+        self.cache = cache
+        self.model_name = model_name
+        # Textos que sí pasaron por el modelo y su tiempo (sin los aciertos de caché)
+        self.model_encoded = 0
+        self.model_seconds = 0.0
+
+    def __getattr__(self, name):
+        # start/stop_multi_process_pool, get_sentence_embedding_dimension, ...
+        return getattr(self.model, name)
+
+    def _cached(self, sentences, encode_fn, normalize_embeddings: bool):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        variant = "norm" if normalize_embeddings else ""
+        keys = [make_key(self.model_name, text, variant) for text in texts]
+        found = self.cache.get_many(keys)
+        missing: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if key not in found and key not in missing:
+                missing[key] = i
+        if missing:
+            start = time.time()
+            fresh = np.asarray(encode_fn([texts[i] for i in missing.values()]))
+            self.model_seconds += time.time() - start
+            self.model_encoded += len(missing)
+            fresh = fresh.astype(self.cache.dtype).astype(np.float32)
+            self.cache.put_many(list(missing), fresh)
+            found.update(zip(missing, fresh))
+        if not texts:
+            return np.zeros((0, self.cache.dim), dtype=np.float32)
+        result = np.vstack([found[key] for key in keys])
+        return result[0] if single else result
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False,
+               normalize_embeddings: bool = False, **kwargs):
+        return self._cached(sentences, lambda texts: self.model.encode(
+            texts, batch_size=batch_size, show_progress_bar=show_progress_bar,
+            normalize_embeddings=normalize_embeddings, **kwargs), normalize_embeddings)
+
+    def encode_multi_process(self, sentences, pool, batch_size: int = 32,
+                             normalize_embeddings: bool = False, **kwargs):
+        return self._cached(sentences, lambda texts: self.model.encode_multi_process(
+            texts, pool, batch_size=batch_size, normalize_embeddings=normalize_embeddings, **kwargs),
+            normalize_embeddings)
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str) -> EmbeddingCache:
+    """Caché compartida del proceso para un modelo (config.EMBED_CACHE_*)."""
+    with _caches_lock:
+        if model_name not in _caches:
+            slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+            _caches[model_name] = EmbeddingCache(os.path.join(config.EMBED_CACHE_DIR, slug),
+                                                 dtype=config.EMBED_CACHE_DTYPE,
+                                                 max_rows=config.EMBED_CACHE_MAX_ROWS)
+        return _caches[model_name]
+
+
+def cached_model(model, model_name: str):
+    """El modelo envuelto en CachedEncoder si config.EMBED_CACHE_ENABLED, si no tal cual."""
+    if not config.EMBED_CACHE_ENABLED:
+        return model
+    return CachedEncoder(model, get_embedding_cache(model_name), model_name)
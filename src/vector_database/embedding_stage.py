@@ -0,0 +1,135 @@
+"""
+Etapa de Embeddings por Lotes
+Calcula los embeddings de la ingesta en lotes reales en lugar de un
+model.encode(texto) por artículo:
+
+1. El input (iterador) se consume por bloques de `chunk_size` artículos, así la
+   memoria no crece con el histórico del tema.
+2. Dentro de cada bloque se construyen todos los textos, se ordenan por
+   longitud (menos padding por lote) y se codifican en lotes de `batch_size`.
+3. Opcionalmente, un pool multiproceso de sentence-transformers reparte los
+   lotes entre núcleos (`workers` > 1).
+4. Los near-duplicates (mismo cluster_id) reutilizan el vector de su cluster.
+
+Al final, report() da encodes/s del modelo; los vectores servidos por la caché
+de embeddings (CachedEncoder) se cuentan aparte.
+"""
+
+import os
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.vector_database.embedding_cache import CachedEncoder
+
+
+def embedding_text(noticia: Dict[str, Any]) -> str:
+    """Texto que se vectoriza por noticia (título + razonamiento + inicio del abstract)."""
+    return f"{noticia.get('title', '')} {noticia.get('razonamiento', '')} {(noticia.get('abstract') or '')[:200]}"
+
+
+def auto_batch_size() -> int:
+    """Lote para CPU: más núcleos amortizan lotes mayores (MiniLM, textos cortos)."""
+    cores = os.cpu_count() or 1
+    return 128 if cores >= 8 else 64 if cores >= 4 else 32
+
+
+class EmbeddingStage:
+    """
+    Codificación por lotes con un SentenceTransformer ya cargado.
+
+    Args:
+        model: SentenceTransformer.
+        batch_size: textos por lote (None = auto_batch_size()).
+        workers: procesos del pool de encode (0 / 1 = sin pool).
+        chunk_size: artículos leídos del input por bloque.
+    """
+
+    def __init__(self, model, batch_size: Optional[int] = None, workers: int = 0, chunk_size: int = 4096):
+        self.model = model
+        self.batch_size = batch_size or auto_batch_size()
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.encoded = 0       # textos codificados por el modelo
+        self.from_cache = 0    # textos servidos por la caché de embeddings
+        self.reused = 0        # near-duplicates que reutilizan el vector de su cluster
+        self.seconds = 0.0     # tiempo de modelo
+        self._pool = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._pool = self.model.start_multi_process_pool(["cpu"] * self.workers)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+        return False
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Vectores de `texts` en su orden original (codificados ordenados por longitud)."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        ordered = [texts[i] for i in order]
+        cached = isinstance(self.model, CachedEncoder)
+        if cached:
+            encoded_before, seconds_before = self.model.model_encoded, self.model.model_seconds
+        start = time.time()
+        if self._pool is not None:
+            vectors = self.model.encode_multi_process(ordered, self._pool, batch_size=self.batch_size)
+        else:
+            vectors = self.model.encode(ordered, batch_size=self.batch_size, show_progress_bar=False)
+        if cached:
+            encoded = self.model.model_encoded - encoded_before
+            self.seconds += self.model.model_seconds - seconds_before
+            self.from_cache += len(texts) - encoded
+            self.encoded += encoded
+        else:
+            self.seconds += time.time() - start
+            self.encoded += len(texts)
+        result = np.empty_like(vectors)
+        result[order] = vectors
+        return result
+
+    def iter_embedded(self, noticias: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], List[float]]]:
+        """(noticia, vector) para cada noticia del input, en orden, codificando por bloques."""
+        cluster_vectors: Dict[str, List[float]] = {}
+        noticias = iter(noticias)
+        while True:
+            bloque = list(islice(noticias, self.chunk_size))
+            if not bloque:
+                return
+            # Un texto por cluster (o por noticia si no está en ninguno) pendiente de codificar
+            pendientes: Dict[Any, int] = {}
+            textos: List[str] = []
+            claves = []
+            for i, noticia in enumerate(bloque):
+                cluster_id = noticia.get('cluster_id') if noticia.get('cluster_size', 1) > 1 else None
+                clave = cluster_id if cluster_id else ("noticia", i)
+                claves.append(clave)
+                if clave in cluster_vectors or clave in pendientes:
+                    continue
+                pendientes[clave] = len(textos)
+                textos.append(embedding_text(noticia))
+
+            vectores = self.encode(textos)
+            for clave, j in pendientes.items():
+                cluster_vectors[clave] = vectores[j].tolist()
+            self.reused += len(bloque) - len(textos)
+            for i, noticia in enumerate(bloque):
+                yield noticia, cluster_vectors[claves[i]]
+            # Las claves por noticia sólo valen dentro del bloque
+            for clave in pendientes:
+                if not isinstance(clave, str):
+                    del cluster_vectors[clave]
+
+    def report(self) -> str:
+        rate = self.encoded / self.seconds if self.seconds > 0 else 0.0
+        pool = f", pool de {self.workers} procesos" if self.workers > 1 else ""
+        return (f"{self.encoded} embeddings del modelo en {self.seconds:.1f}s ({rate:.0f} encodes/s, "
+                f"lote {self.batch_size}{pool}); {self.from_cache} de la caché; "
+                f"{self.reused} reutilizados de near-duplicates")
@@ -19,6 +19,7 @@ from dotenv import load_dotenv
 # Configuración rutas
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 import config
+from src.vector_database.embedding_cache import cached_model
 
 load_dotenv()
 
@@ -35,7 +36,7 @@ class RAGExplorer:
         self.driver.verify_connectivity()
         
         print("🧠 Cargando modelo de lenguaje (Embeddings)...")
-        self.model = SentenceTransformer(EMBEDDING_MODEL)
+        self.model = cached_model(SentenceTransformer(EMBEDDING_MODEL), EMBEDDING_MODEL)
         print("✅ Sistema listo para consultas.")
 
     def close(self):
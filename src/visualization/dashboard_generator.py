@@ -4,12 +4,14 @@ import json
 import glob
 import webbrowser
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Configuration
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from src.article_store import ArticleStore, iter_json_array
+from src.trend_analytics import theme_trend_stats
 
 DATA_DIR = config.DIRS["DATA"]
 # Saving dashboard to CHARTS_HTML to keep outputs organized
@@ -187,6 +189,14 @@ HTML_TEMPLATE = """
                 </ul>
             </div>
 
+            <!-- Search Interest Signals -->
+            <div class="glass-panel p-6 metric-card border-l-4 border-l-sky-500">
+                <h3 class="text-sm font-semibold text-sky-400 uppercase mb-4">Search Interest Signals</h3>
+                <ul class="space-y-3">
+                    <!-- TREND_SIGNALS_PLACEHOLDER -->
+                </ul>
+            </div>
+
             <!-- Opportunity Watch -->
             <div class="glass-panel p-6 metric-card border-l-4 border-l-green-500">
                 <h3 class="text-sm font-semibold text-green-400 uppercase mb-4">Solid Opportunities</h3>
@@ -280,34 +290,48 @@ def generate_dashboard(theme_id="cybersecurity_ai"):
     output_dir = theme_dirs["CHARTS_HTML"]
     
     # 2. Find latest data in THEME folder
-    # Priority: Analyzed > Unified (Raw)
-    analyzed_pattern = os.path.join(data_dir, "analyzed_reflexivity_*.json")
-    unified_pattern = os.path.join(data_dir, "unified_data_*.json")
-    
-    analyzed_files = glob.glob(analyzed_pattern)
-    unified_files = glob.glob(unified_pattern)
-    
+    # Priority: Analyzed store (recent history) > Analyzed snapshot > Unified (Raw)
+    analyzed_store = ArticleStore(data_dir, "analyzed")
     data_is_analyzed = False
-    
-    if analyzed_files:
-        files = analyzed_files
-        print("Found ANALYZED data. Using it for dashboard.")
+
+    if analyzed_store.latest_run():
+        since = (datetime.now() - timedelta(days=config.DASHBOARD_HISTORY_DAYS)).strftime("%Y-%m-%d")
+        print(f"Found ANALYZED store. Using last {config.DASHBOARD_HISTORY_DAYS} days (since {since}).")
         data_is_analyzed = True
-    elif unified_files:
-        files = unified_files
-        print("Found only RAW data. Dashboard will show neutral stats.")
+        # Stream history; later analyses of the same URL replace earlier ones
+        latest_by_url = {}
+        for article in analyzed_store.iter_articles(since=since):
+            latest_by_url[article.get('url') or article.get('title')] = article
+        data = list(latest_by_url.values())
     else:
-        files = []
-    
-    if not files:
+        analyzed_pattern = os.path.join(data_dir, "analyzed_reflexivity_*.json")
+        unified_pattern = os.path.join(data_dir, "unified_data_*.json")
+        
+        analyzed_files = glob.glob(analyzed_pattern)
+        unified_files = glob.glob(unified_pattern)
+        
+        if analyzed_files:
+            files = analyzed_files
+            print("Found ANALYZED data. Using it for dashboard.")
+            data_is_analyzed = True
+        elif unified_files:
+            files = unified_files
+            print("Found only RAW data. Dashboard will show neutral stats.")
+        else:
+            files = []
+        
+        if not files:
+            print(f"No data found in {data_dir}")
+            return
+            
+        latest_file = max(files, key=os.path.getmtime)
+        print(f"Loading data from: {latest_file}")
+        
+        data = list(iter_json_array(latest_file))
+
+    if not data:
         print(f"No data found in {data_dir}")
         return
-        
-    latest_file = max(files, key=os.path.getmtime)
-    print(f"Loading data from: {latest_file}")
-    
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
 
     # ... (Rest of processing remains mostly the same, ensuring 'data' is valid list) ...
     if not isinstance(data, list):
@@ -437,6 +461,25 @@ def generate_dashboard(theme_id="cybersecurity_ai"):
         })
     chart_json = json.dumps(chart_data)
 
+    # Google Trends signals (vectorized over every keyword in the theme's trend store)
+    trend_html = ""
+    try:
+        trend_stats = theme_trend_stats(data_dir)
+    except Exception as e:
+        print(f"Trend store unavailable: {e}")
+        trend_stats = pd.DataFrame()
+    if not trend_stats.empty:
+        for keyword, stats in trend_stats.sort_values("zscore", ascending=False, na_position="last").head(5).iterrows():
+            badge = '<span class="text-red-400 font-bold">BREAKOUT</span>' if stats['breakout'] else ""
+            momentum = f"{stats['momentum']:+.0%}" if pd.notna(stats['momentum']) else "n/a"
+            zscore = f"{stats['zscore']:+.1f}" if pd.notna(stats['zscore']) else "n/a"
+            trend_html += f"""
+            <li class="p-3 rounded bg-sky-500/10 border border-sky-500/20">
+                <div class="font-bold text-sky-200 truncate">{keyword} {badge}</div>
+                <div class="text-xs text-sky-400 mt-1">Last: {stats['last']:.0f} | Mom: {momentum} | Z: {zscore}</div>
+            </li>
+            """
+
     # Determine Correct Messages
     if data_is_analyzed:
         no_bubble_msg = '<li class="text-slate-400 text-sm">No bubble risks detected in current timeframe.</li>'
@@ -455,6 +498,7 @@ def generate_dashboard(theme_id="cybersecurity_ai"):
     html = html.replace('<!-- SENTIMENT_PCT_PLACEHOLDER -->', f"{(avg_sentiment+1)*50:.0f}")
     html = html.replace('<!-- BUBBLE_LIST_PLACEHOLDER -->', bubble_html or no_bubble_msg)
     html = html.replace('<!-- OPPORTUNITY_LIST_PLACEHOLDER -->', opp_html or no_opp_msg)
+    html = html.replace('<!-- TREND_SIGNALS_PLACEHOLDER -->', trend_html or '<li class="text-slate-400 text-sm">No Google Trends data yet.</li>')
     html = html.replace('<!-- NEWS_CARDS_PLACEHOLDER -->', news_cards_html)
     html = html.replace('<!-- CHART_DATA_JSON_PLACEHOLDER -->', chart_json)
 
@@ -0,0 +1,46 @@
+from src.acquisition_data_manager.article_index import ArticleIndex, canonicalize_url
+
+
+def _article(url, title, published="2025-08-18T07:00:00+00:00", abstract="abstract", keyword="passkeys"):
+    return {"url": url, "title": title, "abstract": abstract, "published_date": published,
+            "metadata": {"search_term": keyword}}
+
+
+def test_canonicalize_url_drops_tracking_params_and_fragment():
+    assert (canonicalize_url("HTTPS://Example.com/a/?utm_source=x&b=2&oc=5#top")
+            == canonicalize_url("https://example.com/a?b=2"))
+
+
+def test_articles_are_recorded_only_after_mark_seen(tmp_path):
+    batch = [_article("https://a.com/1", "One"), _article("https://a.com/2", "Two")]
+
+    index = ArticleIndex(str(tmp_path))
+    assert len(index.filter_new(batch)) == 2
+    index.close()  # run crashed before saving: nothing recorded
+
+    index = ArticleIndex(str(tmp_path))
+    assert len(index.filter_new(batch)) == 2
+    index.mark_seen()
+    assert index.filter_new(batch) == []
+    index.close()
+
+
+def test_changed_content_and_batch_duplicates(tmp_path):
+    index = ArticleIndex(str(tmp_path))
+    index.filter_new([_article("https://a.com/1", "One")])
+    index.mark_seen()
+
+    changed = _article("https://a.com/1?utm_medium=rss", "One", abstract="updated abstract")
+    duplicate = _article("https://other.com/copy", "One", abstract="updated abstract")
+    assert index.filter_new([changed, duplicate]) == [changed]
+
+
+def test_high_water_mark_drops_old_articles(tmp_path):
+    index = ArticleIndex(str(tmp_path))
+    index.filter_new([_article("https://a.com/new", "New", published="2025-08-18T00:00:00+00:00")])
+    index.mark_seen()
+
+    late = _article("https://a.com/late", "Late", published="2025-08-16T00:00:00+00:00")
+    old = _article("https://a.com/old", "Old", published="2025-08-01T00:00:00+00:00")
+    assert index.filter_new([late, old]) == [late]
+    assert index.stale == 1
@@ -0,0 +1,34 @@
+import pytest
+
+from src.article_store import ArticleStore
+
+
+def test_clean_exit_commits_run(tmp_path):
+    store = ArticleStore(str(tmp_path), "unified")
+    run = store.append([{"url": "a"}, {"url": "b"}])
+    assert run["count"] == 2
+    assert [a["url"] for a in store.iter_articles()] == ["a", "b"]
+
+
+def test_exception_abandons_run(tmp_path):
+    store = ArticleStore(str(tmp_path), "unified")
+    store.append([{"url": "a"}])
+    with pytest.raises(RuntimeError):
+        with store.writer() as writer:
+            writer.write({"url": "half"})
+            raise RuntimeError("boom")
+    assert writer.run is None
+    assert len(list(store.runs())) == 1
+    assert [a["url"] for a in store.iter_articles()] == ["a"]
+
+
+def test_keyboard_interrupt_abandons_run(tmp_path):
+    store = ArticleStore(str(tmp_path), "unified")
+    with pytest.raises(KeyboardInterrupt):
+        with store.writer() as writer:
+            writer.write({"url": "half"})
+            raise KeyboardInterrupt
+    assert store.latest_run() is None
+    # A later run still reads back only its own lines
+    store.append([{"url": "next"}])
+    assert [a["url"] for a in store.iter_articles()] == ["next"]
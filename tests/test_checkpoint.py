@@ -0,0 +1,60 @@
+import json
+
+from src.attribution_analysis.checkpoint import AnalysisCheckpoint, article_id
+
+
+def _article(n):
+    return {"url": f"https://example.com/news/{n}", "title": f"News {n}"}
+
+
+def test_resume_loads_completed_entries(tmp_path):
+    checkpoint = AnalysisCheckpoint(str(tmp_path))
+    checkpoint.append(_article(1), {"sentimiento": 0.1})
+    checkpoint.append(_article(2), {"sentimiento": 0.2})
+    checkpoint.close()
+
+    resumed = AnalysisCheckpoint(str(tmp_path), resume=True)
+    assert resumed.done == {article_id(_article(1)): {"sentimiento": 0.1},
+                            article_id(_article(2)): {"sentimiento": 0.2}}
+    resumed.close()
+
+
+def test_resume_after_truncated_line_keeps_next_entry_readable(tmp_path):
+    checkpoint = AnalysisCheckpoint(str(tmp_path))
+    checkpoint.append(_article(1), {"sentimiento": 0.1})
+    checkpoint.close()
+    # Crash a mitad de escribir la segunda entrada
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"id": "https://example.com/news/2", "resu')
+
+    resumed = AnalysisCheckpoint(str(tmp_path), resume=True)
+    assert list(resumed.done) == [article_id(_article(1))]
+    resumed.append(_article(3), {"sentimiento": 0.3})
+    resumed.close()
+
+    with open(checkpoint.path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)["result"]["sentimiento"] for line in lines] == [0.1, 0.3]
+    again = AnalysisCheckpoint(str(tmp_path), resume=True)
+    assert set(again.done) == {article_id(_article(1)), article_id(_article(3))}
+    again.close()
+
+
+def test_fragment_without_any_complete_line_is_dropped(tmp_path):
+    path = tmp_path / "analysis_checkpoint.jsonl"
+    path.write_text('{"id": "x", "res', encoding="utf-8")
+    resumed = AnalysisCheckpoint(str(tmp_path), resume=True)
+    resumed.append(_article(1), {"sentimiento": 0.5})
+    resumed.close()
+    assert [json.loads(line)["id"] for line in path.read_text(encoding="utf-8").splitlines()] == \
+        [article_id(_article(1))]
+
+
+def test_without_resume_previous_checkpoint_is_discarded(tmp_path):
+    checkpoint = AnalysisCheckpoint(str(tmp_path))
+    checkpoint.append(_article(1), {"sentimiento": 0.1})
+    checkpoint.close()
+    fresh = AnalysisCheckpoint(str(tmp_path))
+    assert fresh.done == {}
+    fresh.discard()
+    assert not (tmp_path / "analysis_checkpoint.jsonl").exists()
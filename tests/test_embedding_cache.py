@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+
+from src.vector_database.embedding_cache import EmbeddingCache
+
+
+def _vectors(n, dim=4, offset=0):
+    return np.arange(offset, offset + n * dim, dtype=np.float32).reshape(n, dim)
+
+
+def _keys(n, offset=0):
+    return [f"k{i}" for i in range(offset, offset + n)]
+
+
+def test_round_trip_and_persistence(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dtype="float32")
+    cache.put_many(_keys(3), _vectors(3))
+    cache.close()
+
+    cache = EmbeddingCache(str(tmp_path), dtype="float32")
+    found = cache.get_many(["k1", "missing"])
+    assert list(found) == ["k1"]
+    np.testing.assert_array_equal(found["k1"], _vectors(3)[1])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_eviction_keeps_most_recently_used(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dtype="float32", max_rows=3)
+    cache.put_many(_keys(3), _vectors(3))
+    cache.get_many(["k0"])  # k1 pasa a ser el menos usado
+    cache.put_many(["k3"], _vectors(1, offset=100))
+    assert set(cache.get_many(_keys(4))) == {"k0", "k2", "k3"}
+
+
+def test_compaction_renumbers_rows_and_keeps_vectors(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dtype="float32", max_rows=10)
+    vectors = _vectors(6)
+    cache.put_many(_keys(6), vectors)
+    cache.evict(2)  # 4 huecos de 6 filas -> compacta
+    assert cache.rows == 2 and cache.generation == 1
+    survivors = cache.get_many(_keys(6))
+    for key, vector in survivors.items():
+        np.testing.assert_array_equal(vector, vectors[int(key[1:])])
+    assert not os.path.exists(os.path.join(tmp_path, "vectors.float32.bin"))
+
+
+def test_interrupted_compaction_leaves_a_consistent_cache(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dtype="float32")
+    cache.put_many(_keys(4), _vectors(4))
+    cache.close()
+    # Crash tras escribir la generación nueva y antes del commit: fichero huérfano
+    orphan = tmp_path / "vectors.float32.1.bin"
+    orphan.write_bytes(b"\0" * 16)
+
+    cache = EmbeddingCache(str(tmp_path), dtype="float32")
+    assert not orphan.exists()
+    np.testing.assert_array_equal(cache.get_many(["k3"])["k3"], _vectors(4)[3])
+
+
+def test_short_vectors_file_drops_missing_rows_instead_of_zero_filling(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dtype="float32")
+    cache.put_many(_keys(4), _vectors(4))
+    path = cache.vectors_path
+    cache.close()
+    with open(path, "r+b") as f:
+        f.truncate(2 * 4 * 4)  # sólo quedan 2 filas
+
+    cache = EmbeddingCache(str(tmp_path), dtype="float32")
+    assert cache.rows == 2
+    assert set(cache.get_many(_keys(4))) == {"k0", "k1"}
+    assert os.path.getsize(path) == 2 * 4 * 4
+
+
+def test_rows_written_after_last_index_commit_are_discarded(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dtype="float32")
+    cache.put_many(_keys(2), _vectors(2))
+    path = cache.vectors_path
+    cache.close()
+    with open(path, "ab") as f:
+        f.write(_vectors(1).tobytes())  # put sin commit del índice
+
+    cache = EmbeddingCache(str(tmp_path), dtype="float32")
+    assert os.path.getsize(path) == 2 * 4 * 4
+    cache.put_many(["k9"], _vectors(1, offset=50))
+    np.testing.assert_array_equal(cache.get_many(["k9"])["k9"], _vectors(1, offset=50)[0])
@@ -0,0 +1,43 @@
+import numpy as np
+
+from src.vector_database.embedding_cache import CachedEncoder, EmbeddingCache
+from src.vector_database.embedding_stage import EmbeddingStage, embedding_text
+
+
+class LengthEncoder:
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        self.batches.append(list(texts))
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+def _noticias():
+    return [{"title": "a" * n, "razonamiento": "", "abstract": ""} for n in (3, 10, 1, 7)]
+
+
+def test_encode_sorts_by_length_and_restores_order():
+    model = LengthEncoder()
+    vectors = EmbeddingStage(model, batch_size=8).encode([embedding_text(n) for n in _noticias()])
+    assert vectors[:, 0].tolist() == [len(embedding_text(n)) for n in _noticias()]
+    assert [len(t) for t in model.batches[0]] == sorted((len(t) for t in model.batches[0]), reverse=True)
+
+
+def test_near_duplicates_reuse_the_cluster_vector():
+    noticias = [{"title": "x", "cluster_id": "c1", "cluster_size": 2},
+                {"title": "x copy", "cluster_id": "c1", "cluster_size": 2},
+                {"title": "y"}]
+    stage = EmbeddingStage(LengthEncoder(), chunk_size=2)
+    out = list(stage.iter_embedded(noticias))
+    assert out[0][1] == out[1][1]
+    assert (stage.encoded, stage.reused) == (2, 1)
+
+
+def test_cache_hits_are_not_counted_as_encodes(tmp_path):
+    model = CachedEncoder(LengthEncoder(), EmbeddingCache(str(tmp_path), dtype="float32"), "len")
+    texts = [embedding_text(n) for n in _noticias()]
+    EmbeddingStage(model).encode(texts)
+    stage = EmbeddingStage(model)
+    stage.encode(texts + ["nuevo texto"])
+    assert (stage.encoded, stage.from_cache) == (1, 4)
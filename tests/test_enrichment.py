@@ -0,0 +1,128 @@
+import asyncio
+import base64
+import json
+
+import aiohttp
+import pytest
+from yarl import URL
+
+from src.acquisition_data_manager import enrichment
+from src.acquisition_data_manager.enrichment import ArticleEnricher, BATCHEXECUTE_URL
+
+PUBLISHER_HTML = "<html><body><article>" + "<p>Passkeys are replacing passwords across the industry.</p>" * 5 + \
+    "</article></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, method, url, status, body):
+        self.method, self.url, self.status, self.body = method, URL(url), status, body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            info = aiohttp.RequestInfo(url=self.url, method=self.method, headers={}, real_url=self.url)
+            raise aiohttp.ClientResponseError(info, (), status=self.status, message="Server Error")
+
+    async def text(self, errors="strict"):
+        return self.body
+
+
+class FakeSession:
+    """Stub HTTP: routes[(method, url)] = (status, body) or an exception to raise."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        route = self.routes[(method, url)]
+        if isinstance(route, BaseException):
+            raise route
+        return FakeResponse(method, url, *route)
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.acquired = []
+
+    async def aacquire(self, source):
+        self.acquired.append(source)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = FakeScheduler()
+    monkeypatch.setattr(enrichment, "get_scheduler", lambda: scheduler)
+    return scheduler
+
+
+def _legacy_id(url):
+    raw = b"\x08\x13\x22" + bytes([len(url)]) + url.encode() + b"\xd2\x01\x00"
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _batchexecute_body(url):
+    inner = json.dumps(["garturlres", url, 1])
+    return ")]}'\n\n" + json.dumps([["wrb.fr", "Fbv4je", inner, None, None, None, "generic"],
+                                    ["di", 10], ["af.httprm", 10, "-1", 1]])
+
+
+def _enrich(session, article):
+    return asyncio.run(ArticleEnricher().enrich_one(session, article))
+
+
+def test_legacy_redirect_resolves_offline_and_downloads(scheduler):
+    publisher = "https://publisher.example.com/passkeys"
+    article = {"url": f"https://news.google.com/rss/articles/{_legacy_id(publisher)}?oc=5"}
+    session = FakeSession({("GET", publisher): (200, PUBLISHER_HTML)})
+    assert _enrich(session, article) == "success"
+    assert article["metadata"]["resolved_url"] == publisher
+    assert "Passkeys are replacing passwords" in article["full_text"]
+    assert session.requests == [("GET", publisher)]
+    assert scheduler.acquired == []
+
+
+def test_current_ids_decode_via_batchexecute_under_one_bucket_token(scheduler):
+    publisher = "https://publisher.example.com/ctem"
+    article_id = "CBMiAU_yqLNewStyleOpaqueToken"
+    page = '<c-wiz><div jscontroller="x" data-n-a-sg="SIG123" data-n-a-ts="1724000000"></div></c-wiz>'
+    session = FakeSession({
+        ("GET", f"https://news.google.com/articles/{article_id}"): (200, page),
+        ("POST", BATCHEXECUTE_URL): (200, _batchexecute_body(publisher)),
+        ("GET", publisher): (200, PUBLISHER_HTML),
+    })
+    article = {"url": f"https://news.google.com/rss/articles/{article_id}", "metadata": None}
+    assert _enrich(session, article) == "success"
+    assert article["metadata"]["resolved_url"] == publisher
+    assert [m for m, _ in session.requests] == ["GET", "POST", "GET"]
+    # Page GET + batchexecute POST cost a single google_news_decode token; the publisher none
+    assert scheduler.acquired == ["google_news_decode"]
+
+
+def test_failed_decode_leaves_article_unresolved(scheduler):
+    article_id = "CBMiAU_yqLNoSignature"
+    url = f"https://news.google.com/rss/articles/{article_id}"
+    session = FakeSession({("GET", f"https://news.google.com/articles/{article_id}"): (200, "<html></html>")})
+    article = {"url": url}
+    assert _enrich(session, article) == "unresolved"
+    assert "full_text" not in article
+
+
+@pytest.mark.parametrize("failure, status", [
+    ((500, "oops"), "error"),
+    (aiohttp.ClientConnectionError("connection reset"), "error"),
+    (asyncio.TimeoutError(), "timeout"),
+])
+def test_failed_download_leaves_full_text_unset(scheduler, failure, status):
+    publisher = "https://publisher.example.com/down"
+    article = {"url": publisher}
+    result = _enrich(FakeSession({("GET", publisher): failure}), article)
+    assert result.startswith(status)
+    assert article["metadata"]["extraction_status"] == result
+    assert "full_text" not in article
@@ -0,0 +1,19 @@
+from src.attribution_analysis.input_compression import LEGACY_INPUT_CHARS, InputCompressor
+from src.attribution_analysis.llm_batching import estimate_tokens
+
+
+def test_original_tokens_measured_against_legacy_truncation():
+    compressor = InputCompressor(token_budget=200)
+    content = " ".join(f"Sentence number {i} talks about chips and demand." for i in range(400))
+    compressor.build("Chips demand", content)
+    legacy = f"TITULO: Chips demand\n\nCONTENIDO: {content}"[:LEGACY_INPUT_CHARS]
+    stats = compressor.stats()
+    assert stats["original_tokens"] == estimate_tokens(legacy)
+    assert stats["sent_tokens"] <= 200
+    assert stats["saved_tokens"] == stats["original_tokens"] - stats["sent_tokens"]
+
+
+def test_short_articles_count_their_full_text():
+    compressor = InputCompressor(token_budget=200)
+    compressor.build("Title", "Short body.")
+    assert compressor.stats()["original_tokens"] == estimate_tokens("TITULO: Title\n\nCONTENIDO: Short body.")
@@ -0,0 +1,14 @@
+import config
+from src.attribution_analysis.llm_backends import create_backend
+
+
+def test_openai_backend_has_no_small_model_by_default(monkeypatch):
+    monkeypatch.setitem(config.LLM_SMALL_MODEL_IDS, "openai", None)
+    backend = create_backend("openai", model_id="qwen2.5:32b")
+    assert backend.small_model_id is None
+
+
+def test_small_model_is_taken_per_backend(monkeypatch):
+    monkeypatch.setitem(config.LLM_SMALL_MODEL_IDS, "openai", "qwen2.5:3b")
+    backend = create_backend("openai", model_id="qwen2.5:32b")
+    assert (backend.model_id, backend.small_model_id) == ("qwen2.5:32b", "qwen2.5:3b")
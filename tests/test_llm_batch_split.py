@@ -0,0 +1,78 @@
+import json
+import re
+
+import pytest
+
+from src.acquisition_data_manager.rate_limiter import RateScheduler
+from src.attribution_analysis import find_metadata_IA_llama_LLM as fm
+from src.attribution_analysis.llm_backends import LLMBackend, LLMResponse, set_backend
+
+_NOTICIA_RE = re.compile(r"### NOTICIA \[(\d+)\]\n(\S+)")
+
+
+def _analysis(texto):
+    return {"sentimiento": 0.9, "subjetividad": 0.9, "fase_hype": "Madurez", "categoria_cyber": texto}
+
+
+class FakeBackend(LLMBackend):
+    """Responde lotes / noticias sueltas; `drop` quita textos de los lotes y `max_batch` rompe lotes grandes."""
+    name = "fake"
+    rate_source = "fake"
+
+    def __init__(self, drop=(), max_batch=None):
+        super().__init__("fake-large")
+        self.drop = set(drop)
+        self.max_batch = max_batch
+        self.calls = []
+
+    def complete(self, system_prompt, user_prompt, temperature=0.1, model_id=None):
+        noticias = _NOTICIA_RE.findall(user_prompt)
+        if not noticias:
+            texto = user_prompt.rsplit("\n", 1)[-1]
+            self.calls.append([texto])
+            return LLMResponse(json.dumps(_analysis(texto)))
+        self.calls.append([texto for _, texto in noticias])
+        if self.max_batch and len(noticias) > self.max_batch:
+            return LLMResponse('{"resultados": [{"indice": 0, "sentim')
+        resultados = [dict(_analysis(texto), indice=int(i)) for i, texto in noticias if texto not in self.drop]
+        return LLMResponse(json.dumps({"resultados": resultados}))
+
+
+@pytest.fixture(autouse=True)
+def scheduler(tmp_path, monkeypatch):
+    scheduler = RateScheduler({"default": {}}, str(tmp_path / "ledger.sqlite"))
+    monkeypatch.setattr(fm, "get_scheduler", lambda: scheduler)
+    yield
+    set_backend(None)
+
+
+def _run(backend, n=5, router=None):
+    set_backend(backend)
+    textos = [f"t{i}" for i in range(n)]
+    resultados = fm.analizar_lote_reflexividad(textos, "ctx", ["A"], router=router)
+    return textos, resultados
+
+
+def test_only_missing_results_are_retried_individually():
+    backend = FakeBackend(drop={"t1", "t3"})
+    textos, resultados = _run(backend)
+    assert [r["categoria_cyber"] for r in resultados] == textos
+    assert backend.calls == [textos, ["t1"], ["t3"]]
+
+
+def test_malformed_batches_are_halved_down_to_single_requests():
+    backend = FakeBackend(max_batch=2)
+    textos, resultados = _run(backend)
+    assert [r["categoria_cyber"] for r in resultados] == textos
+    assert backend.calls == [textos, ["t0", "t1"], ["t2", "t3", "t4"], ["t2"], ["t3", "t4"]]
+
+
+def test_router_escalates_missing_small_results_in_one_batch():
+    backend = FakeBackend(drop={"t0", "t2"})
+    router = fm.ModelRouter(small_model="fake-small", large_model="fake-large", margin=0.05,
+                            min_confidence=0.6, prices={})
+    textos, resultados = _run(backend, router=router)
+    assert [r["categoria_cyber"] for r in resultados] == textos
+    # El modelo pequeño no divide; los fallidos van juntos al grande y luego por separado
+    assert backend.calls == [textos, ["t0", "t2"], ["t0"], ["t2"]]
+    assert router.escalations["json"] == 2
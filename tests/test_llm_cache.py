@@ -0,0 +1,66 @@
+import pytest
+
+from src.acquisition_data_manager.response_cache import ResponseCache
+from src.attribution_analysis.llm_cache import LLMResultCache
+
+THEME = {"system_prompt_context": "Eres un analista.", "categories": ["A", "B"]}
+
+
+@pytest.fixture
+def shared(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm_cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+def _fetch(result, calls):
+    def fetch():
+        calls.append(1)
+        return result
+    return fetch
+
+
+def test_hit_skips_fetch(shared):
+    cache = LLMResultCache("ai", THEME, "model-a", cache=shared)
+    calls = []
+    first = cache.get_or_fetch("system", "text", _fetch({"sentimiento": 0.5}, calls))
+    second = cache.get_or_fetch("system", "text", _fetch({"sentimiento": 0.9}, calls))
+    assert first == second == {"sentimiento": 0.5}
+    assert len(calls) == 1
+    assert (shared.hits, shared.misses) == (1, 1)
+
+
+def test_failed_result_is_not_stored(shared):
+    cache = LLMResultCache("ai", THEME, "model-a", cache=shared)
+    calls = []
+    assert cache.get_or_fetch("system", "text", _fetch(None, calls)) is None
+    assert cache.lookup("system", "text") is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("change", [{"system_prompt_context": "Otro contexto."}, {"categories": ["A", "C"]}])
+def test_changed_context_or_categories_invalidate_theme(shared, change):
+    LLMResultCache("ai", THEME, "model-a", cache=shared).store("system", "text", {"r": 1})
+    cache = LLMResultCache("ai", dict(THEME, **change), "model-a", cache=shared)
+    assert cache.lookup("system", "text") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_changed_model_keeps_both_models_results(shared):
+    LLMResultCache("ai", THEME, "llama-70b", cache=shared).store("system", "text", {"r": "groq"})
+    mock = LLMResultCache("ai", THEME, "mock", cache=shared)
+    assert mock.lookup("system", "text") is None
+    mock.store("system", "text", {"r": "mock"})
+    groq = LLMResultCache("ai", THEME, "llama-70b", cache=shared)
+    assert groq.lookup("system", "text") == {"r": "groq"}
+    assert shared.stats()["entries"] == 2
+
+
+def test_invalidate_theme_only_drops_that_theme(shared):
+    ai = LLMResultCache("ai", THEME, "model-a", cache=shared)
+    ai.store("system", "text", {"r": 1})
+    ai2 = LLMResultCache("ai2", THEME, "model-a", cache=shared)
+    ai2.store("system", "text", {"r": 2})
+    assert ai.invalidate_theme() == 1
+    assert ai.lookup("system", "text") is None
+    assert ai2.lookup("system", "text") == {"r": 2}
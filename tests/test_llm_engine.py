@@ -0,0 +1,60 @@
+import threading
+
+from src.acquisition_data_manager.rate_limiter import RateLimitError, RateScheduler
+from src.attribution_analysis.llm_engine import AdaptiveLimiter, AnalysisEngine
+
+
+def test_limiter_aimd_steps_and_bounds():
+    limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=6)
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == 5  # +1 tras una ventana de `limit` éxitos
+    limiter.on_throttle()
+    assert limiter.limit == 2  # mitad (entera)
+    limiter.on_throttle(), limiter.on_throttle()
+    assert limiter.limit == 1  # nunca por debajo del mínimo
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 6 and limiter.peak == 6  # nunca por encima del máximo
+    assert limiter.throttled == 3
+
+
+def test_limiter_holds_when_headers_show_little_margin():
+    limiter = AdaptiveLimiter(initial=2, minimum=1, maximum=8)
+    for _ in range(10):
+        limiter.on_success({"x-ratelimit-remaining-requests": "1"})
+    assert limiter.limit == 2
+
+
+def test_engine_backs_off_on_429_recovers_and_keeps_order(tmp_path):
+    scheduler = RateScheduler({"default": {}}, str(tmp_path / "ledger.sqlite"), backoff_base=0)
+    engine = AnalysisEngine(initial=3, minimum=1, maximum=4)
+    throttle_once = {8, 9}
+    lock = threading.Lock()
+    calls = []
+    after_throttle = []
+
+    def fake_llm(item):
+        with lock:
+            calls.append(item)
+            if item in throttle_once:
+                throttle_once.discard(item)
+                raise RateLimitError("Too Many Requests", status_code=429)
+        return f"result-{item}"
+
+    def analyze(item, limiter):
+        def on_retry(exc):
+            limiter.on_throttle(exc)
+            after_throttle.append(limiter.limit)
+        result = scheduler.call("llm", lambda: fake_llm(item), on_retry=on_retry)
+        limiter.on_success({})
+        return result
+
+    results = list(engine.imap(analyze, range(30)))
+
+    assert results == [f"result-{i}" for i in range(30)]
+    assert len(calls) == 32
+    assert engine.limiter.throttled == 2
+    assert min(after_throttle) <= 2  # la concurrencia cae ante los 429...
+    assert engine.limiter.limit == 4  # ...y vuelve a crecer hasta el máximo con los éxitos
+    assert engine.limiter.peak <= 4 and engine.completed == 30
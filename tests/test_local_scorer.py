@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from src.attribution_analysis.local_scorer import LocalScorer, train
+from src.vector_database.embedding_cache import CachedEncoder, EmbeddingCache
+
+FASES = ["Lanzamiento", "Madurez"]
+
+
+class TopicEncoder:
+    """Embedding determinista: dimensión 0 = artículo de 'hype', resto ruido por texto."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += len(texts)
+        rows = []
+        for text in texts:
+            rng = np.random.default_rng(sum(map(ord, text)))
+            rows.append(np.r_[1.0 if "hype" in text else -1.0, 0.1 * rng.normal(size=7)])
+        return np.array(rows, dtype=np.float32)
+
+
+def _labels(n=120):
+    articles = []
+    for i in range(n):
+        hype = i % 2 == 0
+        articles.append({"title": f"{'hype' if hype else 'calm'} story {i}", "abstract": f"text {i}",
+                         "sentimiento": 0.8 if hype else -0.2, "subjetividad": 0.9 if hype else 0.2,
+                         "relevancia": 0.5, "fase_hype": FASES[0 if hype else 1],
+                         "categoria_theme": "Passkeys"})
+    return articles
+
+
+@pytest.mark.parametrize("heads", ["linear", "gbm"])
+def test_train_predict_and_reload(tmp_path, heads):
+    if heads == "gbm":
+        pytest.importorskip("sklearn")
+    scorer, report = train(_labels(), encoder=TopicEncoder(), heads=heads)
+    assert report["heads"] == heads
+    assert report["fase_hype_accuracy"] == 1.0
+
+    scorer.save(str(tmp_path))
+    loaded = LocalScorer.load(str(tmp_path), encoder=TopicEncoder())
+    assert loaded.kind == heads
+    prediction = loaded.predict([{"title": "hype story new", "abstract": "x"}])[0]
+    assert prediction["fase_hype"] == "Lanzamiento"
+    assert prediction["sentimiento"] == pytest.approx(0.8, abs=0.15)
+    assert 0 <= prediction["confianza"] <= 1
+
+
+def test_non_numeric_labels_are_skipped():
+    articles = _labels()
+    articles[0]["sentimiento"] = "alta"
+    articles[1]["subjetividad"] = "N/A"
+    articles[2]["relevancia"] = None  # ausente = 0
+    _, report = train(articles, encoder=TopicEncoder())
+    assert report["skipped_non_numeric"] == 2
+    assert report["labels"] == len(articles) - 2
+
+
+def test_throughput_is_measured_without_the_embedding_cache(tmp_path):
+    inner = TopicEncoder()
+    encoder = CachedEncoder(inner, EmbeddingCache(str(tmp_path), dtype="float32"), "topic")
+    articles = _labels(50)
+    _, report = train(articles, encoder=encoder)
+    # Entrenamiento: una vez cada artículo; benchmark: el test otra vez por el modelo, no por la caché
+    assert inner.calls == len(articles) + report["test"]
@@ -0,0 +1,22 @@
+from src.models import ArticleModel, validate_articles
+
+
+def _article(**overrides):
+    article = {"source_id": "gnews", "source_name": "Publisher", "title": "Title",
+               "url": "https://example.com/a", "published_date": "2025-08-18", "abstract": "Abstract"}
+    article.update(overrides)
+    return article
+
+
+def test_valid_articles_returned_as_is_with_defaults():
+    article = _article()
+    valid, errors = validate_articles([article])
+    assert errors == []
+    assert valid[0] is article
+    assert valid[0] == ArticleModel(**_article()).model_dump()
+
+
+def test_invalid_articles_reported_by_index():
+    valid, errors = validate_articles([_article(), _article(title=""), "x", _article(metadata=[])])
+    assert len(valid) == 1
+    assert [i for i, _ in errors] == [1, 2, 3]
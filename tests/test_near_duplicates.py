@@ -0,0 +1,40 @@
+from src.attribution_analysis.near_duplicates import cluster_ids, cluster_near_duplicates, fan_out
+
+WIRE = ("Microsoft patches a critical zero-day vulnerability in Windows that attackers "
+        "exploited to gain SYSTEM privileges on unpatched corporate endpoints worldwide")
+
+
+def _articles():
+    return [
+        {"url": "a", "title": "Zero-day patched - Reuters", "abstract": WIRE, "full_text": "x" * 10},
+        {"url": "b", "title": "Passkeys replace passwords", "abstract": "Apple and Google expand passkey support."},
+        {"url": "c", "title": "Zero-day patched - The Verge", "abstract": WIRE, "full_text": "x" * 500},
+        {"url": "d", "title": "Quantum-safe TLS rollout", "abstract": "Cloudflare enables post-quantum key exchange."},
+    ]
+
+
+def test_near_duplicates_share_a_cluster_with_longest_text_as_representative():
+    clusters = cluster_near_duplicates(_articles(), threshold=0.8)
+    assert sorted(map(sorted, clusters)) == [[0, 2], [1], [3]]
+    assert [2, 0] in clusters
+
+
+def test_distinct_articles_stay_apart():
+    articles = [{"title": f"Story {i}", "abstract": f"unrelated topic number {i} " * 5} for i in range(20)]
+    assert len(cluster_near_duplicates(articles)) == 20
+
+
+def test_fan_out_copies_cluster_result_and_keeps_every_article():
+    articles = _articles()
+    clusters = [[2, 0], [1]]  # el artículo 3 no está en ningún cluster
+    ids = cluster_ids(articles, clusters)
+    results = [{"sentimiento": 0.5, "fase_hype": "Madurez"}, {}]
+    out = list(fan_out(iter(articles), clusters, results, ["sentimiento", "fase_hype"], ids))
+
+    assert [item["url"] for item in out] == ["a", "b", "c", "d"]
+    assert out[0]["sentimiento"] == out[2]["sentimiento"] == 0.5
+    assert out[0]["duplicate_of"] == "c" and "duplicate_of" not in out[2]
+    assert out[0]["cluster_size"] == 2
+    # Sin resultado (cluster vacío o fuera de todo cluster): campos vacíos, no descartado
+    assert out[1]["sentimiento"] is None and out[1]["cluster_id"] == "b"
+    assert out[3]["fase_hype"] is None and "cluster_id" not in out[3]
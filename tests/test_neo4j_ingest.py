@@ -0,0 +1,102 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("sentence_transformers")
+
+import config
+from neo4j.exceptions import ServiceUnavailable, TransientError
+from src.vector_database import atribution_mapping_neo4j as mapping
+from src.vector_database.atribution_mapping_neo4j import Neo4jReflexivityGraph, noticia_params
+
+
+class FakeSession:
+    def __init__(self, graph_state, failures):
+        self.state, self.failures = graph_state, failures
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        return [{"url": url, "fingerprint": fp} for url, fp in self.state.items()]
+
+    def execute_write(self, fn, rows):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.state.update((row["url"], row["fingerprint"]) for row in rows)
+        self.batches.append(len(rows))
+
+
+class FakeDriver:
+    def __init__(self, failures=()):
+        self.state, self.failures, self.batches = {}, list(failures), []
+
+    def session(self):
+        session = FakeSession(self.state, self.failures)
+        session.batches = self.batches
+        return session
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def _graph(driver, encoder=None):
+    graph = Neo4jReflexivityGraph.__new__(Neo4jReflexivityGraph)
+    graph.driver, graph.model = driver, encoder or CountingEncoder()
+    return graph
+
+
+def _noticias(n):
+    return [{"url": f"u{i}", "title": f"t{i}", "sentimiento": 0.1, "fase_hype": "Madurez"} for i in range(n)]
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    monkeypatch.setattr(mapping.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(config, "EMBED_CACHE_ENABLED", False)
+
+
+def test_rows_are_written_in_unwind_batches(monkeypatch):
+    monkeypatch.setattr(config, "NEO4J_INGEST_BATCH_SIZE", 4)
+    driver = FakeDriver()
+    _graph(driver).ingest_all(_noticias(10))
+    assert driver.batches == [4, 4, 2]
+
+
+def test_transient_errors_are_retried_then_raised(monkeypatch):
+    monkeypatch.setattr(config, "NEO4J_INGEST_RETRIES", 2)
+    driver = FakeDriver(failures=[TransientError("busy"), ServiceUnavailable("down")])
+    _graph(driver).ingest_all(_noticias(3))
+    assert driver.batches == [3]
+
+    driver = FakeDriver(failures=[TransientError("busy")] * 3)
+    with pytest.raises(TransientError):
+        _graph(driver).ingest_all(_noticias(3))
+
+
+def test_unchanged_articles_skip_embedding_and_write():
+    driver, encoder = FakeDriver(), CountingEncoder()
+    noticias = _noticias(6)
+    _graph(driver, encoder).ingest_all(noticias)
+    noticias[2]["sentimiento"] = 0.9
+    _graph(driver, encoder).ingest_all(noticias + [{"url": "x", "fase_hype": "Error"}])
+    assert encoder.encoded == 7
+    assert driver.batches == [6, 1]
+
+
+def test_fingerprint_ignores_vector_and_uses_stable_fallback_url():
+    noticia = {"title": "Sin URL", "sentimiento": 0.2}
+    assert noticia_params(noticia, [1.0])["fingerprint"] == noticia_params(noticia, [2.0])["fingerprint"]
+    # hash() de Python cambia entre procesos; la URL de respaldo no
+    assert noticia_params(noticia)["url"] == "unknown_" + hashlib.sha1(b"Sin URL").hexdigest()[:16]
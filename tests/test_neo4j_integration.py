@@ -0,0 +1,137 @@
+"""
+Pruebas contra un Neo4j real (>= 5.18, con índices vectoriales y vector.similarity.cosine).
+Sólo se ejecutan con NEO4J_TEST_URI (y NEO4J_TEST_USER / NEO4J_TEST_PASSWORD) definidos, p. ej.:
+
+    docker run -d -p 7687:7687 -e NEO4J_AUTH=neo4j/testpassword neo4j:5
+    NEO4J_TEST_URI=bolt://localhost:7687 NEO4J_TEST_PASSWORD=testpassword pytest tests/test_neo4j_integration.py
+
+Sólo crean y borran noticias con url test://...; aun así, usar una base de datos desechable.
+"""
+
+import hashlib
+import os
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("sentence_transformers")
+
+from src.vector_database.atribution_mapping_neo4j import Neo4jReflexivityGraph
+
+pytestmark = pytest.mark.skipif(not os.getenv("NEO4J_TEST_URI"), reason="NEO4J_TEST_URI no definido")
+
+DIM = 384  # dimensiones del índice news_embeddings
+
+
+class HashEncoder:
+    """Vectores deterministas de 384 dimensiones (sin descargar el modelo real)."""
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        rows = [np.random.default_rng(int(hashlib.sha1(t.encode()).hexdigest()[:8], 16)).normal(size=DIM)
+                for t in ([texts] if single else texts)]
+        vectors = np.array(rows, dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+def _noticia(i, categoria="General Cybersecurity", sentimiento=0.1):
+    return {"url": f"test://noticia/{i}", "title": f"Noticia de prueba {i}", "abstract": f"abstract {i}",
+            "published_date": "2025-08-18", "source_name": "Test Source", "sentimiento": sentimiento,
+            "subjetividad": 0.5, "relevancia": 0.5, "razonamiento": f"razonamiento {i}",
+            "fase_hype": "Madurez", "categoria_cyber": categoria, "entidades": ["Acme"]}
+
+
+def _wipe(graph):
+    with graph.driver.session() as session:
+        session.run("MATCH (n:Noticia) WHERE n.url STARTS WITH 'test://' DETACH DELETE n")
+
+
+@pytest.fixture
+def graph():
+    graph = Neo4jReflexivityGraph(os.environ["NEO4J_TEST_URI"], os.getenv("NEO4J_TEST_USER", "neo4j"),
+                                  os.getenv("NEO4J_TEST_PASSWORD", ""), model=HashEncoder())
+    graph.setup_schema()
+    _wipe(graph)
+    yield graph
+    _wipe(graph)
+    graph.close()
+
+
+def _wait_for_index(graph, expected):
+    """El índice vectorial se actualiza de forma asíncrona tras el commit."""
+    query = HashEncoder().encode("cualquier texto").tolist()
+    for _ in range(50):
+        with graph.driver.session() as session:
+            found = session.run("""
+                CALL db.index.vector.queryNodes('news_embeddings', $k, $v) YIELD node
+                WHERE node.url STARTS WITH 'test://' RETURN count(node) AS c
+            """, k=1000, v=query).single()["c"]
+        if found >= expected:
+            return
+        time.sleep(0.2)
+    pytest.fail("el índice vectorial no llegó a indexar las noticias de prueba")
+
+
+def test_filtered_search_finds_rare_category_with_every_strategy(graph):
+    noticias = [_noticia(i, categoria="test-rara" if i % 20 == 0 else "General Cybersecurity")
+                for i in range(60)]
+    graph.ingest_all(noticias)
+    _wait_for_index(graph, len(noticias))
+
+    esperadas = {f"test://noticia/{i}" for i in range(0, 60, 20)}
+    for strategy in ("index", "exact", "auto"):
+        resultados = graph.query_similar("Noticia de prueba 20", n_results=5,
+                                         filters={"categoria": "test-rara"}, strategy=strategy)
+        assert {r["url"] for r in resultados} == esperadas, strategy
+        assert all(r["categoria"] == "test-rara" for r in resultados)
+
+
+def test_exact_and_index_agree_on_the_top_hit(graph):
+    graph.ingest_all([_noticia(i, sentimiento=i / 40) for i in range(40)])
+    _wait_for_index(graph, 40)
+    filtros = {"sentimiento_min": 0.5}
+    exacto = graph.query_similar("Noticia de prueba 35", 3, filtros, "exact")
+    indice = graph.query_similar("Noticia de prueba 35", 3, filtros, "index")
+    assert exacto[0]["url"] == indice[0]["url"]
+    assert all(r["sentimiento"] >= 0.5 for r in exacto + indice)
+
+
+def test_node_with_two_categories_is_returned_once(graph):
+    graph.ingest_all([_noticia(i) for i in range(10)])
+    with graph.driver.session() as session:
+        session.run("""
+            MATCH (n:Noticia {url: 'test://noticia/3'})
+            MERGE (c:Categoria {nombre: 'test-extra'}) MERGE (n)-[:PERTENECE_A]->(c)
+        """)
+    _wait_for_index(graph, 10)
+    for strategy in ("index", "exact"):
+        urls = [r["url"] for r in graph.query_similar("Noticia de prueba 3", 10, strategy=strategy)]
+        assert len(urls) == len(set(urls)), strategy
+
+
+def _count(graph, query, **params):
+    with graph.driver.session() as session:
+        return session.run(query, **params).single()[0]
+
+
+def test_unwind_ingest_skips_unchanged_and_replaces_relationships(graph):
+    noticias = [_noticia(i) for i in range(25)]
+    graph.ingest_all(noticias)
+    assert _count(graph, "MATCH (n:Noticia) WHERE n.url STARTS WITH 'test://' RETURN count(n)") == 25
+    fechas = "MATCH (n:Noticia) WHERE n.url STARTS WITH 'test://' RETURN collect(toString(n.updated_at))"
+    antes = _count(graph, fechas)
+
+    # Sin cambios: no se reescribe ninguna noticia (updated_at intacto)
+    graph.ingest_all(noticias)
+    assert _count(graph, fechas) == antes
+
+    # Cambio de categoría: la relación antigua desaparece
+    noticias[4]["categoria_cyber"] = "test-nueva"
+    graph.ingest_all(noticias)
+    categorias = _count(graph, """
+        MATCH (:Noticia {url: 'test://noticia/4'})-[:PERTENECE_A]->(c:Categoria) RETURN collect(c.nombre)
+    """)
+    assert categorias == ["test-nueva"]
+    assert _count(graph, "MATCH (:Noticia {url: 'test://noticia/4'})-[:MENCIONA]->(e) RETURN count(e)") == 1
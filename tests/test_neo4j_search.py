@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("sentence_transformers")
+
+import config
+from src.vector_database.atribution_mapping_neo4j import Neo4jReflexivityGraph
+
+
+class _Result(list):
+    def single(self):
+        return self[0]
+
+
+class FakeSession:
+    """Registra las consultas; el índice devuelve un superviviente por cada 10 candidatos."""
+
+    def __init__(self, log, matching, total):
+        self.log, self.matching, self.total = log, matching, total
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.log.append((query, params))
+        if "count(n)" in query:
+            return _Result([{"total": self.matching if "WHERE" in query else self.total}])
+        survivors = params["k"] // 10 if "queryNodes" in query and "WHERE" in query else params["n_results"]
+        return _Result({"url": f"u{i}", "score": 1.0} for i in range(min(survivors, params["n_results"])))
+
+
+class FakeDriver:
+    def __init__(self, matching=100, total=10_000):
+        self.log = []
+        self.matching, self.total = matching, total
+
+    def session(self):
+        return FakeSession(self.log, self.matching, self.total)
+
+
+class ConstantEncoder:
+    def encode(self, text, **kwargs):
+        return np.ones(4, dtype=np.float32)
+
+
+def _graph(driver):
+    graph = Neo4jReflexivityGraph.__new__(Neo4jReflexivityGraph)
+    graph.driver, graph.model = driver, ConstantEncoder()
+    graph.last_search, graph._selectivity_cache = None, {}
+    return graph
+
+
+def test_filter_values_are_bound_parameters_not_query_text():
+    driver = FakeDriver()
+    _graph(driver).query_similar("q", 5, {"categoria": "X' OR 1=1 //", "sentimiento_min": 0.5}, "exact")
+    query, params = driver.log[-1]
+    assert "1=1" not in query and "$f_categoria" in query and "EXISTS" in query
+    assert params["f_categoria"] == "X' OR 1=1 //" and params["f_sentimiento_min"] == 0.5
+
+
+def test_unknown_filter_is_rejected():
+    with pytest.raises(ValueError):
+        _graph(FakeDriver()).query_similar("q", 5, {"categoria_cyber": "X"})
+
+
+def test_no_filters_skip_the_count_and_run_one_query():
+    driver = FakeDriver()
+    results = _graph(driver).query_similar("q", 5)
+    assert len(results) == 5
+    assert len(driver.log) == 1 and "count(n)" not in driver.log[0][0]
+
+
+def test_index_strategy_grows_k_until_enough_survivors(monkeypatch):
+    monkeypatch.setattr(config, "NEO4J_SEARCH_OVERFETCH", 0.01)
+    driver = FakeDriver(matching=100, total=10_000)
+    graph = _graph(driver)
+    results = graph.query_similar("q", 5, {"subjetividad_min": 0.6}, "index")
+    assert len(results) == 5
+    assert graph.last_search["rounds"] > 1 and graph.last_search["k"] >= 50
+
+
+def test_selectivity_is_cached_per_filter_set(monkeypatch):
+    monkeypatch.setattr(config, "NEO4J_SEARCH_SELECTIVITY_TTL", 300)
+    driver = FakeDriver(matching=100)
+    graph = _graph(driver)
+    for _ in range(3):
+        graph.query_similar("q", 5, {"categoria": "Rara"})
+    assert sum("count(n)" in query and "WHERE" in query for query, _ in driver.log) == 1
+    assert graph.last_search["strategy"] == "exact"
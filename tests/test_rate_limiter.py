@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from src.acquisition_data_manager import rate_limiter
+from src.acquisition_data_manager.rate_limiter import QuotaExceededError, QuotaLedger, RateScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_allows_burst_then_spaces_requests(clock):
+    bucket = TokenBucket(rps=2.0, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Reservations queue up behind each other at 1/rps
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rps=1.0, burst=2)
+    bucket.reserve(), bucket.reserve()
+    clock.now += 10
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_unlimited_sources_are_batched(tmp_path, clock):
+    ledger = QuotaLedger(str(tmp_path / "ledger.sqlite"), flush_every=3, flush_interval=60)
+    written = lambda: ledger.conn.execute("SELECT COALESCE(SUM(calls), 0) FROM usage").fetchone()[0]
+    ledger.consume("groq", None)
+    ledger.consume("groq", None)
+    assert written() == 0
+    assert ledger.used("groq") == 2
+    ledger.consume("groq", None)
+    assert written() == 3
+    ledger.consume("gnews", None)
+    clock.now += 61
+    ledger.consume("gnews", None)
+    assert ledger.usage_today() == {"groq": 3, "gnews": 2}
+    assert written() == 5
+    ledger.close()
+
+
+def test_quota_sources_write_through_and_share_a_key(tmp_path):
+    limits = {
+        "serpapi": {"rps": None, "daily_quota": 3},
+        "serpapi_trends": {"ledger_key": "serpapi"},
+        "default": {"rps": None, "daily_quota": None},
+    }
+    scheduler = RateScheduler(limits, str(tmp_path / "ledger.sqlite"))
+    scheduler.acquire("serpapi")
+    scheduler.acquire("serpapi_trends")
+    asyncio.run(scheduler.aacquire("serpapi_trends"))
+    assert scheduler.ledger.usage_today() == {"serpapi": 3}
+    with pytest.raises(QuotaExceededError):
+        scheduler.acquire("serpapi_trends")
+    # A second process sees the same spent budget
+    other = RateScheduler(limits, str(tmp_path / "ledger.sqlite"))
+    with pytest.raises(QuotaExceededError):
+        other.acquire("serpapi")
+
+
+def test_aacquire_runs_quota_io_off_the_loop(tmp_path, monkeypatch):
+    scheduler = RateScheduler({"serpapi": {"daily_quota": 5}, "groq": {"daily_quota": None}},
+                              str(tmp_path / "ledger.sqlite"))
+    offloaded = []
+
+    async def to_thread(fn, *args):
+        offloaded.append(args[0])
+        return fn(*args)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "to_thread", to_thread)
+
+    async def run():
+        await scheduler.aacquire("serpapi")
+        await scheduler.aacquire("groq")
+
+    asyncio.run(run())
+    assert offloaded == ["serpapi"]
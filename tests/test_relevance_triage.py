@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.attribution_analysis.relevance_triage import RelevanceTriage
+
+THEME = {"name": "Passkeys", "description": "passwordless authentication", "keywords": ["FIDO2", "WebAuthn"]}
+
+
+class KeywordEncoder:
+    """Vectores one-hot por palabra clave: coseno 1 si el texto la menciona, 0 si no."""
+    vocab = ["passkeys", "fido2", "webauthn", "football"]
+
+    def encode(self, texts, **kwargs):
+        vectors = np.array([[float(word in t.lower()) for word in self.vocab] for t in texts]) + 1e-9
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_select_scores_every_article_and_keeps_on_topic_ones():
+    articles = [{"title": "FIDO2 keys everywhere"}, {"title": "Football results"},
+                {"title": "WebAuthn adoption grows"}]
+    keep, scores = RelevanceTriage(THEME, model=KeywordEncoder()).select(articles, threshold=0.5)
+    assert keep == [0, 2]
+    assert len(scores) == 3 and scores[1] < 0.5
+
+
+def test_top_k_keeps_best_in_original_order():
+    articles = [{"title": "Football"}, {"title": "WebAuthn"}, {"title": "FIDO2"}]
+    keep, _ = RelevanceTriage(THEME, model=KeywordEncoder()).select(articles, top_k=2)
+    assert keep == [1, 2]
@@ -0,0 +1,100 @@
+import pytest
+
+from src.acquisition_data_manager import rate_limiter
+from src.acquisition_data_manager.base_source import BaseSource
+from src.acquisition_data_manager.response_cache import CacheMissError, ResponseCache
+
+
+def _sum_sizes(cache):
+    return cache.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+
+def _keys(cache):
+    return {row[0] for row in cache.conn.execute("SELECT params FROM responses")}
+
+
+def test_running_total_tracks_puts_replacements_and_invalidation(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.put("gnews", {"q": "a"}, "x" * 10)
+    cache.put("gnews", {"q": "b"}, "y" * 20)
+    cache.put("gnews", {"q": "a"}, "z" * 5)
+    assert cache.total_bytes() == _sum_sizes(cache)
+    cache.put("llm:t1:v1", {"id": 1}, {"r": 1})
+    cache.put("llm:t1:v2", {"id": 1}, {"r": 2})
+    assert cache.invalidate("llm:t1:", keep="llm:t1:v2") == 1
+    assert cache.total_bytes() == _sum_sizes(cache)
+    assert cache.stats()["bytes"] == _sum_sizes(cache)
+
+
+def test_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr("src.acquisition_data_manager.response_cache.time.time", lambda: next(clock))
+    # Each payload is 12 bytes ('"' + 10 chars + '"'); the budget fits three
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=36)
+    for q in "abc":
+        cache.put("gnews", {"q": q}, q * 10)
+    cache.get("gnews", {"q": "a"})  # 'a' becomes the most recently used
+    cache.put("gnews", {"q": "d"}, "d" * 10)
+    assert _keys(cache) == {'{"q": "a"}', '{"q": "c"}', '{"q": "d"}'}
+    assert cache.total_bytes() == 36
+
+
+def test_eviction_spans_several_batches(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=10_000)
+    for i in range(300):
+        cache.put("gnews", {"q": i}, "p" * 98)  # 100 bytes each
+    assert cache.total_bytes() == _sum_sizes(cache) <= 10_000
+    cache.max_bytes = 1_000
+    cache.put("gnews", {"q": "last"}, "p" * 98)
+    assert cache.total_bytes() == _sum_sizes(cache) == 1_000
+
+
+def test_existing_cache_without_meta_is_summed_once(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(path)
+    cache.put("gnews", {"q": "a"}, "a" * 50)
+    cache.conn.execute("DROP TABLE meta")
+    cache.conn.commit()
+    cache.close()
+    reopened = ResponseCache(path)
+    assert reopened.total_bytes() == 52
+
+
+class _Adapter(BaseSource):
+    source_id = "paid"
+
+    def __init__(self):
+        self.fetched = 0
+
+    def fetch(self, query):
+        def remote():
+            self.fetched += 1
+            return [query]
+        return self.cached_call({"q": query}, remote)
+
+
+@pytest.fixture
+def scheduler(tmp_path, monkeypatch):
+    scheduler = rate_limiter.RateScheduler({"default": {}}, str(tmp_path / "ledger.sqlite"))
+    monkeypatch.setattr(rate_limiter, "_scheduler", scheduler)
+    return scheduler
+
+
+def test_only_cache_misses_count_as_remote_calls(tmp_path, scheduler):
+    adapter = _Adapter()
+    adapter.cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    calls = []
+    adapter.on_remote_call = lambda: calls.append(1)
+    for query in ["a", "a", "b", "a"]:
+        adapter.fetch(query)
+    assert adapter.fetched == 2
+    assert len(calls) == 2
+    assert (adapter.cache.hits, adapter.cache.misses) == (2, 2)
+
+
+def test_cache_only_mode_never_counts_a_remote_call(tmp_path, scheduler):
+    adapter = _Adapter()
+    adapter.cache = ResponseCache(str(tmp_path / "cache.sqlite"), cache_only=True)
+    adapter.on_remote_call = lambda: pytest.fail("remote call in cache-only mode")
+    with pytest.raises(CacheMissError):
+        adapter.fetch("a")
@@ -17,12 +17,14 @@ import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
 import os
-import time
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
-import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.acquisition_data_manager.rate_limiter import QuotaExceededError, RateLimitError, get_scheduler
+from src.acquisition_data_manager.article_extraction import HEADERS, parse_article_html
 
 # Cargar variables de entorno
 load_dotenv()
@@ -76,16 +78,6 @@ SEARCH_TERMS = [
     "Cybereason AI",
 ]
 
-# Headers para simular un navegador real
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-    'Accept-Language': 'en-US,en;q=0.5',
-    'Accept-Encoding': 'gzip, deflate, br',
-    'Connection': 'keep-alive',
-}
-
-
 def extract_article_content(url, timeout=10):
     """
     Extrae el contenido principal de un artículo web.
@@ -108,82 +100,7 @@ def extract_article_content(url, timeout=10):
         response = requests.get(url, headers=HEADERS, timeout=timeout, allow_redirects=True)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # 1. Intentar obtener meta description (suele ser un buen resumen)
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content'):
-            result['meta_description'] = meta_desc['content'].strip()
-
-        # También buscar og:description
-        og_desc = soup.find('meta', attrs={'property': 'og:description'})
-        if og_desc and og_desc.get('content') and not result['meta_description']:
-            result['meta_description'] = og_desc['content'].strip()
-
-        # 2. Eliminar elementos no deseados
-        for element in soup.find_all(['script', 'style', 'nav', 'header', 'footer',
-                                       'aside', 'form', 'iframe', 'noscript',
-                                       'advertisement', 'ads', 'sidebar']):
-            element.decompose()
-
-        # 3. Buscar el contenido principal del artículo
-        # Intentar diferentes selectores comunes para artículos
-        article_selectors = [
-            'article',
-            '[role="main"]',
-            '.article-content',
-            '.article-body',
-            '.post-content',
-            '.entry-content',
-            '.content-body',
-            '.story-body',
-            '#article-body',
-            '.article__body',
-            '.ArticleBody',
-            'main',
-            '.main-content',
-        ]
-
-        article_text = ""
-
-        for selector in article_selectors:
-            article = soup.select_one(selector)
-            if article:
-                # Obtener todos los párrafos
-                paragraphs = article.find_all(['p', 'h1', 'h2', 'h3'])
-                if paragraphs:
-                    article_text = '\n\n'.join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
-                    if len(article_text) > 200:  # Si encontramos contenido sustancial
-                        break
-
-        # Si no encontramos con selectores, buscar todos los párrafos
-        if not article_text or len(article_text) < 200:
-            all_paragraphs = soup.find_all('p')
-            # Filtrar párrafos muy cortos o que parecen navegación
-            good_paragraphs = [p.get_text().strip() for p in all_paragraphs
-                              if len(p.get_text().strip()) > 50]
-            article_text = '\n\n'.join(good_paragraphs)
-
-        # 4. Limpiar el texto
-        article_text = re.sub(r'\s+', ' ', article_text)  # Normalizar espacios
-        article_text = re.sub(r'\n\s*\n', '\n\n', article_text)  # Normalizar saltos de línea
-
-        result['full_text'] = article_text[:10000]  # Limitar a 10000 caracteres
-
-        # 5. Crear abstract (primeros 500-1000 caracteres o 2-3 párrafos)
-        if result['meta_description']:
-            result['abstract'] = result['meta_description']
-        elif article_text:
-            # Tomar los primeros párrafos hasta ~500 caracteres
-            paragraphs = article_text.split('\n\n')
-            abstract = ""
-            for p in paragraphs[:3]:
-                if len(abstract) + len(p) < 800:
-                    abstract += p + " "
-                else:
-                    break
-            result['abstract'] = abstract.strip()[:800]
-
+        result.update(parse_article_html(response.content))
         result['extraction_status'] = 'success'
 
     except requests.exceptions.Timeout:
@@ -262,6 +179,20 @@ def extract_content_batch(news_df, max_workers=5, progress_callback=None):
     return news_df
 
 
+def _serpapi_search(params):
+    """
+    Llamada a SerpAPI bajo el rate limit / cuota compartida (config.SOURCE_RATE_LIMITS['serpapi']),
+    con backoff en 429: SerpAPI informa del throttling dentro del payload.
+    """
+    def fetch():
+        results = GoogleSearch(params).get_dict()
+        error = str(results.get("error", "")).lower()
+        if "too many requests" in error or "rate limit" in error:
+            raise RateLimitError(results["error"], status_code=429)
+        return results
+    return get_scheduler().call("serpapi", fetch)
+
+
 def search_google_news(query, api_key, num_results=100):
     """
     Busca noticias en Google News usando SerpAPI
@@ -277,8 +208,7 @@ def search_google_news(query, api_key, num_results=100):
     }
 
     try:
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = _serpapi_search(params)
 
         news_results = results.get("news_results", [])
 
@@ -325,6 +255,8 @@ def search_google_news(query, api_key, num_results=100):
                     }
                     all_news.append(news_item)
 
+    except QuotaExceededError:
+        raise
     except Exception as e:
         print(f"  Error buscando '{query}': {e}")
 
@@ -349,8 +281,7 @@ def search_google_regular(query, api_key, tbs="qdr:m"):
     }
 
     try:
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = _serpapi_search(params)
 
         news_results = results.get("news_results", [])
 
@@ -367,6 +298,8 @@ def search_google_regular(query, api_key, tbs="qdr:m"):
             }
             all_results.append(news_item)
 
+    except QuotaExceededError:
+        raise
     except Exception as e:
         print(f"  Error en búsqueda regular '{query}': {e}")
 
@@ -401,15 +334,22 @@ def main(extract_content=True, max_workers=10):
     for i, term in enumerate(SEARCH_TERMS, 1):
         print(f"\n[{i}/{len(SEARCH_TERMS)}] Buscando: '{term}'...")
 
-        news = search_google_news(term, api_key)
-        print(f"  -> Google News: {len(news)} resultados")
-        all_news.extend(news)
-
-        regular_news = search_google_regular(term, api_key, tbs="qdr:m")
-        print(f"  -> Google Search (noticias): {len(regular_news)} resultados")
-        all_news.extend(regular_news)
-
-        time.sleep(1)
+        # Cuota diaria compartida con serpapi_trends: si se agota, se guarda lo ya obtenido
+        try:
+            news = search_google_news(term, api_key)
+            print(f"  -> Google News: {len(news)} resultados")
+            all_news.extend(news)
+
+            regular_news = search_google_regular(term, api_key, tbs="qdr:m")
+            print(f"  -> Google Search (noticias): {len(regular_news)} resultados")
+            all_news.extend(regular_news)
+        except QuotaExceededError as e:
+            print(f"  Cuota de SerpAPI agotada ({e}); se detiene la búsqueda en el término {i}/{len(SEARCH_TERMS)}")
+            break
+
+    if not all_news:
+        print("\nNo se obtuvieron noticias; no se genera CSV.")
+        return
 
     # Crear DataFrame
     df = pd.DataFrame(all_news)